@@ -0,0 +1,236 @@
+import heapq
+import logging
+import os
+import signal
+import threading
+from datetime import datetime, timedelta
+
+from .orchestrator import BASE_URL, DATA_DIR, Account, SlotOrchestrator
+from .utils.browser_pool import BrowserPool
+from .utils.fire_scheduler import FireScheduler
+from .utils.helpers import get_days_before_bookable
+from .utils.schedule import ScheduleCompiler, ScheduleError
+
+# Seconds before T0 at which Chrome, login, and day selection start
+DEFAULT_PREWARM_LEAD = 120
+# Upper bound for a single idle wait, so clock jumps and schedule edits are noticed
+MAX_IDLE_WAIT = 60
+
+
+class Timer:
+    """
+    An upcoming fire time of the daemon.
+
+    Attributes:
+        fire_at (datetime): T0 as a timezone-aware datetime.
+        time_folder (str): Time folder of the accounts firing, e.g. "1900".
+        weekday (str): Weekday of the classes that are booked at T0.
+    """
+
+    def __init__(self, fire_at: datetime, time_folder: str, weekday: str):
+        self.fire_at = fire_at
+        self.time_folder = time_folder
+        self.weekday = weekday
+
+    def __lt__(self, other: "Timer") -> bool:
+        return self.fire_at < other.fire_at
+
+    def __repr__(self) -> str:
+        return f"Timer({self.fire_at.isoformat()}, {self.time_folder}, {self.weekday})"
+
+
+class BookingDaemon:
+    """
+    Books every time folder below the data directory from one long-running process.
+
+    The daemon keeps a heap of the next fire time of every time folder that has
+    bookings. `PREWARM_LEAD` seconds before a fire time it starts the booking
+    pipeline of the due accounts in-process: browsers launch, accounts log in,
+    select the day, and hold their sessions warm until the shared
+    `FireScheduler` fires at T0. Schedules are recompiled before every timer, so
+    edited classes.yaml files apply without a restart. With SHARED_BROWSER=true
+    one Chrome stays running across fire times.
+
+    Attributes:
+        compiler (ScheduleCompiler): Compiles the schedules of the data directory.
+        base_url (str): Login URL of the booking app.
+        prewarm_lead (float): Seconds before T0 at which the pipeline starts.
+        days_before_bookable (int): Days between the fire date and the booked class.
+        browser_pool (BrowserPool): Shared browser kept across runs, or None.
+        timers (list[Timer]): Heap of upcoming fire times.
+        last_fire_at (datetime): T0 of the last timer fired; later plans start after it.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = DATA_DIR,
+        base_url: str = BASE_URL,
+        prewarm_lead: float = None,
+        days_before_bookable: int = None,
+    ):
+        self.compiler = ScheduleCompiler.from_env(data_dir)
+        self.base_url = base_url
+        self.prewarm_lead = (
+            float(os.environ.get("PREWARM_LEAD", DEFAULT_PREWARM_LEAD))
+            if prewarm_lead is None
+            else prewarm_lead
+        )
+        self.days_before_bookable = (
+            get_days_before_bookable()
+            if days_before_bookable is None
+            else days_before_bookable
+        )
+        self.timezone = FireScheduler(
+            timezone=os.environ.get("BOOKING_TIMEZONE") or None
+        ).timezone
+        self.browser_pool = (
+            BrowserPool()
+            if os.environ.get("SHARED_BROWSER", "false").lower() == "true"
+            else None
+        )
+        self.timers = []
+        self.last_fire_at = None
+        self.schedule = None
+        self._announced = None
+        self._stop = threading.Event()
+
+    def plan(self, now: datetime = None) -> list:
+        """
+        Recompile the schedules and rebuild the timer heap.
+
+        Every time folder gets one timer, at its next fire time whose booked
+        weekday has classes, looking at most a week ahead.
+
+        Args:
+            now (datetime): Current time, defaults to the wall clock.
+
+        Returns:
+            list[Timer]: The timer heap.
+
+        Raises:
+            ScheduleError: If a schedule is malformed.
+        """
+        now = now or datetime.now(self.timezone)
+        if self.last_fire_at is not None:
+            # A run that returned before its T0 must not fire the same timer again.
+            now = max(now, self.last_fire_at)
+        self.schedule = self.compiler.compile(include_default=False)
+        time_folders = {
+            time_folder for time_folder, _ in self.schedule.accounts if time_folder
+        }
+        self.timers = []
+        for time_folder in time_folders:
+            timer = self._next_timer(time_folder, now)
+            if timer is not None:
+                self.timers.append(timer)
+        heapq.heapify(self.timers)
+        return self.timers
+
+    def _next_timer(self, time_folder: str, now: datetime) -> Timer:
+        fire_time = f"{time_folder[:2]}:{time_folder[2:]}"
+        execution_time = FireScheduler.parse_execution_time(fire_time)
+        for days in range(8):
+            fire_date = (now + timedelta(days=days)).date()
+            fire_at = datetime.combine(fire_date, execution_time, tzinfo=self.timezone)
+            if fire_at <= now:
+                continue
+            weekday = (fire_date + timedelta(days=self.days_before_bookable)).strftime(
+                "%A"
+            )
+            if self.schedule.lookup(fire_time, weekday):
+                return Timer(fire_at, time_folder, weekday)
+        return None
+
+    def due_accounts(self, timer: Timer) -> list:
+        """Accounts of the timer's time folder with classes on its weekday."""
+        fire_time = f"{timer.time_folder[:2]}:{timer.time_folder[2:]}"
+        return [
+            Account(name, self.schedule.accounts[(timer.time_folder, name)])
+            for name in self.schedule.lookup(fire_time, timer.weekday)
+        ]
+
+    def fire(self, timer: Timer) -> dict:
+        """
+        Run the booking pipeline of a timer's accounts, firing at its T0.
+
+        Returns:
+            dict: account name -> result, see `SlotOrchestrator.run`.
+        """
+        accounts = self.due_accounts(timer)
+        self.last_fire_at = timer.fire_at
+        logging.info(
+            f"Pre-warming {len(accounts)} account(s) for {timer.time_folder}, firing at {timer.fire_at.isoformat()}"
+        )
+        if self.browser_pool is not None:
+            self.browser_pool.start()
+        fire_scheduler = FireScheduler(
+            execution_booking_time=timer.fire_at.time().isoformat(),
+            timezone=os.environ.get("BOOKING_TIMEZONE") or None,
+            fire_date=timer.fire_at.date(),
+        )
+        orchestrator = SlotOrchestrator(
+            accounts,
+            base_url=self.base_url,
+            browser_pool=self.browser_pool,
+            warmup=True,
+            # Pre-warming may start before midnight for a fire time after it
+            booking_date=timer.fire_at.date()
+            + timedelta(days=self.days_before_bookable),
+        )
+        return orchestrator.run(fire_scheduler)
+
+    def run_once(self) -> dict:
+        """
+        Wait for the next timer and fire it.
+
+        Returns:
+            dict: Results of the fired accounts, None if stopped or nothing is scheduled.
+        """
+        try:
+            self.plan()
+        except ScheduleError as e:
+            logging.error(f"! {e}")
+            self._stop.wait(MAX_IDLE_WAIT)
+            return None
+        if not self.timers:
+            logging.info("! No bookings scheduled within the next week")
+            self._stop.wait(MAX_IDLE_WAIT)
+            return None
+
+        timer = self.timers[0]
+        if repr(timer) != self._announced:
+            logging.info(f"Next booking: {timer}")
+            self._announced = repr(timer)
+        while not self._stop.is_set():
+            remaining = (
+                timer.fire_at - datetime.now(self.timezone)
+            ).total_seconds() - self.prewarm_lead
+            if remaining <= 0:
+                return self.fire(timer)
+            if remaining > MAX_IDLE_WAIT:
+                # Replan regularly so edited schedules are picked up.
+                self._stop.wait(MAX_IDLE_WAIT)
+                return None
+            self._stop.wait(remaining)
+        return None
+
+    def run_forever(self) -> None:
+        """Fire timers until `stop` is called or SIGINT/SIGTERM is received."""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: self.stop())
+        logging.info("Booking daemon started")
+        try:
+            while not self._stop.is_set():
+                results = self.run_once()
+                if results:
+                    logging.info(
+                        f"Results: { {name: result['state'] for name, result in results.items()} }"
+                    )
+        finally:
+            if self.browser_pool is not None:
+                self.browser_pool.close()
+            logging.info("Booking daemon stopped")
+
+    def stop(self) -> None:
+        """Stop after the current booking run."""
+        self._stop.set()
@@ -0,0 +1,282 @@
+import logging
+import os
+from datetime import date
+
+from .slotbooker import Booker, BookingState
+from .utils.alerts import ErrorTypes
+from .utils.fire_scheduler import FireScheduler
+from .utils.helpers import (
+    get_day,
+    get_days_before_bookable,
+    text_contains_list_keywords,
+)
+from .utils.octiv_api import (
+    DEFAULT_API_URL,
+    EndpointEnum,
+    OctivApiClient,
+    OctivApiError,
+)
+from .utils.tracing import traced
+
+
+class HttpBooker(Booker):
+    """
+    A booking agent that talks to the Octiv HTTP API instead of driving the SPA.
+
+    It exposes the same `login` / `switch_day` / `book_class` / `send_result`
+    surface as `Booker` but never starts a browser. All requests go through one
+    pooled keep-alive connection of `OctivApiClient`.
+
+    Attributes:
+        api_client (OctivApiClient): Client for the Octiv API.
+        class_dates (list): Classes offered on the selected day, as returned by the API.
+        user_id (Any): Id of the logged in user.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_url: str = None,
+        chromedriver: str = None,
+        env: str = "prd",
+        browser_pool=None,
+    ):
+        self.api_client = OctivApiClient(
+            api_url or os.environ.get("OCTIV_API_URL") or DEFAULT_API_URL
+        )
+        self.class_dates = []
+        self.user_id = None
+        self._booking_date = None
+        super().__init__(
+            base_url=base_url,
+            chromedriver=chromedriver,
+            env=env,
+            browser_pool=browser_pool,
+        )
+
+    def _create_selenium_manager(self, chromedriver: str, env: str) -> None:
+        return None
+
+    def __continue_booking(self) -> bool:
+        """Continues the booking process."""
+        return True
+
+    def __stop_booking(self) -> bool:
+        """Stops the booking process."""
+        logging.info("! Stopping booking process")
+        return False
+
+    def close_driver(self) -> None:
+        self.api_client.close()
+        logging.info("API session closed")
+
+    @traced("login")
+    def login(self, username: str, password: str) -> bool:
+        """Login to the Octiv API using the provided credentials.
+
+        Raises:
+            OctivApiError: If the API is unreachable or answers unexpectedly.
+        """
+        logging.info(f"Log in as: {username}")
+        status, body = self.api_client.request(
+            "POST",
+            EndpointEnum.LOGIN.value,
+            payload={"username": username, "password": password},
+        )
+
+        if status in (401, 422):
+            logging.error(f"Credentials wrong {(body or {}).get('message', '')}")
+            return self.__stop_booking()
+        if status != 200 or not (body or {}).get("accessToken"):
+            raise OctivApiError(f"Unexpected login response ({status})", status, body)
+
+        self.api_client.token = body["accessToken"]
+        self.user_id = body.get("userId")
+        logging.success("Login successful")
+        return self.__continue_booking()
+
+    @traced("switch_day")
+    def switch_day(self, booking_date: date = None) -> (str, str):
+        """Select the booking day and fetch its classes.
+
+        Args:
+            booking_date (date): Day to book, defaults to DAYS_BEFORE_BOOKABLE days
+                from today.
+        """
+        future_date, _ = get_day(get_days_before_bookable(), booking_date)
+        self.day = future_date.strftime("%A")
+        self._booking_date = future_date
+
+        status, body = self.api_client.request(
+            "GET",
+            EndpointEnum.CLASS_DATES.value,
+            params={"date": future_date.isoformat()},
+        )
+        if status != 200:
+            logging.error(f"! Error during day switch: status {status}")
+            self.__stop_booking()
+            raise OctivApiError(f"Could not fetch classes ({status})", status, body)
+
+        self.class_dates = (body or {}).get("data", [])
+        logging.info(f"Booking on {self.day}, {future_date}")
+
+        self.booking_information.update(
+            {"current_date": f"{self.day}, {future_date.strftime('%d/%m/%Y')}"}
+        )
+        return self.day, future_date.strftime("%d/%m/%Y")
+
+    def _keep_alive(self) -> bool:
+        """Keep the API connection open by re-fetching the booking day."""
+        try:
+            status, body = self.api_client.request(
+                "GET",
+                EndpointEnum.CLASS_DATES.value,
+                params={"date": self._booking_date.isoformat()},
+            )
+        except OctivApiError as e:
+            logging.warning(f"! Could not refresh schedule: {e}")
+            return False
+        if status != 200:
+            return False
+        self.class_dates = (body or {}).get("data", [])
+        return True
+
+    def _soft_refresh(self) -> None:
+        """Re-fetch the classes of the booking day."""
+        if self._keep_alive():
+            logging.info("Schedule refreshed")
+
+    @traced("book_class")
+    def book_class(
+        self,
+        class_dict: dict,
+        enter_class: bool = True,
+        fire_scheduler: FireScheduler = None,
+    ) -> (bool, str, str):
+        """Book classes based on provided booking information.
+
+        A shared, already synchronized `fire_scheduler` can be passed in to fire
+        several bookers at the same T0; otherwise one is created from the environment.
+        """
+        logging.info(f"{'Booking' if enter_class else 'Cancelling'} classes...")
+        if fire_scheduler is None:
+            fire_scheduler = FireScheduler.from_env()
+            self._synchronize_clock(fire_scheduler)
+        logging.info(
+            f"Execution booking time set to {fire_scheduler.target_datetime().isoformat()}"
+        )
+
+        self.class_dict = class_dict.get(self.day)
+        class_dates = {
+            (
+                class_date.get("name"),
+                str(class_date.get("startTime", ""))[:5],
+            ): class_date
+            for class_date in self.class_dates
+        }
+        for (class_name, time_slot), class_date in class_dates.items():
+            logging.info(f"- Time: {time_slot} - Class: {class_name}")
+
+        for entry in self.class_dict:
+            if entry.get("class") == "None":
+                logging.info("! No class set for this day.")
+                self.booking_successful = BookingState.NEUTRAL
+                return self.__stop_booking()
+
+            self.booking_time_slot, self.booking_class_slot = (
+                entry.get("time"),
+                entry.get("class"),
+            )
+            self.booking_information["bookings"].append(
+                {"time": entry.get("time"), "class": entry.get("class")}
+            )
+
+            if not class_dates:
+                logging.info("! No classes found overall for this day.")
+                self.booking_successful = BookingState.FAIL
+                return self.__stop_booking()
+
+            class_date = class_dates.get(
+                (self.booking_class_slot, self.booking_time_slot)
+            )
+            if class_date is None:
+                logging.info(
+                    f"! No class of type {self.booking_class_slot} is present on {self.day} at {self.booking_time_slot}"
+                )
+                self.booking_successful = BookingState.FAIL
+                return self.__stop_booking()
+
+            if self._book_class_date(
+                class_date, entry.get("wl"), fire_scheduler, enter_class
+            ):
+                self.booking_successful = BookingState.SUCCESS
+                return self.__stop_booking()
+
+        return self.__continue_booking()
+
+    @traced("book_slot")
+    def _book_class_date(
+        self,
+        class_date: dict,
+        prioritize_waiting_list,
+        fire_scheduler: FireScheduler,
+        enter_class: bool = True,
+    ) -> bool:
+        """Book or cancel a single class date through the API."""
+        logging.info(f"> Booking {self.booking_class_slot} at {self.booking_time_slot}")
+        jitter = fire_scheduler.wait()
+
+        if enter_class:
+            status, body = self.api_client.request(
+                "POST",
+                EndpointEnum.CLASS_BOOKINGS.value,
+                payload={"classDateId": class_date["id"], "userId": self.user_id},
+            )
+        else:
+            status, body = self.api_client.request(
+                "DELETE",
+                EndpointEnum.CLASS_BOOKING.value.format(
+                    booking_id=class_date.get("bookingId")
+                ),
+            )
+        logging.info(
+            f"Fired {jitter * 1000:.3f}ms after execution booking time",
+            extra={"fire_latency_ms": round(jitter * 1000, 3)},
+        )
+
+        if 200 <= status < 300:
+            logging.success("Class booked" if enter_class else "Class cancelled")
+            return self.__continue_booking()
+
+        message = (body or {}).get("message", "")
+        if text_contains_list_keywords(message, ["full", "voll", "waiting list"]):
+            logging.warning("Class full")
+            self._join_waiting_list(class_date, prioritize_waiting_list)
+        else:
+            error = next(
+                (error for error in ErrorTypes if error.value == message),
+                ErrorTypes.NotIdentifyError,
+            )
+            logging.error(f"identified: {error.value} ({status}: {message})")
+
+        logging.error("Booking process stopped due to an error.")
+        return self.__stop_booking()
+
+    def _join_waiting_list(self, class_date: dict, prioritize_waiting_list) -> None:
+        if not prioritize_waiting_list:
+            logging.info(
+                f"Parameter 'wl' is set to {prioritize_waiting_list} > Skipping waiting list"
+            )
+            logging.info("Looking for further slots...")
+            return
+
+        logging.info("Booking waiting list...")
+        status, _ = self.api_client.request(
+            "POST",
+            EndpointEnum.WAITING_LIST.value,
+            payload={"classDateId": class_date["id"], "userId": self.user_id},
+        )
+        if 200 <= status < 300:
+            logging.info("Waiting list booked")
+        else:
+            logging.warning(f"! Could not join waiting list ({status})")
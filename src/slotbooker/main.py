@@ -1,36 +1,58 @@
 import os
+import sys
 import logging
-import yaml
-from .slotbooker import Booker
 
+# Commands import the booking stack (Selenium, PyYAML, ...) when they run, so
+# importing this module and starting the CLI stay cheap.
 
-# Define file paths for configuration and classes
+# Directory of the package data, holding the classes configuration
 parent_dir = os.path.dirname(os.path.dirname(__file__))
-classes_path = os.path.join(parent_dir, "data/classes.yaml")
 
-classes = yaml.safe_load(open(classes_path))
+
+def load_classes() -> dict:
+    """
+    Validate and parse the classes configuration of single-account runs.
+
+    Raises:
+        ScheduleError: If the configuration is malformed, before anything is booked.
+    """
+    from .utils.schedule import DEFAULT_ACCOUNT, ScheduleCompiler
+
+    schedule = ScheduleCompiler.from_env(os.path.join(parent_dir, "data")).compile(
+        time_folders=[]
+    )
+    return schedule.accounts[(None, DEFAULT_ACCOUNT)]
 
 
 def production():
     """Slotbooker Main Function."""
+    from .orchestrator import book_account, create_booker, fall_back_to_selenium
+    from .utils.octiv_api import OctivApiError
+
+    classes = load_classes()
 
     # Retrieve environment variables
     user = os.environ.get("OCTIV_USERNAME")
     password = os.environ.get("OCTIV_PASSWORD")
 
     # Initialize the Booker instance
-    booker = Booker(
+    booker = create_booker(
         base_url="https://app.octivfitness.com/login",
     )
 
-    # Login and book the class
-    booker.login(username=user, password=password)
-
-    booker.switch_day()
-    booker.book_class(
-        class_dict=classes.get("class_dict"),
-        enter_class=True,
-    )
+    # Login and book the class, optionally holding the warm session until
+    # shortly before the booking fires
+    booking = {
+        "username": user,
+        "password": password,
+        "class_dict": classes.get("class_dict"),
+        "warmup": os.environ.get("WARMUP", "false").lower() == "true",
+    }
+    try:
+        book_account(booker, **booking)
+    except OctivApiError as e:
+        booker = fall_back_to_selenium(booker, e)
+        book_account(booker, **booking)
     # Send results via email
     booker.send_result(
         sender=os.getenv("EMAIL_SENDER"),
@@ -43,6 +65,8 @@ def production():
 
 
 def development(ci_run=False):
+    from .slotbooker import Booker
+
     # get env variables
     user = os.environ.get("OCTIV_USERNAME")
     if ci_run:
@@ -65,7 +89,7 @@ def development(ci_run=False):
         booker.switch_day()
 
         booker.book_class(
-            class_dict=classes.get("class_dict"),
+            class_dict=load_classes().get("class_dict"),
         )
 
         # # Configure mailing settings && send mail
@@ -79,8 +103,32 @@ def development(ci_run=False):
         # )
 
 
+def orchestrate(time_folder: str = None):
+    """Book all accounts of a time folder (e.g. "1900") in one process."""
+    from .orchestrator import SlotOrchestrator, load_accounts
+
+    time_folder = time_folder or (
+        sys.argv[1] if len(sys.argv) > 1 else os.environ.get("BOOKING_TIME_FOLDER")
+    )
+    if not time_folder:
+        raise ValueError("Pass the time folder as argument or set BOOKING_TIME_FOLDER")
+
+    accounts = load_accounts(time_folder, data_dir=os.path.join(parent_dir, "data"))
+    results = SlotOrchestrator(accounts).run()
+    print({name: result["state"] for name, result in results.items()})
+
+
+def daemon():
+    """Book all time folders from one long-running process, see `BookingDaemon`."""
+    from .daemon import BookingDaemon
+
+    BookingDaemon(data_dir=os.path.join(parent_dir, "data")).run_forever()
+
+
 def main():
-    if os.environ.get("IS_TEST"):
+    if len(sys.argv) > 1 and sys.argv[1] == "daemon":
+        daemon()
+    elif os.environ.get("IS_TEST"):
         development(ci_run=True)
     else:
         production()
@@ -1,5 +1,10 @@
+import atexit
+import functools
+import logging
 import os
+import threading
 from email.message import EmailMessage
+from html import escape
 import ssl
 import smtplib
 from typing import List
@@ -8,22 +13,178 @@ from string import Template
 
 EMAIL_SMTP_SERVER = "smtp.gmail.com"
 EMAIL_SMTP_PORT = 465
+# "ssl" connects with implicit TLS, "starttls" upgrades a plain connection,
+# "none" sends unencrypted (local relays and tests only)
+EMAIL_SMTP_SECURITY = "ssl"
+HTML_TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "html-templates"
+)
+
+SUCCESSFUL_BOOKING_TEMPLATE = Template(
+    """
+        <p class="booking-time"><strong>${booking_class}</strong></p>
+        <p class="booking-time"><strong>${booking_date}; ${booking_time}</strong></p>
+        """
+)
+UNSUCCESSFUL_BOOKING_TEMPLATE = Template(
+    """
+            <li class="booking-time"><strong>${booking_class}</strong> on <strong>${booking_date}</strong> at <strong>${booking_time}</strong></li>
+        """
+)
+
+DETAILED_BOOKING_TEMPLATE = Template(
+    """
+                    <tr class="booking-time">
+                        <td><strong>${account}</strong></td>
+                        <td class="state-${state_class}">${state}</td>
+                        <td>${booking_date}</td>
+                        <td>${bookings}</td>
+                    </tr>
+        """
+)
 
 
-class MailHandler:
-    html_templates_path = "html-templates/"
+@functools.lru_cache(maxsize=None)
+def load_template(name: str) -> Template:
+    """Read and compile an HTML template of `html-templates/` once per process."""
+    with open(os.path.join(HTML_TEMPLATES_DIR, name), "r") as file:
+        return Template(file.read())
+
+
+class SmtpSession:
+    """
+    A reusable, authenticated SMTP connection.
+
+    The connection is opened on the first send and kept for later messages, so a
+    run or the daemon pays the TLS handshake and login once. A send that fails
+    because the server dropped the connection reconnects and retries once.
+    Sends are serialized, as SMTP allows one transaction at a time.
+
+    Attributes:
+        host (str): SMTP server.
+        port (int): SMTP port.
+        security (str): "ssl", "starttls", or "none".
+        user (str): Login user.
+        connections (int): Number of connections opened so far.
+    """
+
+    def __init__(
+        self, host: str, port: int, user: str, password: str, security: str = "ssl"
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.security = security
+        self.connections = 0
+        self._smtp = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.security == "ssl":
+            smtp = smtplib.SMTP_SSL(
+                self.host, self.port, context=ssl.create_default_context()
+            )
+        else:
+            smtp = smtplib.SMTP(self.host, self.port)
+            if self.security == "starttls":
+                smtp.starttls(context=ssl.create_default_context())
+        smtp.login(self.user, self.password)
+        self.connections += 1
+        return smtp
+
+    def send(self, message: EmailMessage) -> None:
+        """Send a message, reconnecting once if the connection was lost."""
+        self.send_many([message])
+
+    def send_many(self, messages: List[EmailMessage]) -> None:
+        """
+        Send several messages over the same connection.
+
+        Args:
+            messages (List[EmailMessage]): Messages with From and To headers set.
+        """
+        with self._lock:
+            for message in messages:
+                try:
+                    if self._smtp is None:
+                        self._smtp = self._connect()
+                    self._smtp.send_message(message)
+                except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                    # The server answered, so the connection itself is fine
+                    raise
+                except (smtplib.SMTPServerDisconnected, OSError) as e:
+                    logging.warning(f"! SMTP connection lost, reconnecting: {e}")
+                    self._reset()
+                    self._smtp = self._connect()
+                    self._smtp.send_message(message)
+
+    def _reset(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.close()
+        finally:
+            self._smtp = None
+
+    def close(self) -> None:
+        """Quit the connection, if open."""
+        with self._lock:
+            if self._smtp is None:
+                return
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._reset()
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_smtp_session(user: str, password: str) -> SmtpSession:
+    """
+    The shared session of an account on the configured server.
+
+    The server is read from EMAIL_SMTP_SERVER, EMAIL_SMTP_PORT, and
+    EMAIL_SMTP_SECURITY. Sessions live until the process exits.
+    """
+    host = os.environ.get("EMAIL_SMTP_SERVER", EMAIL_SMTP_SERVER)
+    port = int(os.environ.get("EMAIL_SMTP_PORT", EMAIL_SMTP_PORT))
+    security = os.environ.get("EMAIL_SMTP_SECURITY", EMAIL_SMTP_SECURITY).lower()
+    key = (host, port, security, user, password)
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = SmtpSession(host, port, user, password, security)
+        return _sessions[key]
+
+
+@atexit.register
+def close_smtp_sessions() -> None:
+    """Quit all shared SMTP sessions."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
 
+
+class MailHandler:
     def __init__(
         self,
         email_sender: str,
         email_password: str,
         email_receiver: str,
         format: str = "plain",
+        outbox=None,
     ) -> None:
         self.format = format
         self.email_sender = email_sender
         self.email_password = email_password
         self.email_receiver = email_receiver
+        # MailOutbox queuing the messages, None sends them synchronously
+        self.outbox = outbox
 
     def send_logs_to_mail(
         self,
@@ -60,26 +221,28 @@ class MailHandler:
             body=body,
         )
 
-    def _send_email(
+    def _build_email(
         self,
         sender: str,
-        password: str,
         receivers: List[str],
         subject: str,
         body: str,
         attachment_path: str = None,
-    ) -> None:
+        attachment_paths: List[str] = None,
+    ) -> EmailMessage:
         """
-        Sends an email with the specified parameters.
+        Compose an email with the specified parameters.
 
         Args:
             sender (str): The email address of the sender.
-            password (str): The password of the sender's email account.
             receivers (List[str]): A list of receiver email addresses.
             subject (str): The subject of the email.
-            body (str): The body of the email.
-            format (str): The format of the email body.
+            body (str): The body of the email, in the handler's format.
             attachment_path (str): The path to the file to be attached (default is None).
+            attachment_paths (List[str]): Paths of further files to attach (default is None).
+
+        Returns:
+            EmailMessage: The composed message.
         """
         em = EmailMessage()
         em["From"] = sender
@@ -87,24 +250,50 @@ class MailHandler:
         em["Subject"] = subject
         em.set_content(body, self.format)
 
-        if attachment_path:
-            with open(attachment_path, "rb") as attachment:
+        for path in [attachment_path, *(attachment_paths or [])]:
+            if not path:
+                continue
+            with open(path, "rb") as attachment:
                 file_data = attachment.read()
-                file_name = os.path.basename(attachment_path)
+                file_name = os.path.basename(path)
                 em.add_attachment(
                     file_data,
                     maintype="text",
                     subtype="plain",
                     filename=file_name,
                 )
+        return em
 
-        context = ssl.create_default_context()
+    def _send_email(
+        self,
+        sender: str,
+        password: str,
+        receivers: List[str],
+        subject: str,
+        body: str,
+        attachment_path: str = None,
+        attachment_paths: List[str] = None,
+    ) -> None:
+        """
+        Sends an email over the shared SMTP session of the sender, or queues it
+        in the outbox of the handler.
 
-        with smtplib.SMTP_SSL(
-            EMAIL_SMTP_SERVER, EMAIL_SMTP_PORT, context=context
-        ) as smtp:
-            smtp.login(sender, password)
-            smtp.sendmail(sender, receivers, em.as_string())
+        Args:
+            sender (str): The email address of the sender.
+            password (str): The password of the sender's email account.
+            receivers (List[str]): A list of receiver email addresses.
+            subject (str): The subject of the email.
+            body (str): The body of the email.
+            attachment_path (str): The path to the file to be attached (default is None).
+            attachment_paths (List[str]): Paths of further files to attach (default is None).
+        """
+        em = self._build_email(
+            sender, receivers, subject, body, attachment_path, attachment_paths
+        )
+        if self.outbox is not None:
+            self.outbox.enqueue(em, password)
+            return
+        get_smtp_session(sender, password).send(em)
 
         print("Email sent successfully!")
 
@@ -131,25 +320,11 @@ class MailHandler:
 
         subject = "Booking Confirmation"
 
-        # Get the current working directory and construct the file path
-        current_path = os.path.dirname(os.path.abspath(__file__))
-        template_path = os.path.join(
-            current_path, f"{self.html_templates_path}template_successful_booking.html"
-        )
-
-        # Read the HTML template from the file
-        with open(template_path, "r") as file:
-            template = Template(file.read())
+        template = load_template("template_successful_booking.html")
 
-        booking_template = Template(
-            """
-        <p class="booking-time"><strong>${booking_class}</strong></p>
-        <p class="booking-time"><strong>${booking_date}; ${booking_time}</strong></p>
-        """
-        )
         booking_html = "".join(
             [
-                booking_template.substitute(
+                SUCCESSFUL_BOOKING_TEMPLATE.substitute(
                     booking_class=booking["class"],
                     booking_date=booking_information["current_date"],
                     booking_time=booking["time"],
@@ -198,25 +373,11 @@ class MailHandler:
 
         subject = "Booking Not Successful"
 
-        # Get the current working directory and construct the file path
-        current_path = os.path.dirname(os.path.abspath(__file__))
-        template_path = os.path.join(
-            current_path,
-            f"{self.html_templates_path}template_unsuccessful_booking.html",
-        )
-
-        # Read the HTML template from the file
-        with open(template_path, "r") as file:
-            template = Template(file.read())
+        template = load_template("template_unsuccessful_booking.html")
 
-        booking_template = Template(
-            """
-            <li class="booking-time"><strong>${booking_class}</strong> on <strong>${booking_date}</strong> at <strong>${booking_time}</strong></li>
-        """
-        )
         booking_html = "".join(
             [
-                booking_template.substitute(
+                UNSUCCESSFUL_BOOKING_TEMPLATE.substitute(
                     booking_class=booking["class"],
                     booking_date=booking_information["current_date"],
                     booking_time=booking["time"],
@@ -240,6 +401,67 @@ class MailHandler:
             attachment_path=attachment_path,
         )
 
+    def send_detailed_booking_email(
+        self,
+        results: dict,
+        attachment_paths: List[str] = None,
+    ) -> None:
+        """
+        Send one HTML email summarizing the booking results of several accounts.
+
+        Args:
+            results (dict): account name -> {"state": str, "booking_information": dict},
+                as returned by `SlotOrchestrator.run`.
+            attachment_paths (List[str]): Paths of the files to attach, e.g. the
+                log files of the accounts (default is None).
+        """
+        email_receiver_name = os.getenv("EMAIL_RECEIVER_NAME")
+
+        if not all([self.email_sender, self.email_password, self.email_receiver]):
+            raise ValueError("Email sender, password, and receiver email must be set.")
+
+        if email_receiver_name is None:
+            email_receiver_name = self.email_receiver.split("@")[0]
+
+        booked = sum(result["state"] == "SUCCESS" for result in results.values())
+        subject = f"Booking Report: {booked} of {len(results)} booked"
+
+        template = load_template("template_detailed_booking.html")
+
+        booking_html = "".join(
+            [
+                DETAILED_BOOKING_TEMPLATE.substitute(
+                    account=escape(account),
+                    state=result["state"],
+                    state_class=result["state"].lower(),
+                    booking_date=escape(
+                        str(result["booking_information"].get("current_date", "-"))
+                    ),
+                    bookings="<br>".join(
+                        escape(f"{booking['class']} at {booking['time']}")
+                        for booking in result["booking_information"].get("bookings", [])
+                    )
+                    or "-",
+                )
+                for account, result in results.items()
+            ]
+        )
+        body = template.safe_substitute(
+            receiver_name=email_receiver_name,
+            booking_summary=f"{booked} of {len(results)} account(s) booked successfully.",
+            booking_information=booking_html,
+            current_year=datetime.now().year,
+        )
+
+        self._send_email(
+            sender=self.email_sender,
+            password=self.email_password,
+            receivers=[self.email_receiver],
+            subject=subject,
+            body=body,
+            attachment_paths=attachment_paths,
+        )
+
     def send_no_classes_email(
         self, booking_date: str, attachment_path: str = None
     ) -> None:
@@ -260,15 +482,7 @@ class MailHandler:
 
         subject = "No Classes Found"
 
-        # Get the current working directory and construct the file path
-        current_path = os.path.dirname(os.path.abspath(__file__))
-        template_path = os.path.join(
-            current_path, f"{self.html_templates_path}template_neutral_booking.html"
-        )
-
-        # Read the HTML template from the file
-        with open(template_path, "r") as file:
-            template = Template(file.read())
+        template = load_template("template_neutral_booking.html")
 
         # Customize the template with actual values
         body = template.safe_substitute(
@@ -0,0 +1,228 @@
+import logging
+import os
+import smtplib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from email import message_from_binary_file, policy
+from email.message import EmailMessage
+
+from .mailing import get_smtp_session
+
+DEFAULT_OUTBOX_DIR = ".mail_outbox"
+DEFAULT_OUTBOX_WORKERS = 2
+DEFAULT_OUTBOX_ATTEMPTS = 5
+# Seconds before the first retry; the wait doubles up to MAX_RETRY_WAIT
+RETRY_WAIT = 2
+MAX_RETRY_WAIT = 60
+MESSAGE_SUFFIX = ".eml"
+
+
+class MailOutbox:
+    """
+    Durable on-disk outbox of notification emails.
+
+    `enqueue` writes the message to the outbox directory and returns at once; a
+    pool of background workers delivers it over the shared SMTP session of the
+    sender and deletes the file. Failed sends are retried with exponential
+    backoff. Messages that are still undelivered after the last attempt, or when
+    the process dies, stay on disk and are picked up again by the next enqueue,
+    also from a later run. Passwords are never written to disk: they are kept in
+    memory per sender, or looked up from the <ACCOUNT>_EMAIL_SENDER and
+    <ACCOUNT>_EMAIL_PASSWORD environment variables for messages of earlier runs.
+
+    Worker threads are joined before the interpreter exits, so queued messages
+    are delivered before the process ends.
+
+    Attributes:
+        outbox_dir (str): Directory holding the queued messages.
+        workers (int): Maximum number of messages sent concurrently.
+        attempts (int): Send attempts per message and process.
+        retry_wait (float): Seconds before the first retry.
+        max_retry_wait (float): Upper bound of the wait between retries.
+    """
+
+    def __init__(
+        self,
+        outbox_dir: str,
+        workers: int = DEFAULT_OUTBOX_WORKERS,
+        attempts: int = DEFAULT_OUTBOX_ATTEMPTS,
+        retry_wait: float = RETRY_WAIT,
+        max_retry_wait: float = MAX_RETRY_WAIT,
+    ):
+        self.outbox_dir = outbox_dir
+        self.workers = workers
+        self.attempts = attempts
+        self.retry_wait = retry_wait
+        self.max_retry_wait = max_retry_wait
+        self._passwords = {}
+        self._futures = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MailOutbox":
+        """
+        Create an outbox from MAIL_OUTBOX_DIR, MAIL_OUTBOX_WORKERS, and MAIL_OUTBOX_ATTEMPTS.
+
+        Returns:
+            MailOutbox: The outbox, or None if MAIL_OUTBOX_DIR is "none".
+        """
+        outbox_dir = os.environ.get("MAIL_OUTBOX_DIR", DEFAULT_OUTBOX_DIR)
+        if outbox_dir.lower() == "none":
+            return None
+        return cls(
+            outbox_dir=outbox_dir,
+            workers=int(os.environ.get("MAIL_OUTBOX_WORKERS", DEFAULT_OUTBOX_WORKERS)),
+            attempts=int(
+                os.environ.get("MAIL_OUTBOX_ATTEMPTS", DEFAULT_OUTBOX_ATTEMPTS)
+            ),
+        )
+
+    def enqueue(self, message: EmailMessage, password: str) -> str:
+        """
+        Store a message and schedule its delivery.
+
+        Args:
+            message (EmailMessage): Message with From and To headers set.
+            password (str): Password of the sender's email account.
+
+        Returns:
+            str: Path of the queued message.
+        """
+        self._passwords[message["From"]] = password
+        os.makedirs(self.outbox_dir, mode=0o700, exist_ok=True)
+        path = os.path.join(
+            self.outbox_dir, f"{time.time_ns()}-{uuid.uuid4().hex}{MESSAGE_SUFFIX}"
+        )
+        temp_path = f"{path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(message.as_bytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+        logging.info(f"Queued email '{message['Subject']}' to {message['To']}")
+        self.start()
+        return path
+
+    def pending(self) -> list:
+        """Paths of the messages that are not delivered yet, oldest first."""
+        try:
+            names = os.listdir(self.outbox_dir)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self.outbox_dir, name)
+            for name in sorted(names)
+            if name.endswith(MESSAGE_SUFFIX)
+        ]
+
+    def start(self) -> None:
+        """Schedule the delivery of every pending message that is not in flight."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="mail-outbox"
+                )
+            for path in self.pending():
+                if path not in self._futures:
+                    future = self._executor.submit(self._deliver, path)
+                    self._futures[path] = future
+                    future.add_done_callback(lambda _, path=path: self._done(path))
+
+    def _done(self, path: str) -> None:
+        with self._lock:
+            self._futures.pop(path, None)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait for the scheduled deliveries.
+
+        Args:
+            timeout (float): Seconds to wait at most, None waits until all finished.
+
+        Returns:
+            bool: True if no delivery is in flight anymore.
+        """
+        with self._lock:
+            futures = list(self._futures.values())
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def close(self, timeout: float = None) -> None:
+        """Flush and stop the workers. Undelivered messages stay on disk."""
+        self.flush(timeout)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _password(self, sender: str) -> str:
+        if sender in self._passwords:
+            return self._passwords[sender]
+        for key, value in os.environ.items():
+            if key.endswith("EMAIL_SENDER") and value == sender:
+                password = os.environ.get(f"{key[: -len('SENDER')]}PASSWORD")
+                if password:
+                    return password
+        return None
+
+    def _deliver(self, path: str) -> None:
+        # tenacity is only loaded by runs that send mail
+        from tenacity import (
+            Retrying,
+            retry_if_exception_type,
+            retry_if_not_exception_type,
+            stop_after_attempt,
+            wait_exponential,
+        )
+
+        with open(path, "rb") as file:
+            message = message_from_binary_file(file, policy=policy.default)
+        sender = message["From"]
+        password = self._password(sender)
+        if password is None:
+            logging.warning(f"! No password known for {sender}, keeping {path}")
+            return
+
+        retrying = Retrying(
+            stop=stop_after_attempt(self.attempts),
+            wait=wait_exponential(multiplier=self.retry_wait, max=self.max_retry_wait),
+            # Wrong credentials do not heal by waiting
+            retry=retry_if_exception_type((smtplib.SMTPException, OSError))
+            & retry_if_not_exception_type(smtplib.SMTPAuthenticationError),
+            before_sleep=lambda state: logging.warning(
+                f"! Sending '{message['Subject']}' failed (attempt {state.attempt_number}), retrying: {state.outcome.exception()!r}"
+            ),
+            reraise=True,
+        )
+        try:
+            for attempt in retrying:
+                with attempt:
+                    get_smtp_session(sender, password).send(message)
+        except (smtplib.SMTPException, OSError) as e:
+            logging.error(f"! Email '{message['Subject']}' kept in outbox: {e!r}")
+            return
+        os.remove(path)
+        logging.info(f"Email '{message['Subject']}' sent to {message['To']}")
+
+
+_outboxes = {}
+_outboxes_lock = threading.Lock()
+
+
+def get_outbox() -> MailOutbox:
+    """
+    The shared outbox configured by the environment, see `MailOutbox.from_env`.
+
+    Returns:
+        MailOutbox: The outbox, or None if notifications are sent synchronously.
+    """
+    outbox = MailOutbox.from_env()
+    if outbox is None:
+        return None
+    key = (os.path.abspath(outbox.outbox_dir), outbox.workers, outbox.attempts)
+    with _outboxes_lock:
+        return _outboxes.setdefault(key, outbox)
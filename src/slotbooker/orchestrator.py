@@ -0,0 +1,362 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from .http_booker import HttpBooker
+from .slotbooker import Booker
+from .utils.browser_pool import BrowserPool
+from .utils.clock_sync import synchronize_clock
+from .utils.fire_scheduler import FireScheduler
+from .utils.logging import current_account
+from .utils.octiv_api import OctivApiError
+from .utils.schedule import ScheduleCompiler, ScheduleError
+
+BASE_URL = "https://app.octivfitness.com/login"
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+# send_mail option under which a result state is included in a digest
+DIGEST_TRIGGERS = {
+    "SUCCESS": "on_success",
+    "NEUTRAL": "on_neutral",
+    "FAIL": "on_failure",
+    "ERROR": "on_failure",
+}
+
+
+def create_booker(
+    base_url: str, env: str = "prd", browser_pool: BrowserPool = None
+) -> Booker:
+    """Create the booking backend selected by BOOKER_BACKEND ("selenium" or "http")."""
+    if os.environ.get("BOOKER_BACKEND", "selenium").lower() == "http":
+        return HttpBooker(base_url=base_url, env=env, browser_pool=browser_pool)
+    return Booker(base_url=base_url, env=env, browser_pool=browser_pool)
+
+
+def book_account(
+    booker: Booker,
+    username: str,
+    password: str,
+    class_dict: dict,
+    fire_scheduler: FireScheduler = None,
+    booking_date: date = None,
+    warmup: bool = False,
+) -> bool:
+    """
+    Log in and book the classes of one account.
+
+    Args:
+        booker (Booker): Backend to book with.
+        username (str): Octiv username.
+        password (str): Octiv password.
+        class_dict (dict): Classes to book per weekday.
+        fire_scheduler (FireScheduler): Scheduler of T0, created from the
+            environment if None.
+        booking_date (date): Day to book, see `Booker.switch_day`.
+        warmup (bool): Whether to hold the session warm until shortly before T0.
+
+    Returns:
+        bool: Whether the login succeeded.
+
+    Raises:
+        OctivApiError: If the HTTP backend fails at any step.
+    """
+    if not booker.login(username=username, password=password):
+        return False
+    booker.switch_day(booking_date=booking_date)
+    if warmup:
+        fire_scheduler = booker.hold_until_fire(fire_scheduler)
+    booker.book_class(
+        class_dict=class_dict, enter_class=True, fire_scheduler=fire_scheduler
+    )
+    return True
+
+
+def fall_back_to_selenium(
+    booker: Booker, error: OctivApiError, env: str = "prd"
+) -> Booker:
+    """Replace a failed HTTP backend by a Selenium booker on the same browser pool."""
+    logging.warning(f"! HTTP backend failed, falling back to Selenium: {error}")
+    booker.close_driver()
+    booker.loggingHandler.close()
+    return Booker(base_url=booker.base_url, env=env, browser_pool=booker.browser_pool)
+
+
+class Account:
+    """
+    A single Octiv account of a time folder, e.g. `data/1900/charly`.
+
+    Credentials are read from environment variables prefixed with the upper-cased
+    account name (e.g. CHARLY_OCTIV_USERNAME), falling back to the unprefixed
+    variables used by single-account runs.
+
+    Attributes:
+        name (str): Name of the account directory.
+        classes (dict): Parsed content of the account's classes.yaml.
+    """
+
+    def __init__(self, name: str, classes: dict):
+        self.name = name
+        self.classes = classes
+
+    def env(self, key: str) -> str:
+        return os.environ.get(f"{self.name.upper()}_{key}") or os.environ.get(key)
+
+    def __repr__(self) -> str:
+        return f"Account({self.name!r})"
+
+
+def load_accounts(time_folder: str, data_dir: str = DATA_DIR) -> list:
+    """
+    Load every account below `data_dir/<time_folder>/`.
+
+    All schedules of the folder are validated before any account is booked.
+
+    Args:
+        time_folder (str): Name of the time folder, e.g. "1900".
+        data_dir (str): Directory holding the time folders.
+
+    Returns:
+        list[Account]: Accounts with a classes.yaml, sorted by name.
+
+    Raises:
+        ScheduleError: If the time folder is missing or a schedule is malformed.
+    """
+    if not os.path.isdir(os.path.join(data_dir, time_folder)):
+        raise ScheduleError(
+            [f"{os.path.join(data_dir, time_folder)}: no such time folder"]
+        )
+    schedule = ScheduleCompiler.from_env(data_dir).compile(
+        time_folders=[time_folder], include_default=False
+    )
+    return [Account(name, classes) for (_, name), classes in schedule.accounts.items()]
+
+
+class SlotOrchestrator:
+    """
+    Runs the booking pipelines of all accounts of a time slot in one process.
+
+    Every account gets its own `Booker` on a bounded worker pool. All bookers
+    share one clock-synchronized `FireScheduler`, so they fire at the same T0.
+    With SHARED_BROWSER=true the Selenium bookers lease isolated contexts of a
+    single Chrome from a `BrowserPool` instead of launching one Chrome each.
+    With WARMUP=true every account holds its session warm until shortly before T0.
+    A long-running caller may pass its own `browser_pool`, which then outlives the run.
+    With MAIL_DIGEST=true the result emails are not sent per account; after the run
+    every receiver gets one digest of the results of its accounts instead.
+
+    Attributes:
+        accounts (list[Account]): Accounts to book for.
+        max_workers (int): Maximum number of accounts processed concurrently,
+            defaults to ORCHESTRATOR_MAX_WORKERS or one worker per account.
+        send_mail (list[str]): Which result emails to send, see `Booker.send_result`.
+        digest (bool): Whether results are mailed as one digest per receiver.
+        booking_date (date): Day every account books, None for DAYS_BEFORE_BOOKABLE
+            days from today.
+        results (dict): Aggregated result per account name after `run`.
+    """
+
+    def __init__(
+        self,
+        accounts: list,
+        base_url: str = BASE_URL,
+        max_workers: int = None,
+        send_mail: list = None,
+        browser_pool: BrowserPool = None,
+        warmup: bool = None,
+        digest: bool = None,
+        booking_date: date = None,
+    ):
+        self.accounts = accounts
+        self.base_url = base_url
+        self.max_workers = max_workers or int(
+            os.environ.get("ORCHESTRATOR_MAX_WORKERS", max(len(accounts), 1))
+        )
+        if len(accounts) > self.max_workers:
+            logging.warning(
+                f"! Only {self.max_workers} of {len(accounts)} accounts run concurrently, "
+                "the others start after T0"
+            )
+        self.send_mail = ["on_failure"] if send_mail is None else send_mail
+        self._owns_browser_pool = browser_pool is None
+        self.browser_pool = browser_pool or (
+            BrowserPool()
+            if os.environ.get("SHARED_BROWSER", "false").lower() == "true"
+            else None
+        )
+        self.warmup = (
+            os.environ.get("WARMUP", "false").lower() == "true"
+            if warmup is None
+            else warmup
+        )
+        self.digest = (
+            os.environ.get("MAIL_DIGEST", "false").lower() == "true"
+            if digest is None
+            else digest
+        )
+        self.booking_date = booking_date
+        self.results = {}
+        self._log_files = {}
+
+    def run(self, fire_scheduler: FireScheduler = None) -> dict:
+        """
+        Run all accounts concurrently and aggregate their results.
+
+        Args:
+            fire_scheduler (FireScheduler): Scheduler of T0, created from the
+                environment if None; its clock is synchronized here.
+
+        Returns:
+            dict: account name -> {"state": str, "booking_information": dict}
+        """
+        fire_scheduler = fire_scheduler or FireScheduler.from_env()
+        synchronize_clock(fire_scheduler, default_url=self.base_url)
+        fire_scheduler.arm()
+        logging.info(
+            f"Running {len(self.accounts)} account(s), firing at {fire_scheduler.target_datetime().isoformat()}"
+        )
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="booker"
+            ) as pool:
+                futures = {
+                    account.name: pool.submit(
+                        self._run_account, account, fire_scheduler
+                    )
+                    for account in self.accounts
+                }
+                self.results = {
+                    name: future.result() for name, future in futures.items()
+                }
+        finally:
+            if self.browser_pool is not None and self._owns_browser_pool:
+                self.browser_pool.close()
+
+        for name, result in self.results.items():
+            logging.info(f"{name}: {result['state']}")
+        if self.digest:
+            self.send_digests()
+        return self.results
+
+    def _digest_groups(self) -> dict:
+        """Accounts whose result should be mailed, grouped by receiver."""
+        groups = {}
+        for account in self.accounts:
+            result = self.results.get(account.name)
+            if result is None or DIGEST_TRIGGERS[result["state"]] not in self.send_mail:
+                continue
+            receiver = account.env("EMAIL_RECEIVER")
+            if not receiver:
+                logging.warning(f"! No EMAIL_RECEIVER set for {account.name}")
+                continue
+            groups.setdefault(receiver, []).append(account)
+        return groups
+
+    def send_digests(self) -> int:
+        """
+        Mail the results of the run, one message per receiver.
+
+        The message is sent with the credentials of the receiver's first account,
+        lists the results of all its accounts selected by `send_mail`, and
+        carries their log files.
+
+        Returns:
+            int: Number of digests sent or queued.
+        """
+        # The email stack is only loaded once a run reports
+        from .notifications.mailing import MailHandler
+        from .notifications.outbox import get_outbox
+
+        sent = 0
+        for receiver, accounts in self._digest_groups().items():
+            # Accounts can share a log file unless LOG_MODE=queue splits them
+            log_files = list(
+                dict.fromkeys(
+                    self._log_files[account.name]
+                    for account in accounts
+                    if os.path.exists(self._log_files.get(account.name, ""))
+                )
+            )
+            mail_handler = MailHandler(
+                email_sender=accounts[0].env("EMAIL_SENDER"),
+                email_password=accounts[0].env("EMAIL_PASSWORD"),
+                email_receiver=receiver,
+                format="html",
+                outbox=get_outbox(),
+            )
+            try:
+                mail_handler.send_detailed_booking_email(
+                    results={
+                        account.name: self.results[account.name] for account in accounts
+                    },
+                    attachment_paths=log_files,
+                )
+            except (ValueError, OSError) as e:
+                logging.error(f"! Sending the digest to {receiver} failed: {e!r}")
+                continue
+            sent += 1
+        return sent
+
+    @staticmethod
+    def _discard(booker: Booker) -> None:
+        """Release the browser and log sink of a booker whose pipeline failed."""
+        manager = booker.selenium_manager
+        try:
+            # send_result already closed the browser if it was reached
+            if manager is None or manager.driver is not None:
+                booker.close_driver()
+        except Exception as e:
+            logging.warning(f"! Could not close the browser: {e!r}")
+        booker.loggingHandler.close()
+
+    def _book(
+        self, booker: Booker, account: Account, fire_scheduler: FireScheduler
+    ) -> bool:
+        """Log in and book with the credentials and classes of an account."""
+        return book_account(
+            booker,
+            username=account.env("OCTIV_USERNAME"),
+            password=account.env("OCTIV_PASSWORD"),
+            class_dict=account.classes.get("class_dict"),
+            fire_scheduler=fire_scheduler,
+            booking_date=self.booking_date,
+            warmup=self.warmup,
+        )
+
+    def _run_account(self, account: Account, fire_scheduler: FireScheduler) -> dict:
+        """Run the full booking pipeline of one account."""
+        booker = None
+        # Attributes the records of this thread to the account's log sink
+        token = current_account.set(account.name)
+        try:
+            booker = create_booker(
+                base_url=self.base_url, browser_pool=self.browser_pool
+            )
+            try:
+                self._book(booker, account, fire_scheduler)
+            except OctivApiError as e:
+                booker = fall_back_to_selenium(booker, e)
+                self._book(booker, account, fire_scheduler)
+            booker.send_result(
+                sender=account.env("EMAIL_SENDER"),
+                password=account.env("EMAIL_PASSWORD"),
+                receiver=account.env("EMAIL_RECEIVER"),
+                format="html",
+                attach_logfile=True,
+                # Digests are sent for all accounts together after the run
+                send_mail=[] if self.digest else self.send_mail,
+            )
+            self._log_files[account.name] = booker.loggingHandler.get_log_file_path()
+        except (Exception, SystemExit) as e:
+            # Booker.login exits on unexpected errors; keep the other accounts alive.
+            logging.error(f"! Booking failed for {account.name}: {e!r}")
+            if booker is not None:
+                self._discard(booker)
+            return {"state": "ERROR", "booking_information": {}}
+        finally:
+            current_account.reset(token)
+
+        return {
+            "state": booker.booking_successful.name,
+            "booking_information": booker.booking_information,
+        }
@@ -1,17 +1,46 @@
 import logging
+import time
+import uuid
+from urllib.parse import urljoin, urlsplit
 from collections import defaultdict
-from datetime import datetime
+from datetime import date, datetime
 
-# from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
 from .utils.alerts import AlertErrorHandler
 from .utils.logging import CustomLogger, LogHandler
-from .notifications.mailing import MailHandler  # Assuming MailHandler is in this module
 from .utils.selenium_manager import SeleniumManager
-from .utils.helpers import get_day
+from .utils.browser_pool import BrowserPool
+from .utils.dom_snapshot import DomSnapshotRecorder
+from .utils.helpers import get_day, get_days_before_bookable
+from .utils.fire_scheduler import FireScheduler
+from .utils.clock_sync import synchronize_clock
+from .utils.scripts import (
+    EXPORT_STORAGE,
+    KEEP_ALIVE,
+    RESTORE_STORAGE,
+    SCRAPE_BOOKING_SLOTS,
+)
+from .utils.session_cache import SessionCache
+from .utils.tracing import Tracer, get_trace_format, traced
+from .utils.fire_plan import FirePlan, FireTarget
 from slotbooker.utils.xpaths import XPath
 import os
 from enum import Enum, auto
 
+# Warm-up: seconds between keep-alive checks and lead of the final schedule refresh
+DEFAULT_KEEP_ALIVE_INTERVAL = 30
+DEFAULT_REFRESH_LEAD = 5
+# Seconds before T0 at which the booking buttons are validated a last time
+VALIDATE_LEAD = 0.25
+# Milliseconds the opt-in keep-alive request (KEEP_ALIVE_URL) may take
+KEEP_ALIVE_TIMEOUT_MS = 5000
+# Seconds to wait for a restored session to show either the schedule or the login form
+SESSION_PROBE_TIMEOUT = 10
+
 # Set up custom logger
 logging.setLoggerClass(CustomLogger)
 logger = logging.getLogger(__name__)
@@ -50,9 +79,15 @@ class Booker:
         base_url: str,
         chromedriver: str = None,  # defaults to None, will use the default chromedriver path: "/usr/local/bin/chromedriver"
         env: str = "prd",
+        browser_pool: BrowserPool = None,  # shared browser to lease a context from
     ):
         self.base_url = base_url
-        self.selenium_manager = SeleniumManager(chromedriver, env)
+        self.browser_pool = browser_pool
+        self.tracer = Tracer()
+        with self.tracer.span("driver_start"):
+            self.selenium_manager = self._create_selenium_manager(chromedriver, env)
+        self.session_cache = SessionCache.from_env()
+        self.dom_recorder = DomSnapshotRecorder.from_env()
 
         self.loggingHandler = LogHandler(log_level=logging.INFO)
         self.mail_handler = None
@@ -63,6 +98,10 @@ class Booker:
         self.booking_successful = BookingState.FAIL
         self.booking_information = {"bookings": []}
 
+    def _create_selenium_manager(self, chromedriver: str, env: str) -> SeleniumManager:
+        """Start the browser backend, overridden by backends that need none."""
+        return SeleniumManager(chromedriver, env, browser_pool=self.browser_pool)
+
     def __continue_booking(self) -> bool:
         """Continues the booking process."""
         return True
@@ -77,28 +116,36 @@ class Booker:
         self.selenium_manager.close_driver()
         logging.info("WebDriver closed")
 
+    @traced("login")
     def login(self, username: str, password: str) -> bool:
         self.selenium_manager.driver_is_initialialized()
 
         """Login to the booking website using the provided credentials."""
+        if self._restore_session(username, password):
+            logging.success("Login successful, restored cached session")
+            return self.__continue_booking()
+
         try:
             logging.info(f"Log in as: {username}")
 
-            self.selenium_manager.get_page(base_url=self.base_url)
+            with self.tracer.span("page_load"):
+                self.selenium_manager.get_page(base_url=self.base_url)
 
-            self.selenium_manager.input_text(
-                XPath.login_username_input(),
-                username,
-            )
-            self.selenium_manager.click_button(XPath.login_username_button())
+            with self.tracer.span("username"):
+                self.selenium_manager.input_text(
+                    XPath.login_username_input(),
+                    username,
+                )
+                self.selenium_manager.click_button(XPath.login_username_button())
             logging.info("Username submitted successfully")
 
-            self.selenium_manager.input_text(
-                XPath.login_password_input(),
-                password,
-            )
-            self.selenium_manager.click_button(XPath.login_password_check())
-            self.selenium_manager.click_button(XPath.login_password_button())
+            with self.tracer.span("password"):
+                self.selenium_manager.input_text(
+                    XPath.login_password_input(),
+                    password,
+                )
+                self.selenium_manager.click_button(XPath.login_password_check())
+                self.selenium_manager.click_button(XPath.login_password_button())
         except ValueError as e:
             logging.warning("! ValueError during login entry")
             logging.error(e, exc_info=True)
@@ -107,33 +154,102 @@ class Booker:
             logging.error(f"! Unexpected Error during Login: {e}")
             exit(1)
 
-        stop_booking = AlertErrorHandler.check_login_alert(
-            selenium_manager=self.selenium_manager
-        )
+        with self.tracer.span("login_alert"):
+            stop_booking = AlertErrorHandler.check_login_alert(
+                selenium_manager=self.selenium_manager
+            )
 
         if stop_booking:
             return self.__stop_booking()
         else:
             logging.success("Login successful")
+            self._store_session(username, password)
             return self.__continue_booking()
 
-    def switch_day(self) -> (str, str):
+    @traced("session_restore")
+    def _restore_session(self, username: str, password: str) -> bool:
+        """
+        Restore a cached session and probe whether it is still authenticated.
+
+        Args:
+            username (str): Account username.
+            password (str): Account password.
+
+        Returns:
+            bool: True if the schedule is shown without logging in.
+        """
+        if self.session_cache is None:
+            return False
+        state = self.session_cache.load(username, password)
+        if state is None:
+            return False
+
+        try:
+            # Cookies and storage can only be set for the currently loaded origin.
+            self.selenium_manager.get_page(base_url=self.base_url)
+            self.selenium_manager.delete_all_cookies()
+            for cookie in state["cookies"]:
+                try:
+                    self.selenium_manager.add_cookie(cookie)
+                except WebDriverException:
+                    logging.info(
+                        f"Skipping cookie of foreign domain {cookie.get('domain')}"
+                    )
+            self.selenium_manager.execute_script(
+                RESTORE_STORAGE, state["local_storage"], state["session_storage"]
+            )
+            self.selenium_manager.get_page(base_url=self.base_url)
+            # One probe: whichever shows up first, the schedule or the login form.
+            self.selenium_manager.wait_for_element(
+                xpath=f"{XPath.booking_section_head()} | {XPath.login_username_input()}",
+                timeout=SESSION_PROBE_TIMEOUT,
+            )
+            restored = bool(
+                self.selenium_manager.find_elements(xpath=XPath.booking_section_head())
+            )
+        except (WebDriverException, KeyError) as e:
+            logging.warning(f"! Could not restore cached session: {e}")
+            restored = False
+
+        if not restored:
+            logging.info("Cached session no longer valid, logging in")
+            self.session_cache.clear(username)
+            try:
+                self.selenium_manager.delete_all_cookies()
+            except WebDriverException:
+                pass
+        return restored
+
+    def _store_session(self, username: str, password: str) -> None:
+        """Store cookies and storage of the logged-in session in the session cache."""
+        if self.session_cache is None:
+            return
+        try:
+            state = {"cookies": self.selenium_manager.get_cookies()}
+            state.update(self.selenium_manager.execute_script(EXPORT_STORAGE))
+            self.session_cache.save(username, password, state)
+            logging.info("Session cached")
+        except (WebDriverException, OSError, TypeError) as e:
+            logging.warning(f"! Could not cache session: {e}")
+
+    @traced("switch_day")
+    def switch_day(self, booking_date: date = None) -> (str, str):
         self.selenium_manager.driver_is_initialialized()
 
-        """Switch to the desired day for booking slots."""
-        days_before_bookable = os.environ.get("DAYS_BEFORE_BOOKABLE", None)
-        days_before_bookable = (
-            int(days_before_bookable)
-            if days_before_bookable and days_before_bookable.strip()
-            else 0
-        )
+        """Switch to the desired day for booking slots.
+
+        Args:
+            booking_date (date): Day to book, defaults to DAYS_BEFORE_BOOKABLE days
+                from today.
+        """
+        days_before_bookable = get_days_before_bookable()
 
         if days_before_bookable is None:
             logging.info(
                 f"Switching to day {days_before_bookable} days before bookable date"
             )
 
-        future_date, diff_week = get_day(days_before_bookable)
+        future_date, diff_week = get_day(days_before_bookable, booking_date)
         self.day = future_date.strftime("%A")
 
         try:
@@ -154,19 +270,126 @@ class Booker:
         )
         return self.day, future_date.strftime("%d/%m/%Y")
 
+    @traced("hold")
+    def hold_until_fire(
+        self,
+        fire_scheduler: FireScheduler = None,
+        keep_alive_interval: float = None,
+        refresh_lead: float = None,
+    ) -> FireScheduler:
+        """
+        Keep the logged-in session warm until shortly before T0.
+
+        Runs after `login` and `switch_day`: the session is probed every
+        `keep_alive_interval` seconds with a cheap check, and `refresh_lead`
+        seconds before T0 the schedule view is soft-refreshed so `book_class`
+        works on a fresh DOM.
+
+        Args:
+            fire_scheduler (FireScheduler): Scheduler of the booking, created and
+                clock-synced from the environment if not given.
+            keep_alive_interval (float): Seconds between keep-alive checks,
+                defaults to the KEEP_ALIVE_INTERVAL environment variable or
+                DEFAULT_KEEP_ALIVE_INTERVAL.
+            refresh_lead (float): Seconds before T0 to refresh the schedule,
+                defaults to the REFRESH_LEAD environment variable or
+                DEFAULT_REFRESH_LEAD.
+
+        Returns:
+            FireScheduler: The scheduler to pass on to `book_class`.
+        """
+        if fire_scheduler is None:
+            fire_scheduler = FireScheduler.from_env()
+            self._synchronize_clock(fire_scheduler)
+        keep_alive_interval = keep_alive_interval or float(
+            os.environ.get("KEEP_ALIVE_INTERVAL", DEFAULT_KEEP_ALIVE_INTERVAL)
+        )
+        refresh_lead = refresh_lead or float(
+            os.environ.get("REFRESH_LEAD", DEFAULT_REFRESH_LEAD)
+        )
+
+        remaining = fire_scheduler.seconds_until_fire() - refresh_lead
+        if remaining <= 0:
+            return fire_scheduler
+
+        logging.info(f"Holding session for {remaining:.1f}s before refreshing")
+        while remaining > 0:
+            time.sleep(min(keep_alive_interval, remaining))
+            remaining = fire_scheduler.seconds_until_fire() - refresh_lead
+            if remaining > 0 and not self._keep_alive():
+                logging.warning("! Keep-alive check failed, refreshing schedule")
+                self._soft_refresh()
+
+        self._soft_refresh()
+        return fire_scheduler
+
+    def _keep_alive(self) -> bool:
+        """
+        Check that the schedule view is still loaded.
+
+        With KEEP_ALIVE_URL set, the page also requests that path of its own
+        origin with its cookies, so the server side of the session is used while
+        holding. The request carries no tokens and never leaves the app's origin.
+        """
+        try:
+            if not self.selenium_manager.find_elements(
+                xpath=XPath.booking_section_head()
+            ):
+                return False
+            url = self._keep_alive_url()
+            if url is None:
+                return True
+            status = self.selenium_manager.execute_async_script(
+                KEEP_ALIVE, url, KEEP_ALIVE_TIMEOUT_MS
+            )
+        except WebDriverException:
+            return False
+        if not 200 <= status < 400:
+            logging.warning(f"! Session check answered with status {status}")
+            return False
+        return True
+
+    def _keep_alive_url(self) -> str:
+        """KEEP_ALIVE_URL resolved against the current page, None if unset or foreign."""
+        path = os.environ.get("KEEP_ALIVE_URL")
+        if not path:
+            return None
+        page_url = self.selenium_manager.driver.current_url
+        url = urljoin(page_url, path)
+        if urlsplit(url)[:2] != urlsplit(page_url)[:2]:
+            logging.warning("! KEEP_ALIVE_URL is not on the app's origin, ignoring it")
+            return None
+        return url
+
+    def _soft_refresh(self) -> None:
+        """Re-select the booking day so the SPA re-renders the schedule."""
+        try:
+            self.selenium_manager.click_button(XPath.weekday_button(self.day))
+            logging.info("Schedule refreshed")
+        except WebDriverException as e:
+            logging.warning(f"! Could not refresh schedule: {e}")
+
+    @traced("book_class")
     def book_class(
-        self, class_dict: dict, enter_class: bool = True
+        self,
+        class_dict: dict,
+        enter_class: bool = True,
+        fire_scheduler: FireScheduler = None,
     ) -> (bool, str, str):
-        """Book classes based on provided booking information."""
+        """Book classes based on provided booking information.
+
+        A shared, already synchronized `fire_scheduler` can be passed in to fire
+        several bookers at the same T0; otherwise one is created from the environment.
+        """
 
         self.selenium_manager.driver_is_initialialized()
 
         logging.info(f"{'Booking' if enter_class else 'Cancelling'} classes...")
-        execution_booking_time = os.environ.get(
-            "EXECUTION_BOOKING_TIME", "00:00:00.000000"
-        )
+        if fire_scheduler is None:
+            fire_scheduler = FireScheduler.from_env()
+            self._synchronize_clock(fire_scheduler)
         logging.info(
-            f"Execution booking time set to {execution_booking_time} (HH:MM:SS.mmmmmm)"
+            f"Execution booking time set to {fire_scheduler.target_datetime().isoformat()}"
         )
 
         self.class_dict = class_dict.get(self.day)
@@ -176,27 +399,29 @@ class Booker:
 
         # Get all bounding boxes containing booking slots present in the current window.
         self.selenium_manager.wait_for_element(xpath=XPath.booking_section_head())
-        all_slots_bounding_boxes = self.selenium_manager.find_elements(
-            xpath=XPath.booking_section_head()
+        all_possible_booking_slots_dict = self._scrape_booking_slots(
+            class_entry_list, enter_class=enter_class
         )
 
-        all_possible_booking_slots_dict = self._generate_bounding_box_class_dict(
-            class_entry_list, all_slots_bounding_boxes, enter_class=enter_class
-        )
+        # Compile the fire plan and resolve all booking buttons before T0.
+        with self.tracer.span("resolve"):
+            fire_plan = FirePlan.compile(
+                self.selenium_manager, self.class_dict, all_possible_booking_slots_dict
+            )
+            fire_plan.resolve()
 
-        for entry in self.class_dict:
-            if entry.get("class") == "None":
+        for target in fire_plan:
+            if target.class_name == "None":
                 logging.info("! No class set for this day.")
                 self.booking_successful = BookingState.NEUTRAL
                 return self.__stop_booking()
 
-            self.booking_time_slot, self.booking_class_slot, prioritize_waiting_list = (
-                entry.get("time"),
-                entry.get("class"),
-                entry.get("wl"),
+            self.booking_time_slot, self.booking_class_slot = (
+                target.time,
+                target.class_name,
             )
             self.booking_information["bookings"].append(
-                {"time": entry.get("time"), "class": entry.get("class")}
+                {"time": target.time, "class": target.class_name}
             )
 
             if not all_possible_booking_slots_dict:
@@ -204,28 +429,84 @@ class Booker:
                 self.booking_successful = BookingState.FAIL
                 return self.__stop_booking()
 
-            try:
-                button_xpath = all_possible_booking_slots_dict[self.booking_class_slot][
-                    self.booking_time_slot
-                ]["xpath"]
-                logging.info(
-                    f"? Checking {self.booking_class_slot} at {self.booking_time_slot}..."
-                )
-            except KeyError:
+            if target.xpath is None:
                 logging.info(
                     f"! No class of type {self.booking_class_slot} is present on {self.day} at {self.booking_time_slot}"
                 )
                 self.booking_successful = BookingState.FAIL
                 return self.__stop_booking()
+            logging.info(
+                f"? Checking {self.booking_class_slot} at {self.booking_time_slot}..."
+            )
 
-            if self._book_class_slot(
-                button_xpath, prioritize_waiting_list, execution_booking_time
-            ):
+            if self._book_class_slot(fire_plan, target, fire_scheduler):
                 self.booking_successful = BookingState.SUCCESS
                 return self.__stop_booking()
 
         return self.__continue_booking()
 
+    @traced("clock_sync")
+    def _synchronize_clock(self, fire_scheduler: FireScheduler) -> None:
+        """Feed the estimated server clock offset into the fire scheduler."""
+        synchronize_clock(fire_scheduler, default_url=self.base_url)
+
+    @traced("scrape")
+    def _scrape_booking_slots(
+        self, class_entry_list: list, enter_class: bool = True
+    ) -> dict:
+        """Get all possible booking slots, preferring the single round trip script."""
+        if os.environ.get("SCRAPE_MODE", "script").lower() != "legacy":
+            try:
+                return self._generate_booking_slots_dict_script(enter_class=enter_class)
+            except WebDriverException as e:
+                logging.warning(
+                    f"! Scraping script failed, falling back to XPaths: {e}"
+                )
+
+        all_slots_bounding_boxes = self.selenium_manager.find_elements(
+            xpath=XPath.booking_section_head()
+        )
+        return self._generate_bounding_box_class_dict(
+            class_entry_list, all_slots_bounding_boxes, enter_class=enter_class
+        )
+
+    def _generate_booking_slots_dict_script(self, enter_class: bool = True) -> dict:
+        """Get the booking slots of all classes in `class_dict` with one script call."""
+        wanted_slots = [
+            [entry.get("class"), entry.get("time")] for entry in self.class_dict
+        ]
+        logging.info(
+            f"? Possible classes: {sorted({name for name, _ in wanted_slots})}"
+        )
+
+        slots = self.selenium_manager.execute_script(
+            SCRAPE_BOOKING_SLOTS,
+            XPath.booking_section_head(),
+            XPath.bounding_box_label(slot_index="{i}", enter_class=enter_class),
+            XPath.bounding_box_time(slot_index="{i}", enter_class=enter_class),
+            XPath.enter_slot(slot="{i}"),
+            XPath.cancel_slot(slot="{i}"),
+            wanted_slots,
+        )
+
+        all_possible_booking_slots_dict = defaultdict(dict)
+        for slot in slots or []:
+            logging.info(f"- Time: {slot['time']} - Class: {slot['class']}")
+            button_book = (
+                XPath.enter_slot(slot=slot["index"])
+                if enter_class
+                else XPath.cancel_slot(slot=slot["index"])
+            )
+            all_possible_booking_slots_dict[slot["class"]][slot["time"]] = {
+                "xpath": button_book,
+                # A slot that is not booked yet signals success by its cancel button.
+                "booked_xpath": XPath.cancel_slot(slot=slot["index"])
+                if enter_class and not slot.get("cancel")
+                else None,
+            }
+
+        return all_possible_booking_slots_dict
+
     def _generate_bounding_box_class_dict(
         self,
         class_entry_list: list,
@@ -263,39 +544,71 @@ class Booker:
                     all_possible_booking_slots_dict[class_name][time_slot] = {
                         "xpath": button_book
                     }
-            except Exception:
+            except NoSuchElementException:
+                # Header rows of the booking section carry no class label.
+                continue
+            except WebDriverException as e:
+                logging.warning(f"! Could not read booking slot {slot_index}: {e}")
                 continue
 
         return all_possible_booking_slots_dict
 
     def _book_class_slot(
         self,
-        button_xpath: str,
-        prioritize_waiting_list: bool,
-        execution_booking_time: str = "00:00:00.000000",
+        fire_plan: FirePlan,
+        target: FireTarget,
+        fire_scheduler: FireScheduler = None,
     ) -> bool:
         """Book a specific class slot."""
         logging.info(f"> Booking {self.booking_class_slot} at {self.booking_time_slot}")
 
-        # self._click_book_button(button_xpath)
-        element = self.selenium_manager.find_element(xpath=button_xpath)
-        while True:
-            current_time = datetime.now().time().strftime("%H:%M:%S.%f")
+        fire_scheduler = fire_scheduler or FireScheduler()
+        with self.tracer.span(
+            "book_slot", class_name=target.class_name, time=target.time
+        ) as span:
+            # Validate right before T0, so a re-render while waiting cannot
+            # detach the button that is clicked
+            with self.tracer.span("lead_wait"):
+                fire_scheduler.wait_until_lead(VALIDATE_LEAD)
+            with self.tracer.span("validate"):
+                fire_plan.validate()
+                if target.element is None:
+                    target.element = self.selenium_manager.find_element(
+                        xpath=target.xpath
+                    )
+            with self.tracer.span("fire_wait"):
+                jitter = fire_scheduler.wait()
+            span.attributes["jitter_ms"] = round(jitter * 1000, 3)
+
+            start_time = datetime.now()
+            logging.info(f"Start execution at {start_time.time()}")
+            with self.tracer.span("click"):
+                try:
+                    self.selenium_manager.execute_script(
+                        script="arguments[0].click();", element=target.element
+                    )
+                except StaleElementReferenceException:
+                    # The schedule re-rendered between validation and the click.
+                    fire_plan.resolve([target])
+                    self.selenium_manager.execute_script(
+                        script="arguments[0].click();",
+                        element=target.element
+                        or self.selenium_manager.find_element(xpath=target.xpath),
+                    )
+            end_time = datetime.now()
+            logging.info(f"Executed at {end_time.time()}")
+            logging.info(
+                f"Fired {jitter * 1000:.3f}ms after execution booking time",
+                extra={"fire_latency_ms": round(jitter * 1000, 3)},
+            )
+            logging.info(f"Took {(end_time - start_time).total_seconds()}s")
 
-            if current_time >= execution_booking_time:
-                start_time = datetime.now()
-                logging.info(f"Start execution at {current_time}")
-                self.selenium_manager.execute_script(
-                    script="arguments[0].click();", element=element
+            with self.tracer.span("outcome"):
+                stop_booking = AlertErrorHandler.check_booking_alert(
+                    selenium_manager=self.selenium_manager,
+                    waiting_list=target.waiting_list,
+                    booked_xpath=target.booked_xpath,
                 )
-                end_time = datetime.now()
-                logging.info(f"Executed at {end_time.time()}")
-                logging.info(f"Took {(end_time - start_time).total_seconds()}s")
-                break
-
-        stop_booking = AlertErrorHandler.check_booking_alert(
-            selenium_manager=self.selenium_manager, waiting_list=prioritize_waiting_list
-        )
 
         if stop_booking:
             logging.error("Booking process stopped due to an error.")
@@ -304,6 +617,47 @@ class Booker:
             logging.success("Class booked")
             return self.__continue_booking()
 
+    def record_dom_snapshot(self) -> str:
+        """
+        Add the schedule page of the session to the DOM snapshot corpus.
+
+        Called once the booking is done, so serializing the page never delays the
+        click at T0.
+
+        Returns:
+            str: Path of the snapshot, None if none was recorded.
+        """
+        if (
+            self.dom_recorder is None
+            or self.day is None
+            or self.selenium_manager is None
+            or self.selenium_manager.driver is None
+        ):
+            return None
+        return self.dom_recorder.record(self.selenium_manager, label=self.day.lower())
+
+    def write_trace(self) -> str:
+        """
+        Write the trace of this run next to the log file, as set by TRACE_FORMAT.
+
+        Returns:
+            str: Path of the trace file, None if tracing is disabled or failed.
+        """
+        trace_format = get_trace_format()
+        if trace_format == "none":
+            return None
+        self.tracer.attributes["state"] = self.booking_successful.name
+        log_root, _ = os.path.splitext(self.loggingHandler.get_log_file_path())
+        # Accounts of one time slot share the log timestamp.
+        path = f"{log_root}_{uuid.uuid4().hex[:6]}.trace.json"
+        try:
+            self.tracer.write(path, format=trace_format)
+        except OSError as e:
+            logging.warning(f"! Could not write trace: {e}")
+            return None
+        logging.info(f"Trace written to {path}")
+        return path
+
     def send_result(
         self,
         sender: str,
@@ -316,6 +670,9 @@ class Booker:
         """
         Configure and send booking result notification via email.
 
+        The email is queued in the mail outbox and delivered in the background,
+        so a slow SMTP server does not hold up the run (see `MailOutbox`).
+
         Args:
             sender (str): Sender's email address.
             password (str): Sender's email password.
@@ -324,6 +681,10 @@ class Booker:
             attach_logfile (bool): Whether to attach a log file.
             send_mail (list): Which types of emails to send ("on_success", "on_failure", "on_neutral").
         """
+        # The email stack (smtplib, ssl, email) is only loaded once a run reports
+        from .notifications.mailing import MailHandler
+        from .notifications.outbox import get_outbox
+
         if send_mail is None:
             send_mail = ["on_success", "on_failure", "on_neutral"]
 
@@ -332,6 +693,7 @@ class Booker:
             email_password=password,
             email_receiver=receiver,
             format=format,
+            outbox=get_outbox(),
         )
 
         attachment_path = (
@@ -375,9 +737,16 @@ class Booker:
             ),
         ]
 
+        self.record_dom_snapshot()
         self.close_driver()
-        # Dispatch table with conditions in priority order
-        for condition, handler in handlers:
-            if condition:
-                handler()
-                break
+        self.write_trace()
+        # Buffered records must be on disk before the log is attached
+        self.loggingHandler.flush()
+        try:
+            # Dispatch table with conditions in priority order
+            for condition, handler in handlers:
+                if condition:
+                    handler()
+                    break
+        finally:
+            self.loggingHandler.close()
@@ -2,10 +2,14 @@ from enum import Enum
 import logging
 from typing import Any
 from .helpers import stop_booking_process, text_contains_list_keywords
+from selenium.webdriver.support import expected_conditions as ec
 from slotbooker.utils.xpaths import XPath
-import time
+from slotbooker.utils.scripts import BOOKING_OUTCOME
 from slotbooker.utils.selenium_manager import SeleniumManager
 
+# Seconds to wait for any outcome of a booking click before assuming success
+OUTCOME_TIMEOUT = 6
+
 
 class AlertTypes(Enum):
     """Enumeration of possible alert types that can be encountered."""
@@ -84,38 +88,61 @@ class AlertErrorHandler:
         except Exception as e:
             logging.error(f"! Error during login attempt: {e}")
 
+    @staticmethod
+    def evaluate_error(error_text: str) -> ErrorTypes:
+        """Determines the type of error based on the text of the error dialog."""
+        for error in ErrorTypes:
+            if error.value == error_text:
+                logging.error(f"identified: {error.value}")
+                return error
+        logging.error(f"{ErrorTypes.NotIdentifyError.value}: {error_text}")
+        return ErrorTypes.NotIdentifyError
+
     @staticmethod
     def check_booking_alert(
-        selenium_manager: SeleniumManager, waiting_list: list
-    ) -> bool:
-        alert = selenium_manager.wait_for_element_alert()
-        if alert:
-            logging.warning("Alert present")
-            alert_obj = selenium_manager.switch_to_alert()
-            if alert_obj:
-                evaluate_result = AlertErrorHandler.evaluate_alert(
-                    alert_obj, waiting_list
-                )
-                if evaluate_result is False:
-                    pass
-                return evaluate_result
-
-        error_window = selenium_manager.wait_for_element(
-            xpath=XPath.error_window(), timeout=3
+        selenium_manager: SeleniumManager,
+        waiting_list: list,
+        booked_xpath: str = None,
+        timeout: float = OUTCOME_TIMEOUT,
+    ) -> Any:
+        """
+        Race the possible outcomes of a booking click and classify the first one.
+
+        A JavaScript alert, the error dialog, and the slot switching to its booked
+        state are checked together in every round, so the result is known as
+        soon as any of them shows up.
+
+        Args:
+            selenium_manager (SeleniumManager): Manager of the booking session.
+            waiting_list (list): Whether to join the waiting list of a full class.
+            booked_xpath (str): XPath present once the slot is booked, if known.
+            timeout (float): Seconds to wait before assuming the booking went through.
+
+        Returns:
+            Any: Result of `evaluate_alert` for an alert, an `ErrorTypes` member for
+                the error dialog, or None if the booking went through.
+        """
+
+        def page_outcome(driver):
+            outcome = selenium_manager.execute_script(
+                BOOKING_OUTCOME,
+                XPath.error_window(),
+                XPath.error_text_window(),
+                booked_xpath,
+            )
+            # The error dialog may render before its text, wait for the text.
+            return outcome if outcome["error"] or outcome["booked"] else None
+
+        signal, result = selenium_manager.wait_for_first(
+            # Alerts block scripts, so they are checked first in every round.
+            {"alert": ec.alert_is_present(), "page": page_outcome},
+            timeout=timeout,
         )
-        if error_window:
-            # logging.error("! Error !")
-            error_text = selenium_manager.find_element(
-                xpath=XPath.error_text_window()
-            ).text
-
-            if error_text:
-                # TODO: Remove sleep
-                time.sleep(3)
-
-                for error in ErrorTypes:
-                    if error.value == error_text:
-                        logging.error(f"identified: {error.value}")
-                        return error
-                logging.error(f"{ErrorTypes.NotIdentifyError.value}: {error_text}")
-                return ErrorTypes.NotIdentifyError
+        if signal == "alert":
+            logging.warning("Alert present")
+            return AlertErrorHandler.evaluate_alert(result, waiting_list)
+        if signal == "page" and result["error"]:
+            return AlertErrorHandler.evaluate_error(result["error"])
+        if signal == "page":
+            logging.info("Slot shows booked state")
+        return None
@@ -0,0 +1,139 @@
+import logging
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import (
+    NoSuchDriverException,
+    SessionNotCreatedException,
+    WebDriverException,
+)
+
+from .browser_profile import apply_profile_options, apply_profile_session, get_profile
+
+
+class BrowserPool:
+    """
+    Shares one Chrome process between several accounts.
+
+    Chrome is launched once by a host session. Every lease attaches a separate
+    ChromeDriver session to that browser through its debugger address and opens
+    a fresh browser context via CDP `Target.createBrowserContext`, so cookies and
+    storage are isolated per account while the expensive browser start is paid
+    only once. Each lease gets its own session, so accounts can drive their
+    windows concurrently.
+    """
+
+    def __init__(self, chromedriver: str = None, env: str = "prd", profile: str = None):
+        self.chromedriver = chromedriver
+        self.env = env
+        self.profile = get_profile(profile)
+        self.host_driver = None
+        self.debugger_address = None
+        self.leases = {}
+        self._lock = threading.Lock()
+
+    def _options(self) -> webdriver.ChromeOptions:
+        options = webdriver.ChromeOptions()
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        if self.env != "dev":
+            options.add_argument("--headless")
+        apply_profile_options(options, self.profile)
+        return options
+
+    def _create_driver(self, options: webdriver.ChromeOptions) -> webdriver.Chrome:
+        try:
+            return webdriver.Chrome(
+                service=Service(executable_path=self.chromedriver), options=options
+            )
+        except (SessionNotCreatedException, NoSuchDriverException) as e:
+            logging.warning(
+                "Failed to create a WebDriver session. Please check the ChromeDriver path and ensure it is compatible with your Chrome version."
+            )
+            logging.error(e, exc_info=True)
+            raise ValueError(
+                "Failed to create a WebDriver session. Please check the ChromeDriver path and ensure it is compatible with your Chrome version."
+            )
+
+    def start(self) -> None:
+        """Launch the shared browser, if not running yet.
+
+        Raises:
+            ValueError: If Chrome or ChromeDriver cannot be started.
+        """
+        with self._lock:
+            if self.host_driver is not None:
+                return
+            self.host_driver = self._create_driver(self._options())
+            self.debugger_address = self.host_driver.capabilities["goog:chromeOptions"][
+                "debuggerAddress"
+            ]
+            logging.info(f"Shared browser started at {self.debugger_address}")
+
+    def lease(self) -> webdriver.Chrome:
+        """
+        Lease a driver bound to a new, isolated browser context.
+
+        Returns:
+            webdriver.Chrome: Driver whose current window lives in its own context.
+
+        Raises:
+            ValueError: If Chrome or ChromeDriver cannot be started.
+        """
+        self.start()
+        options = webdriver.ChromeOptions()
+        # Launch arguments are ignored when attaching, the load strategy is per session.
+        apply_profile_options(options, self.profile)
+        options.debugger_address = self.debugger_address
+        driver = self._create_driver(options)
+
+        context_id = target_id = None
+        try:
+            context_id = driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": False}
+            )["browserContextId"]
+            target_id = driver.execute_cdp_cmd(
+                "Target.createTarget",
+                {"url": "about:blank", "browserContextId": context_id},
+            )["targetId"]
+            # ChromeDriver uses CDP target ids as window handles.
+            driver.switch_to.window(target_id)
+        except WebDriverException:
+            # Do not leave the session and a half-created context attached.
+            self._dispose(driver, context_id, target_id)
+            raise
+        apply_profile_session(driver, self.profile)
+
+        with self._lock:
+            self.leases[driver.session_id] = (context_id, target_id)
+        return driver
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        """Dispose the leased context and detach its session from the browser."""
+        with self._lock:
+            context_id, target_id = self.leases.pop(driver.session_id, (None, None))
+        self._dispose(driver, context_id, target_id)
+
+    @staticmethod
+    def _dispose(driver: webdriver.Chrome, context_id: str, target_id: str) -> None:
+        try:
+            if target_id:
+                driver.execute_cdp_cmd("Target.closeTarget", {"targetId": target_id})
+            if context_id:
+                driver.execute_cdp_cmd(
+                    "Target.disposeBrowserContext", {"browserContextId": context_id}
+                )
+        except WebDriverException as e:
+            logging.warning(f"! Could not dispose browser context: {e}")
+        finally:
+            # Sessions attached via debugger address leave the browser running.
+            driver.quit()
+
+    def close(self) -> None:
+        """Release all leases and shut down the shared browser."""
+        with self._lock:
+            host_driver, self.host_driver = self.host_driver, None
+            self.leases.clear()
+        if host_driver is not None:
+            host_driver.quit()
@@ -0,0 +1,89 @@
+import logging
+import os
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+DEFAULT_PROFILE = "default"
+LEAN_PROFILE = "lean"
+
+# Requests the booking flow never needs: images, fonts, and analytics/tracking.
+BLOCKED_URL_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*hotjar.io*",
+    "*segment.io*",
+    "*intercom.io*",
+]
+
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+def get_profile(profile: str = None) -> str:
+    """Resolve the browser profile, defaulting to BROWSER_PROFILE ("default" or "lean")."""
+    profile = (profile or os.environ.get("BROWSER_PROFILE", DEFAULT_PROFILE)).lower()
+    if profile not in (DEFAULT_PROFILE, LEAN_PROFILE):
+        raise ValueError(f"Unknown browser profile: {profile}")
+    return profile
+
+
+def apply_profile_options(options: webdriver.ChromeOptions, profile: str) -> None:
+    """
+    Add the launch options of a profile.
+
+    The lean profile loads pages with the `eager` strategy: `get` returns once the
+    DOM is parsed, without waiting for stylesheets and images. Every interaction
+    afterwards waits for its element, so nothing relies on the full load event.
+
+    Args:
+        options (webdriver.ChromeOptions): Options of the browser to launch.
+        profile (str): "default" or "lean".
+    """
+    if profile != LEAN_PROFILE:
+        return
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.page_load_strategy = "eager"
+
+
+def apply_profile_session(driver: webdriver.Chrome, profile: str) -> None:
+    """
+    Configure a started session for a profile.
+
+    The lean profile blocks images, fonts, and trackers through CDP network
+    blocking, which applies to the session's current browser context.
+
+    Args:
+        driver (webdriver.Chrome): Started driver.
+        profile (str): "default" or "lean".
+    """
+    if profile != LEAN_PROFILE:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except WebDriverException as e:
+        logging.warning(f"! Could not block resources: {e}")
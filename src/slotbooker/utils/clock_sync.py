@@ -0,0 +1,155 @@
+import http.client
+import logging
+import math
+import os
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+DEFAULT_CLOCK_SYNC_SAMPLES = 6
+DEFAULT_CLOCK_SYNC_TIMEOUT = 5
+# Only sync the clock if there is enough time left before the booking fires
+CLOCK_SYNC_MIN_LEAD = 10
+
+
+class ClockOffset:
+    """
+    Estimated offset between the server clock and the local clock.
+
+    Attributes:
+        offset (float): Server clock minus local clock, in seconds.
+        uncertainty (float): Half-width of the interval the true offset lies in.
+        samples (int): Number of responses the estimate is based on.
+    """
+
+    def __init__(self, offset: float, uncertainty: float, samples: int):
+        self.offset = offset
+        self.uncertainty = uncertainty
+        self.samples = samples
+
+    @property
+    def safe_offset(self) -> float:
+        """Lower bound of the offset, so that firing with it is never early."""
+        return self.offset - self.uncertainty
+
+    def __repr__(self) -> str:
+        return f"ClockOffset({self.offset:+.3f}s ± {self.uncertainty:.3f}s, samples={self.samples})"
+
+
+class ClockSync:
+    """
+    Estimates the server clock offset from HTTP `Date` headers.
+
+    Every response bounds the offset: the server stamped its `Date` (whole
+    seconds) somewhere between sending the request and receiving the response,
+    so `date - recv <= offset < date + 1 - send`. Intersecting those intervals
+    over several samples narrows the estimate. After the first sample each
+    request is timed to reach the server right at a predicted second boundary,
+    which halves the interval per sample until it is limited by the round trip.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        samples: int = DEFAULT_CLOCK_SYNC_SAMPLES,
+        timeout: float = DEFAULT_CLOCK_SYNC_TIMEOUT,
+    ):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        self.samples = samples
+        self.timeout = timeout
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = (
+            http.client.HTTPSConnection
+            if self.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _sample(self, connection: http.client.HTTPConnection) -> tuple:
+        """Returns (local send time, local receive time, server time) of one request."""
+        send = time.time()
+        connection.request("HEAD", self.path, headers={"Cache-Control": "no-cache"})
+        response = connection.getresponse()
+        recv = time.time()
+        response.read()
+
+        date = response.getheader("Date")
+        if not date:
+            raise ValueError(f"Response from {self.host} carries no Date header")
+        return send, recv, parsedate_to_datetime(date).timestamp()
+
+    @staticmethod
+    def _sleep_until_next_boundary(offset: float, rtt: float) -> None:
+        """Sleep until a request would reach the server at its next full second."""
+        boundary = math.ceil(time.time() + offset + rtt / 2 + 0.01)
+        send_at = boundary - offset - rtt / 2
+        time.sleep(max(0.0, send_at - time.time()))
+
+    def estimate(self) -> ClockOffset:
+        """
+        Sample the server and estimate its clock offset.
+
+        Returns:
+            ClockOffset: The offset estimate and its uncertainty.
+
+        Raises:
+            OSError: If the server cannot be reached.
+            ValueError: If the server does not send a Date header.
+        """
+        low, high = -math.inf, math.inf
+        rtt = 0.0
+        connection = self._connect()
+        try:
+            for sample_index in range(self.samples):
+                if sample_index:
+                    self._sleep_until_next_boundary((low + high) / 2, rtt)
+                send, recv, server_time = self._sample(connection)
+                rtt = recv - send
+
+                sample_low, sample_high = server_time - recv, server_time + 1 - send
+                low, high = max(low, sample_low), min(high, sample_high)
+                if low > high:
+                    # The local clock jumped between samples; restart from this one.
+                    low, high = sample_low, sample_high
+        finally:
+            connection.close()
+
+        return ClockOffset(
+            offset=(low + high) / 2,
+            uncertainty=(high - low) / 2,
+            samples=self.samples,
+        )
+
+
+def synchronize_clock(fire_scheduler, default_url: str) -> ClockOffset:
+    """
+    Feed the estimated server clock offset into a fire scheduler.
+
+    Honours CLOCK_SYNC ("false" disables it) and CLOCK_SYNC_URL (defaults to
+    `default_url`). The sync is skipped if T0 is too close to sample safely.
+
+    Returns:
+        ClockOffset: The applied estimate, None if no sync took place.
+    """
+    if os.environ.get("CLOCK_SYNC", "true").lower() == "false":
+        return None
+    if fire_scheduler.seconds_until_fire() < CLOCK_SYNC_MIN_LEAD:
+        return None
+
+    clock_sync_url = os.environ.get("CLOCK_SYNC_URL") or default_url
+    try:
+        clock_offset = ClockSync(clock_sync_url).estimate()
+    except (OSError, ValueError) as e:
+        logging.warning(f"! Clock sync failed, using local clock: {e}")
+        return None
+
+    fire_scheduler.clock_offset = clock_offset.safe_offset
+    logging.info(
+        f"Server clock offset {clock_offset.offset:+.3f}s ± {clock_offset.uncertainty:.3f}s"
+    )
+    return clock_offset
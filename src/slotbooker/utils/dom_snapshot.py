@@ -0,0 +1,325 @@
+import gzip
+import json
+import logging
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+from .scripts import ELEMENTS_CONNECTED, SCRAPE_BOOKING_SLOTS, SNAPSHOT_DOM
+from .selenium_manager import SeleniumManager
+from .xpaths import XPathEnum
+
+SNAPSHOT_SUFFIX = ".json.gz"
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+
+# Nodes whose texts the replay reads; all other texts are masked in snapshots
+KEPT_TEXT_XPATHS = [
+    # Weekday buttons
+    f"{XPathEnum.BOOKING_SECTION.value}/div/div/p",
+    # Slot times and class labels
+    f"{XPathEnum.BOOKING_SECTION.value}/div/div/div[1]/p[1]",
+    f"{XPathEnum.BOOKING_SECTION.value}/div/div/div[2]/p[1]",
+]
+
+
+class DomSnapshotRecorder:
+    """
+    Records sanitized DOM snapshots of live pages into a local corpus.
+
+    Every snapshot is a gzip-compressed JSON document holding the serialized
+    DOM and where it was taken. The corpus feeds the offline replay of the
+    scraping and fire-plan logic, see `ReplayDriver`.
+
+    Only weekday names, slot times, and class labels are kept as text, see
+    `KEPT_TEXT_XPATHS`. Personal data in these nodes, or in attributes kept
+    for their structure, is not removed, so the corpus belongs outside the
+    repository.
+
+    Attributes:
+        snapshot_dir (str): Directory of the corpus.
+    """
+
+    def __init__(self, snapshot_dir: str):
+        self.snapshot_dir = snapshot_dir
+
+    @classmethod
+    def from_env(cls) -> "DomSnapshotRecorder":
+        """
+        Create a recorder from DOM_SNAPSHOT_DIR.
+
+        Returns:
+            DomSnapshotRecorder: The recorder, or None if DOM_SNAPSHOT_DIR is not set.
+        """
+        snapshot_dir = os.environ.get("DOM_SNAPSHOT_DIR")
+        return cls(snapshot_dir) if snapshot_dir else None
+
+    def record(self, selenium_manager: SeleniumManager, label: str) -> str:
+        """
+        Capture the current page of a session.
+
+        Args:
+            selenium_manager (SeleniumManager): Session showing the page.
+            label (str): Short name of the page, e.g. the booking day.
+
+        Returns:
+            str: Path of the snapshot, None if it could not be recorded.
+        """
+        try:
+            dom = selenium_manager.execute_script(SNAPSHOT_DOM, KEPT_TEXT_XPATHS)
+            url = urlsplit(selenium_manager.driver.current_url)
+            return save_snapshot(
+                self.snapshot_dir,
+                label,
+                dom,
+                url=f"{url.scheme}://{url.netloc}{url.path}",
+            )
+        except (WebDriverException, OSError) as e:
+            logging.warning(f"! Could not record DOM snapshot: {e}")
+            return None
+
+
+def save_snapshot(snapshot_dir: str, label: str, dom: str, url: str = None) -> str:
+    """Write a serialized DOM to the corpus and return its path."""
+    recorded_at = datetime.now()
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(
+        snapshot_dir,
+        f"{label}_{recorded_at.strftime('%Y%m%d-%H%M%S-%f')}{SNAPSHOT_SUFFIX}",
+    )
+    snapshot = {
+        "label": label,
+        "recorded_at": recorded_at.isoformat(),
+        "url": url,
+        "dom": dom,
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(snapshot, file)
+    logging.info(f"DOM snapshot written to {path}")
+    return path
+
+
+def load_snapshot(path: str) -> dict:
+    """Read a snapshot of the corpus."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def list_snapshots(snapshot_dir: str) -> list:
+    """Paths of all snapshots in a corpus, oldest first."""
+    if not os.path.isdir(snapshot_dir):
+        return []
+    return sorted(
+        os.path.join(snapshot_dir, name)
+        for name in os.listdir(snapshot_dir)
+        if name.endswith(SNAPSHOT_SUFFIX)
+    )
+
+
+class _TreeParser(HTMLParser):
+    """Builds an ElementTree from HTML or XHTML, closing void and unclosed elements."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.builder = ET.TreeBuilder()
+        self.open_tags = []
+
+    def handle_starttag(self, tag, attrs):
+        self.builder.start(tag, {name: value or "" for name, value in attrs})
+        if tag in VOID_ELEMENTS:
+            self.builder.end(tag)
+        else:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.builder.start(tag, {name: value or "" for name, value in attrs})
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in self.open_tags:
+            return
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.builder.end(open_tag)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.open_tags:
+            self.builder.data(data)
+
+    def close(self) -> ET.Element:
+        super().close()
+        while self.open_tags:
+            self.builder.end(self.open_tags.pop())
+        return self.builder.close()
+
+
+def parse_dom(dom: str) -> ET.Element:
+    """Parse a serialized document into an ElementTree rooted at <html>."""
+    parser = _TreeParser()
+    parser.feed(dom)
+    return parser.close()
+
+
+def _relative_xpath(xpath: str) -> str:
+    # ElementTree evaluates paths relative to the <html> root element.
+    if not xpath.startswith("/html"):
+        raise NoSuchElementException(f"Unsupported XPath for replay: {xpath}")
+    return "." + xpath[len("/html") :]
+
+
+class ReplayElement:
+    """Read-only stand-in for a WebElement of a replayed snapshot."""
+
+    def __init__(self, driver: "ReplayDriver", element: ET.Element):
+        self.driver = driver
+        self.element = element
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self.element.itertext()).split())
+
+    def get_attribute(self, name: str) -> str:
+        return self.element.get(name)
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return "disabled" not in self.element.attrib
+
+    def click(self) -> None:
+        self.driver.clicks.append(self)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ReplayElement) and other.element is self.element
+
+    def __hash__(self) -> int:
+        return id(self.element)
+
+
+class ReplayDriver:
+    """
+    Minimal WebDriver over a DOM snapshot, for network-free scraping replays.
+
+    XPath lookups run on ElementTree, which supports the absolute child paths
+    with positional predicates used by `XPathEnum`. The slot scraping script is
+    evaluated in Python with the same lookups, so replays cover the scraper used
+    in production. Other scripts apart from the element connectivity check and
+    clicks raise `JavascriptException`, so the callers take their XPath fallbacks.
+
+    Attributes:
+        root (ET.Element): The <html> element of the snapshot.
+        clicks (list[ReplayElement]): Elements clicked so far.
+    """
+
+    session_id = "replay"
+
+    def __init__(self, dom: str, url: str = None):
+        self.root = parse_dom(dom)
+        self.current_url = url or "about:blank"
+        self.clicks = []
+
+    def find_element(self, by=By.XPATH, value: str = None) -> ReplayElement:
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element at {value}")
+        return elements[0]
+
+    def find_elements(self, by=By.XPATH, value: str = None) -> list:
+        if by != By.XPATH:
+            raise NoSuchElementException(f"Unsupported locator for replay: {by}")
+        try:
+            path = _relative_xpath(value)
+        except NoSuchElementException:
+            return []
+        return [ReplayElement(self, element) for element in self.root.findall(path)]
+
+    def execute_script(self, script: str, *args):
+        if script == ELEMENTS_CONNECTED:
+            return [True for _ in args[0]]
+        if script == "arguments[0].click();":
+            return args[0].click()
+        if script == SCRAPE_BOOKING_SLOTS:
+            return self._scrape_booking_slots(*args)
+        raise JavascriptException("Scripts are not available in replays")
+
+    def _first(self, template: str, index: int) -> ReplayElement:
+        elements = self.find_elements(By.XPATH, template.replace("{i}", str(index)))
+        return elements[0] if elements else None
+
+    def _scrape_booking_slots(
+        self,
+        boxes_xpath: str,
+        label_xpath: str,
+        time_xpath: str,
+        enter_xpath: str,
+        cancel_xpath: str,
+        wanted: list,
+    ) -> list:
+        """Evaluate SCRAPE_BOOKING_SLOTS, step by step as the script does."""
+        wanted_classes = {name for name, _ in wanted}
+        pending = {(name, time) for name, time in wanted}
+        slots = []
+        for index in range(1, len(self.find_elements(By.XPATH, boxes_xpath)) + 1):
+            if not pending:
+                break
+            label = self._first(label_xpath, index)
+            if label is None or label.text not in wanted_classes:
+                continue
+            time_node = self._first(time_xpath, index)
+            slot = {
+                "index": index,
+                "class": label.text,
+                "time": time_node.text if time_node is not None else None,
+                "enter": self._first(enter_xpath, index) is not None,
+                "cancel": self._first(cancel_xpath, index) is not None,
+            }
+            slots.append(slot)
+            pending.discard((slot["class"], slot["time"]))
+        return slots
+
+    def execute_async_script(self, script: str, *args):
+        raise JavascriptException("Scripts are not available in replays")
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def quit(self) -> None:
+        pass
+
+
+class ReplaySeleniumManager(SeleniumManager):
+    """A `SeleniumManager` whose driver replays a DOM snapshot instead of Chrome."""
+
+    def __init__(self, dom: str, url: str = None):
+        self._dom = dom
+        self._url = url
+        super().__init__(chromedriver=None)
+
+    def set_driver(self) -> ReplayDriver:
+        self.driver = ReplayDriver(self._dom, self._url)
+        return self.driver
@@ -0,0 +1,118 @@
+import logging
+from selenium.common.exceptions import StaleElementReferenceException
+from .scripts import ELEMENTS_CONNECTED
+from .selenium_manager import SeleniumManager
+
+
+class FireTarget:
+    """
+    A single class slot of the fire plan.
+
+    Attributes:
+        class_name (str): Name of the class to book.
+        time (str): Start time of the class.
+        xpath (str): XPath of the booking button, None if the slot was not found.
+        waiting_list (Any): Whether to join the waiting list if the class is full.
+        booked_xpath (str): XPath that appears once the slot is booked, if known.
+        element (WebElement): Pre-resolved booking button, None until resolved.
+    """
+
+    def __init__(
+        self,
+        class_name: str,
+        time: str,
+        xpath: str,
+        waiting_list,
+        booked_xpath: str = None,
+    ):
+        self.class_name = class_name
+        self.time = time
+        self.xpath = xpath
+        self.waiting_list = waiting_list
+        self.booked_xpath = booked_xpath
+        self.element = None
+
+    def __repr__(self) -> str:
+        return f"FireTarget({self.class_name!r}, {self.time!r})"
+
+
+class FirePlan:
+    """
+    Ordered booking targets whose buttons are resolved before T0.
+
+    The plan is compiled once from the day's `class_dict` and the scraped
+    booking slots. Resolving the buttons ahead of time means that falling back
+    to the next class only costs one staleness check instead of a fresh lookup
+    with waits.
+    """
+
+    def __init__(self, selenium_manager: SeleniumManager, targets: list):
+        self.selenium_manager = selenium_manager
+        self.targets = targets
+
+    @classmethod
+    def compile(
+        cls,
+        selenium_manager: SeleniumManager,
+        class_dict: list,
+        booking_slots: dict,
+    ) -> "FirePlan":
+        """
+        Build the plan from the day's class entries in priority order.
+
+        Args:
+            selenium_manager (SeleniumManager): Manager used to resolve elements.
+            class_dict (list): Entries with "class", "time" and optional "wl".
+            booking_slots (dict): Scraped slots as
+                {class: {time: {"xpath": ..., "booked_xpath": ...}}}.
+
+        Returns:
+            FirePlan: The compiled, not yet resolved plan.
+        """
+        targets = []
+        for entry in class_dict:
+            slot = booking_slots.get(entry.get("class"), {}).get(entry.get("time"))
+            targets.append(
+                FireTarget(
+                    class_name=entry.get("class"),
+                    time=entry.get("time"),
+                    xpath=slot["xpath"] if slot else None,
+                    waiting_list=entry.get("wl"),
+                    booked_xpath=slot.get("booked_xpath") if slot else None,
+                )
+            )
+        return cls(selenium_manager, targets)
+
+    def __iter__(self):
+        return iter(self.targets)
+
+    def resolve(self, targets: list = None) -> None:
+        """Look up the booking buttons of the given targets, all by default."""
+        for target in self.targets if targets is None else targets:
+            if target.xpath:
+                elements = self.selenium_manager.find_elements(xpath=target.xpath)
+                target.element = elements[0] if elements else None
+
+    def validate(self) -> None:
+        """Re-resolve targets whose button was detached by a re-render.
+
+        All resolved buttons are checked for staleness in a single round trip;
+        only the stale or still unresolved ones are looked up again.
+        """
+        resolved = [target for target in self.targets if target.element is not None]
+        connected = [False] * len(resolved)
+        if resolved:
+            try:
+                connected = self.selenium_manager.execute_script(
+                    ELEMENTS_CONNECTED, [target.element for target in resolved]
+                )
+            except StaleElementReferenceException:
+                pass
+
+        stale = [target for target, ok in zip(resolved, connected) if not ok]
+        unresolved = [
+            target for target in self.targets if target.element is None and target.xpath
+        ]
+        if stale:
+            logging.info(f"Re-resolving {len(stale)} stale booking button(s)")
+        self.resolve(stale + unresolved)
@@ -0,0 +1,149 @@
+import os
+import time
+from datetime import date, datetime, time as dt_time, tzinfo
+from zoneinfo import ZoneInfo
+
+DEFAULT_EXECUTION_BOOKING_TIME = "00:00:00.000000"
+
+# Seconds before T0 at which coarse sleeping stops and the monotonic spin starts.
+DEFAULT_SPIN_WINDOW = 0.02
+# Upper bound for a single coarse sleep, so a long wait still re-checks the clock.
+MAX_SLEEP_CHUNK = 1.0
+
+
+class FireScheduler:
+    """
+    Schedules the booking click at a precise wall-clock time (T0).
+
+    The scheduler translates the configured execution time into a deadline on the
+    monotonic clock once, sleeps coarsely until shortly before that deadline, and
+    then spins for the final milliseconds. Times are interpreted in the configured
+    timezone (e.g. "Europe/Berlin"), falling back to the local timezone of the
+    runner. A positive clock offset means the server clock is ahead of ours.
+
+    Attributes:
+        execution_time (datetime.time): Time of day at which to fire.
+        timezone (tzinfo): Timezone the execution time is expressed in.
+        clock_offset (float): Estimated server clock minus local clock, in seconds.
+        spin_window (float): Seconds before T0 during which the scheduler spins.
+        fire_date (datetime.date): Date of T0, None for the current day.
+        deadline (float): Monotonic timestamp of T0 once armed, otherwise None.
+        jitter (float): Seconds between T0 and the moment `wait` returned.
+    """
+
+    def __init__(
+        self,
+        execution_booking_time: str = DEFAULT_EXECUTION_BOOKING_TIME,
+        timezone: str = None,
+        clock_offset: float = 0.0,
+        spin_window: float = DEFAULT_SPIN_WINDOW,
+        fire_date: date = None,
+    ):
+        self.execution_time = self.parse_execution_time(execution_booking_time)
+        self.timezone = self._resolve_timezone(timezone)
+        self.clock_offset = clock_offset
+        self.spin_window = spin_window
+        self.fire_date = fire_date
+        self.deadline = None
+        self.jitter = None
+
+    @classmethod
+    def from_env(cls, clock_offset: float = 0.0) -> "FireScheduler":
+        """Create a scheduler from EXECUTION_BOOKING_TIME and BOOKING_TIMEZONE."""
+        return cls(
+            execution_booking_time=os.environ.get(
+                "EXECUTION_BOOKING_TIME", DEFAULT_EXECUTION_BOOKING_TIME
+            )
+            or DEFAULT_EXECUTION_BOOKING_TIME,
+            timezone=os.environ.get("BOOKING_TIMEZONE") or None,
+            clock_offset=clock_offset,
+        )
+
+    @staticmethod
+    def parse_execution_time(value: str) -> dt_time:
+        """Parse "HH:MM", "HH:MM:SS" or "HH:MM:SS.ffffff" into a time object.
+
+        Raises:
+            ValueError: If the value is not a valid time of day.
+        """
+        try:
+            return dt_time.fromisoformat(value.strip())
+        except (AttributeError, ValueError):
+            raise ValueError(
+                f"Invalid execution booking time '{value}', expected HH:MM:SS.ffffff"
+            )
+
+    @staticmethod
+    def _resolve_timezone(timezone: str) -> tzinfo:
+        if timezone:
+            return ZoneInfo(timezone)
+        return datetime.now().astimezone().tzinfo
+
+    def target_datetime(self, now: datetime = None) -> datetime:
+        """Returns T0 on the fire date (the current day by default) as a timezone-aware datetime."""
+        now = now or datetime.now(self.timezone)
+        return datetime.combine(
+            self.fire_date or now.astimezone(self.timezone).date(),
+            self.execution_time,
+            tzinfo=self.timezone,
+        )
+
+    def seconds_until_fire(self, now: datetime = None) -> float:
+        """Seconds of local time left until the server reaches T0.
+
+        A target that already passed today yields a negative value, which makes
+        the scheduler fire immediately.
+        """
+        now = now or datetime.now(self.timezone)
+        return (self.target_datetime(now) - now).total_seconds() - self.clock_offset
+
+    def arm(self) -> float:
+        """
+        Pin T0 to the monotonic clock and return the deadline.
+
+        A T0 that already passed gives a deadline in the past, so `wait` returns
+        at once and its jitter reports how late the scheduler fired.
+        """
+        self.deadline = time.monotonic() + self.seconds_until_fire()
+        return self.deadline
+
+    def wait_until_lead(self, lead: float) -> None:
+        """
+        Sleep until `lead` seconds before T0, without spinning.
+
+        Lets callers re-check the page right before `wait` fires. Returns at
+        once if that moment already passed.
+        """
+        if self.deadline is None:
+            self.arm()
+
+        remaining = self.deadline - lead - time.monotonic()
+        while remaining > 0:
+            time.sleep(min(remaining, MAX_SLEEP_CHUNK))
+            remaining = self.deadline - lead - time.monotonic()
+
+    def wait(self) -> float:
+        """
+        Block until T0 and return the achieved jitter.
+
+        Returns:
+            float: Seconds between the deadline and the moment of return. Positive
+                values mean the scheduler returned late, e.g. because T0 had
+                already passed when it was called.
+        """
+        if self.deadline is None:
+            self.arm()
+
+        remaining = self.deadline - time.monotonic()
+        while remaining > self.spin_window:
+            time.sleep(min(remaining - self.spin_window, MAX_SLEEP_CHUNK))
+            remaining = self.deadline - time.monotonic()
+
+        now = time.monotonic()
+        while now < self.deadline:
+            # Yield the GIL so other accounts in the same process can run.
+            time.sleep(0)
+            now = time.monotonic()
+
+        self.jitter = now - self.deadline
+        return self.jitter
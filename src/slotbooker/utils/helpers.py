@@ -2,6 +2,18 @@ import os
 from datetime import date, timedelta
 
 
+def parse_yaml(content: bytes):
+    """
+    Parse a YAML document with the fastest available safe loader.
+
+    PyYAML is imported on first use, keeping it off the import path of the CLI.
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(content, Loader=loader)
+
+
 class EnvVarNotSetError(Exception):
     """Custom exception to be raised when an environment variable is not set."""
 
@@ -42,18 +54,30 @@ def stop_booking_process() -> bool:
     return True
 
 
-def get_day(days_before_bookable: int) -> tuple[date, int]:
+def get_days_before_bookable() -> int:
+    """Reads DAYS_BEFORE_BOOKABLE from the environment, defaulting to 0."""
+    days_before_bookable = os.environ.get("DAYS_BEFORE_BOOKABLE", None)
+    return (
+        int(days_before_bookable)
+        if days_before_bookable and days_before_bookable.strip()
+        else 0
+    )
+
+
+def get_day(days_before_bookable: int, booking_date: date = None) -> tuple[date, int]:
     """Checks and selects which day will be selected,
     based on how many days from today shall be selected.
 
     Args:
         days_before_bookable (int): Number of days to go in the future
+        booking_date (date): Day to select instead, e.g. planned by the daemon
+            before midnight for a fire time after it.
 
     Returns:
         tuple[date, int]: Future day to be selected, number of different calendar weeks
     """
     today = date.today()
-    future_date = today + timedelta(days=days_before_bookable)
+    future_date = booking_date or today + timedelta(days=days_before_bookable)
     today_calendar_week = today.isocalendar().week
     future_calendar_week = future_date.isocalendar().week
     diff_week = future_calendar_week - today_calendar_week
@@ -0,0 +1,366 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from logging.handlers import BaseRotatingHandler
+from typing import Iterable, Iterator
+
+from .logging import current_account
+from .tracing import current_phase
+
+ACTIVE_LOG = "run.jsonl"
+ARCHIVE_INDEX = "index.jsonl"
+DEFAULT_JSON_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_JSON_LOG_MAX_AGE = 24 * 60 * 60
+DEFAULT_JSON_LOG_RETENTION_DAYS = 90
+# Attributes every record has; everything else was passed with `extra=`
+STANDARD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {
+    "message",
+    "asctime",
+    "account",
+    "phase",
+    "monotonic_ns",
+}
+
+
+def install_record_factory() -> None:
+    """Stamp every new record with the current account, phase, and monotonic time."""
+    factory = logging.getLogRecordFactory()
+    if getattr(factory, "stamps_context", False):
+        return
+
+    def record_factory(*args, **kwargs) -> logging.LogRecord:
+        record = factory(*args, **kwargs)
+        record.account = current_account.get()
+        record.phase = current_phase.get()
+        record.monotonic_ns = time.monotonic_ns()
+        return record
+
+    record_factory.stamps_context = True
+    logging.setLogRecordFactory(record_factory)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one compact JSON object.
+
+    Fields: ts (epoch seconds), mono_ns (monotonic clock), level, account,
+    phase, msg, the fields passed with `extra=`, and exc for exceptions.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "mono_ns": getattr(record, "monotonic_ns", None),
+            "level": record.levelname,
+            "account": getattr(record, "account", None),
+            "phase": getattr(record, "phase", None),
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class SegmentStats:
+    """Time range and accounts of the records of one log file, kept in the index."""
+
+    def __init__(self):
+        self.start = None
+        self.end = None
+        self.records = 0
+        self.accounts = set()
+        self.phases = set()
+
+    def observe(self, ts: float, account: str, phase: str) -> None:
+        self.start = ts if self.start is None else min(self.start, ts)
+        self.end = ts if self.end is None else max(self.end, ts)
+        self.records += 1
+        if account is not None:
+            self.accounts.add(account)
+        if phase is not None:
+            self.phases.add(phase)
+
+    @classmethod
+    def scan(cls, lines: Iterable[str]) -> "SegmentStats":
+        """Statistics of existing records, e.g. of the active file of an earlier run."""
+        stats = cls()
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            stats.observe(entry["ts"], entry.get("account"), entry.get("phase"))
+        return stats
+
+    def to_dict(self, file: str) -> dict:
+        return {
+            "file": file,
+            "start": self.start,
+            "end": self.end,
+            "records": self.records,
+            "accounts": sorted(self.accounts),
+            "phases": sorted(self.phases),
+        }
+
+
+class RotatingJsonLogHandler(BaseRotatingHandler):
+    """
+    Writes JSON lines to `run.jsonl` and rotates it into gzip archives.
+
+    The active file is rotated once it exceeds `max_bytes` or its first record is
+    older than `max_age` seconds. Each archive gets an entry in the sidecar
+    `index.jsonl` with its time range and accounts, so `query_logs` only
+    decompresses archives that can match. Archives older than `retention_days`
+    are deleted on rotation.
+
+    Attributes:
+        log_dir (str): Directory of the active file, the archives, and the index.
+        max_bytes (int): Size in bytes at which the active file is rotated.
+        max_age (float): Age in seconds at which the active file is rotated.
+        retention_days (float): Days an archive is kept, 0 keeps all.
+    """
+
+    def __init__(
+        self,
+        log_dir: str,
+        max_bytes: int = DEFAULT_JSON_LOG_MAX_BYTES,
+        max_age: float = DEFAULT_JSON_LOG_MAX_AGE,
+        retention_days: float = DEFAULT_JSON_LOG_RETENTION_DAYS,
+    ):
+        os.makedirs(log_dir, exist_ok=True)
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention_days = retention_days
+        super().__init__(os.path.join(log_dir, ACTIVE_LOG), "a", encoding="utf-8")
+        self.setFormatter(JsonFormatter())
+        with open(self.baseFilename, encoding="utf-8") as file:
+            self.segment = SegmentStats.scan(file)
+
+    @classmethod
+    def from_env(cls) -> "RotatingJsonLogHandler":
+        """
+        Create a handler from JSON_LOG_DIR, JSON_LOG_MAX_BYTES, JSON_LOG_MAX_AGE,
+        and JSON_LOG_RETENTION_DAYS.
+
+        Returns:
+            RotatingJsonLogHandler: The handler, or None if JSON_LOG_DIR is not set.
+        """
+        log_dir = os.environ.get("JSON_LOG_DIR")
+        if not log_dir:
+            return None
+        return cls(
+            log_dir=log_dir,
+            max_bytes=int(
+                os.environ.get("JSON_LOG_MAX_BYTES", DEFAULT_JSON_LOG_MAX_BYTES)
+            ),
+            max_age=float(os.environ.get("JSON_LOG_MAX_AGE", DEFAULT_JSON_LOG_MAX_AGE)),
+            retention_days=float(
+                os.environ.get(
+                    "JSON_LOG_RETENTION_DAYS", DEFAULT_JSON_LOG_RETENTION_DAYS
+                )
+            ),
+        )
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802
+        if self.segment.start is None:
+            return False
+        if record.created - self.segment.start >= self.max_age:
+            return True
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() >= self.max_bytes
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        self.segment.observe(
+            record.created,
+            getattr(record, "account", None),
+            getattr(record, "phase", None),
+        )
+
+    def doRollover(self) -> None:  # noqa: N802
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        start = datetime.fromtimestamp(self.segment.start)
+        archive = f"run-{start:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}.jsonl.gz"
+        with (
+            open(self.baseFilename, "rb") as source,
+            gzip.open(os.path.join(self.log_dir, archive), "wb") as target,
+        ):
+            shutil.copyfileobj(source, target)
+        with open(os.path.join(self.log_dir, ARCHIVE_INDEX), "a") as index:
+            index.write(
+                json.dumps(self.segment.to_dict(archive), separators=(",", ":")) + "\n"
+            )
+        os.remove(self.baseFilename)
+        self.segment = SegmentStats()
+        self.stream = self._open()
+        if self.retention_days:
+            self._prune(time.time() - self.retention_days * 24 * 60 * 60)
+
+    def _prune(self, cutoff: float) -> None:
+        """Delete archives whose newest record is older than `cutoff`."""
+        entries = read_index(self.log_dir)
+        kept = [entry for entry in entries if entry["end"] >= cutoff]
+        if len(kept) == len(entries):
+            return
+        for entry in entries:
+            if entry["end"] < cutoff:
+                try:
+                    os.remove(os.path.join(self.log_dir, entry["file"]))
+                except FileNotFoundError:
+                    pass
+        index_path = os.path.join(self.log_dir, ARCHIVE_INDEX)
+        with open(f"{index_path}.tmp", "w") as index:
+            for entry in kept:
+                index.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(f"{index_path}.tmp", index_path)
+
+
+_json_handler = None
+_json_handler_lock = threading.Lock()
+
+
+def install_json_logging(queue_logging=None) -> RotatingJsonLogHandler:
+    """
+    Add the JSON log configured by the environment to the process, once.
+
+    Args:
+        queue_logging (QueueLogging): Queue logging to register the handler with as
+            a sink; None attaches it to the root logger.
+
+    Returns:
+        RotatingJsonLogHandler: The installed handler, None if JSON_LOG_DIR is not set.
+    """
+    global _json_handler
+    with _json_handler_lock:
+        if _json_handler is None:
+            _json_handler = RotatingJsonLogHandler.from_env()
+            if _json_handler is None:
+                return None
+            install_record_factory()
+        if queue_logging is not None:
+            queue_logging.add_handler(_json_handler.baseFilename, _json_handler)
+        elif _json_handler not in logging.getLogger().handlers:
+            logging.getLogger().addHandler(_json_handler)
+        return _json_handler
+
+
+def read_index(log_dir: str) -> list:
+    """Index entries of the archives of a JSON log directory, oldest first."""
+    try:
+        with open(os.path.join(log_dir, ARCHIVE_INDEX)) as index:
+            return [json.loads(line) for line in index if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _timestamp(value) -> float:
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+def _segment_matches(
+    entry: dict, account: str, phase: str, since: float, until: float
+) -> bool:
+    if since is not None and entry["end"] < since:
+        return False
+    if until is not None and entry["start"] > until:
+        return False
+    if account is not None and account not in entry["accounts"]:
+        return False
+    return phase is None or phase in entry["phases"]
+
+
+def _filter_lines(
+    lines: Iterable[str],
+    account: str,
+    phase: str,
+    since: float,
+    until: float,
+    field: str,
+) -> Iterator[dict]:
+    # Compact JSON allows rejecting most lines before they are parsed.
+    needles = [
+        f'"account":{json.dumps(account)}' if account is not None else None,
+        f'"phase":{json.dumps(phase)}' if phase is not None else None,
+        f"{json.dumps(field)}:" if field is not None else None,
+    ]
+    needles = [needle for needle in needles if needle]
+    for line in lines:
+        if not all(needle in line for needle in needles):
+            continue
+        entry = json.loads(line)
+        if since is not None and entry["ts"] < since:
+            continue
+        if until is not None and entry["ts"] > until:
+            continue
+        if (
+            (account is None or entry.get("account") == account)
+            and (phase is None or entry.get("phase") == phase)
+            and (field is None or field in entry)
+        ):
+            yield entry
+
+
+def query_logs(
+    log_dir: str,
+    account: str = None,
+    phase: str = None,
+    since=None,
+    until=None,
+    field: str = None,
+) -> Iterator[dict]:
+    """
+    Yield the JSON log records matching all given filters, oldest first.
+
+    Archives are skipped by their index entry when their time range, accounts,
+    or phases cannot match, so only candidate archives are decompressed.
+
+    Example:
+        Fire latencies of an account in September::
+
+            for entry in query_logs("logs/json", account="charly",
+                                    since=datetime(2026, 9, 1), until=datetime(2026, 10, 1),
+                                    field="fire_latency_ms"):
+                print(entry["fire_latency_ms"])
+
+    Args:
+        log_dir (str): JSON log directory, see JSON_LOG_DIR.
+        account (str): Only records of this account.
+        phase (str): Only records logged within this span, e.g. "book_slot".
+        since (datetime | float): Only records at or after this time.
+        until (datetime | float): Only records at or before this time.
+        field (str): Only records carrying this field, e.g. "fire_latency_ms".
+
+    Yields:
+        dict: The matching records.
+    """
+    since, until = _timestamp(since), _timestamp(until)
+    for entry in read_index(log_dir):
+        if not _segment_matches(entry, account, phase, since, until):
+            continue
+        try:
+            file = gzip.open(
+                os.path.join(log_dir, entry["file"]), "rt", encoding="utf-8"
+            )
+        except FileNotFoundError:
+            # Pruned by a concurrent rotation
+            continue
+        with file:
+            yield from _filter_lines(file, account, phase, since, until, field)
+    try:
+        with open(os.path.join(log_dir, ACTIVE_LOG), encoding="utf-8") as file:
+            yield from _filter_lines(file, account, phase, since, until, field)
+    except FileNotFoundError:
+        return
@@ -1,13 +1,25 @@
+import atexit
+import contextvars
+import html
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 import logging
 import re
-from typing import Dict, List
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Iterator, Tuple
 
 # Constants for logging configuration
 LOG_DIR = "logs"
 LOG_FILE_TEMPLATE = "log_{timestamp}.txt"
+ACCOUNT_LOG_FILE_TEMPLATE = "log_{timestamp}_{account}.txt"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+DEFAULT_LOG_BUFFER_SIZE = 10_000
+
+# Account whose pipeline runs in the current thread, set by the orchestrator
+current_account = contextvars.ContextVar("current_account", default=None)
 
 LOG_LEVELS: Dict[str, str] = {
     "INFO": "info",
@@ -18,10 +30,76 @@ LOG_LEVELS: Dict[str, str] = {
     "USER": "user",
 }
 
+# Records as written by the basicConfig format of LogHandler
+LOG_LINE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) (\w+) (.*)")
+
+HTML_REPORT_HEADER = """
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <style>
+                body {
+                    font-family: Arial, sans-serif;
+                }
+                .log-table {
+                    width: 100%;
+                    border-collapse: collapse;
+                }
+                .log-table th, .log-table td {
+                    border: 1px solid #ddd;
+                    padding: 8px;
+                }
+                .log-table th {
+                    background-color: #f2f2f2;
+                    text-align: left;
+                }
+                .user {
+                    font-weight: bold;
+                }
+                .info {
+                    color: blue;
+                }
+                .success {
+                    color: green;
+                }
+                .warning {
+                    color: orange;
+                }
+                .error {
+                    color: red;
+                }
+                .debug {
+                    color: purple;
+                }
+            </style>
+        </head>
+        <body>
+        <h2>Log Report</h2>
+        <table class="log-table">
+            <tr>
+                <th>Timestamp</th>
+                <th>Message</th>
+            </tr>
+        """
+HTML_REPORT_ROW = """
+                <tr>
+                    <td>{timestamp}</td>
+                    <td class="{log_class}">{message}</td>
+                </tr>
+                """
+HTML_REPORT_FOOTER = """
+        </table>
+        </body>
+        </html>
+        """
+
 
 class LogHandler:
     def __init__(self, log_level=logging.INFO) -> None:
         self.timestamp: str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.account = current_account.get()
         self.log_dir = LOG_DIR
         self.log_file_path: str = self._setup_log_dir()
         self.orig_stdout = sys.stdout
@@ -31,17 +109,38 @@ class LogHandler:
         logging.setLoggerClass(CustomLogger)
         self.logger = logging.getLogger(__name__)
 
-        logging.basicConfig(
-            filename=self.log_file_path,
-            filemode="w",
-            encoding="utf-8",
-            format="%(asctime)s %(levelname)s %(message)s",
-            level=self.log_level,
-        )
+        self.queue_logging = get_queue_logging(self.log_level)
+        if self.queue_logging is not None:
+            self.queue_logging.add_sink(
+                self.log_file_path, account=self.account, level=self.log_level
+            )
+        else:
+            logging.basicConfig(
+                filename=self.log_file_path,
+                filemode="w",
+                encoding="utf-8",
+                format=LOG_FORMAT,
+                level=self.log_level,
+            )
+        # The structured log is only loaded by runs that enable it
+        if os.environ.get("JSON_LOG_DIR"):
+            from .json_logs import install_json_logging
+
+            install_json_logging(self.queue_logging)
 
     def get_log_file_path(self) -> str:
         return self.log_file_path
 
+    def flush(self) -> None:
+        """Write all buffered records to the log file, e.g. before it is mailed."""
+        if self.queue_logging is not None:
+            self.queue_logging.drain()
+
+    def close(self) -> None:
+        """Flush and release the log sink of this handler."""
+        if self.queue_logging is not None:
+            self.queue_logging.remove_sink(self.log_file_path)
+
     def _setup_log_dir(self) -> str:
         """
         Creates a directory for logs if it doesn't exist and generates a log file path based on the current date and time.
@@ -50,6 +149,14 @@ class LogHandler:
             str: Path to the generated log file.
         """
         os.makedirs(self.log_dir, exist_ok=True)
+        if self.account is not None:
+            # Accounts of one run start within the same second
+            return os.path.join(
+                self.log_dir,
+                ACCOUNT_LOG_FILE_TEMPLATE.format(
+                    timestamp=self.timestamp, account=self.account
+                ),
+            )
         return os.path.join(
             self.log_dir, LOG_FILE_TEMPLATE.format(timestamp=self.timestamp)
         )
@@ -74,96 +181,243 @@ class LogHandler:
         Returns:
             str: Path to the generated HTML file.
         """
-        with open(self.log_file_path, "r") as file:
-            lines = file.readlines()
-
-        html_content = self._generate_html_content(lines)
-        html_file_path = self.log_file_path.replace(".txt", ".html")
+        html_file_path = os.path.splitext(self.log_file_path)[0] + ".html"
+        return write_html_report(self.log_file_path, html_file_path)
 
-        with open(html_file_path, "w") as file:
-            file.write(html_content)
-
-        return html_file_path
-
-    def _generate_html_content(self, lines: List[str]) -> str:
+    def _generate_html_content(self, lines: Iterable[str]) -> str:
         """
         Generates HTML content from log lines.
 
         Args:
-            lines (List[str]): List of log lines.
+            lines (Iterable[str]): Log lines.
 
         Returns:
             str: Generated HTML content.
         """
-        html_content = """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {
-                    font-family: Arial, sans-serif;
-                }
-                .log-table {
-                    width: 100%;
-                    border-collapse: collapse;
-                }
-                .log-table th, .log-table td {
-                    border: 1px solid #ddd;
-                    padding: 8px;
-                }
-                .log-table th {
-                    background-color: #f2f2f2;
-                    text-align: left;
-                }
-                .user {
-                    font-weight: bold;
-                }
-                .info {
-                    color: blue;
-                }
-                .success {
-                    color: green;
-                }
-                .warning {
-                    color: orange;
-                }
-                .error {
-                    color: red;
-                }
-                .debug {
-                    color: purple;
-                }
-            </style>
-        </head>
-        <body>
-        <h2>Log Report</h2>
-        <table class="log-table">
-            <tr>
-                <th>Timestamp</th>
-                <th>Message</th>
-            </tr>
+        return "".join(render_html_report(lines))
+
+
+class AccountFilter(logging.Filter):
+    """
+    Stamps records with the account of the current context, see `current_account`.
+
+    A filter for an account only passes records of that account and records
+    logged outside of any account, so each account's log is complete on its own.
+    """
+
+    def __init__(self, account: str = None):
+        super().__init__()
+        self.account = account
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "account"):
+            record.account = current_account.get()
+        return self.account is None or record.account in (None, self.account)
+
+
+class RingBuffer(queue.Queue):
+    """
+    Log queue that never blocks the caller: when full, the oldest record is dropped.
+
+    Attributes:
+        capacity (int): Maximum number of buffered records.
+        dropped (int): Number of records dropped so far.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LOG_BUFFER_SIZE):
+        super().__init__()
+        self.capacity = capacity
+        self.dropped = 0
+
+    def _put(self, item) -> None:
+        if len(self.queue) >= self.capacity:
+            self.queue.popleft()
+            self.dropped += 1
+            # The dropped record is never marked done by the listener
+            self.unfinished_tasks -= 1
+        self.queue.append(item)
+
+
+class SinkListener(QueueListener):
+    """Queue listener handing every record to the sinks registered at that time."""
+
+    def __init__(self, buffer: RingBuffer, sinks: dict):
+        super().__init__(buffer)
+        self.sinks = sinks
+
+    def handle(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+        for sink in list(self.sinks.values()):
+            if record.levelno >= sink.level:
+                sink.handle(record)
+
+
+class QueueLogging:
+    """
+    Asynchronous logging through an in-memory ring buffer.
+
+    Log calls only format the message and append the record to the buffer; a
+    background listener writes them to the registered file sinks. Each sink can
+    be limited to one account, so several bookers of one process write separate
+    logs instead of sharing the file of `logging.basicConfig`.
+
+    Attributes:
+        buffer (RingBuffer): Records waiting to be written.
+        sinks (dict): Log file path -> file handler.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LOG_BUFFER_SIZE):
+        self.buffer = RingBuffer(capacity)
+        self.queue_handler = QueueHandler(self.buffer)
+        self.queue_handler.addFilter(AccountFilter())
+        self.sinks = {}
+        self.listener = SinkListener(self.buffer, self.sinks)
+        self.running = False
+        self._reported_drops = 0
+        self._lock = threading.Lock()
+
+    def install(self, level: int = logging.INFO) -> None:
+        """Route the records of the root logger through the buffer and start the listener."""
+        root = logging.getLogger()
+        root.addHandler(self.queue_handler)
+        root.setLevel(level)
+        self.listener.start()
+        self.running = True
+        atexit.register(self.stop)
+
+    def add_sink(
+        self, path: str, account: str = None, level: int = logging.INFO
+    ) -> logging.Handler:
         """
-        for line in lines:
-            match = re.match(
-                r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) (\w+) (.*)", line
-            )
-            if match:
-                timestamp, log_level, message = match.groups()
-                log_class = LOG_LEVELS.get(log_level, "info")
-                html_content += f"""
-                <tr>
-                    <td>{timestamp.strip()}</td>
-                    <td class="{log_class}">{message.strip()}</td>
-                </tr>
-                """
-        html_content += """
-        </table>
-        </body>
-        </html>
+        Write the records to a file, optionally only those of one account.
+
+        Args:
+            path (str): Log file path.
+            account (str): Account whose records are written, None writes all.
+            level (int): Minimum level of the written records.
+
+        Returns:
+            logging.Handler: The file handler of the sink.
         """
-        return html_content
+        with self._lock:
+            if path not in self.sinks:
+                sink = logging.FileHandler(path, mode="w", encoding="utf-8")
+                sink.setFormatter(logging.Formatter(LOG_FORMAT))
+                sink.setLevel(level)
+                sink.addFilter(AccountFilter(account))
+                self.sinks[path] = sink
+            return self.sinks[path]
+
+    def add_handler(self, name: str, handler: logging.Handler) -> None:
+        """Register a handler as a sink of all records, e.g. the JSON log."""
+        with self._lock:
+            self.sinks.setdefault(name, handler)
+
+    def remove_sink(self, path: str) -> None:
+        """Flush and close a sink."""
+        self.drain()
+        with self._lock:
+            sink = self.sinks.pop(path, None)
+        if sink is not None:
+            sink.close()
+
+    def drain(self) -> None:
+        """Block until every buffered record is written and flushed to the sinks."""
+        if not self.running:
+            return
+        dropped = self.buffer.dropped - self._reported_drops
+        if dropped:
+            self._reported_drops += dropped
+            logging.warning(
+                f"! {dropped} log record(s) dropped, consider raising LOG_BUFFER_SIZE"
+            )
+        self.buffer.join()
+        for sink in list(self.sinks.values()):
+            sink.flush()
+
+    def stop(self) -> None:
+        """Write the remaining records, stop the listener, and close all sinks."""
+        if not self.running:
+            return
+        self.running = False
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener.stop()
+        with self._lock:
+            sinks = list(self.sinks.values())
+            self.sinks.clear()
+        for sink in sinks:
+            sink.close()
+
+
+_queue_logging = None
+_queue_logging_lock = threading.Lock()
+
+
+def get_queue_logging(level: int = logging.INFO) -> QueueLogging:
+    """
+    The process-wide queue logging, installed on first use if LOG_MODE=queue.
+
+    Returns:
+        QueueLogging: The queue logging, or None if records are written synchronously.
+    """
+    global _queue_logging
+    if os.environ.get("LOG_MODE", "sync").lower() != "queue":
+        return None
+    with _queue_logging_lock:
+        if _queue_logging is None or not _queue_logging.running:
+            _queue_logging = QueueLogging(
+                int(os.environ.get("LOG_BUFFER_SIZE", DEFAULT_LOG_BUFFER_SIZE))
+            )
+            _queue_logging.install(level)
+        return _queue_logging
+
+
+def parse_log_lines(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """
+    Parse log lines into (timestamp, level, message), skipping lines that are not
+    log records, such as continuation lines of tracebacks.
+    """
+    match = LOG_LINE_PATTERN.match
+    for line in lines:
+        record = match(line)
+        if record:
+            yield record.groups()
+
+
+def render_html_report(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Render log lines as chunks of an HTML report, one table row per record.
+
+    Messages are HTML-escaped. The report is produced lazily, so it can be
+    written out while the log is still being read.
+    """
+    yield HTML_REPORT_HEADER
+    for timestamp, log_level, message in parse_log_lines(lines):
+        yield HTML_REPORT_ROW.format(
+            timestamp=timestamp,
+            log_class=LOG_LEVELS.get(log_level, "info"),
+            message=html.escape(message.strip(), quote=False),
+        )
+    yield HTML_REPORT_FOOTER
+
+
+def write_html_report(log_file_path: str, html_file_path: str) -> str:
+    """
+    Stream a log file into an HTML report in bounded memory.
+
+    Args:
+        log_file_path (str): Path of the log file.
+        html_file_path (str): Path of the report to write.
+
+    Returns:
+        str: Path to the generated HTML file.
+    """
+    with (
+        open(log_file_path, "r", encoding="utf-8", errors="replace") as source,
+        open(html_file_path, "w", encoding="utf-8") as target,
+    ):
+        target.writelines(render_html_report(source))
+    return html_file_path
 
 
 class CustomLogger(logging.Logger):
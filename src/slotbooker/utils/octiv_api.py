@@ -0,0 +1,122 @@
+import http.client
+import json
+import threading
+from enum import Enum
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_API_URL = "https://api.octivfitness.com"
+DEFAULT_API_TIMEOUT = 10
+# Methods that can be repeated after the server may have received them
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class EndpointEnum(str, Enum):
+    """
+    Enum for the Octiv API endpoints used by the HTTP backend.
+
+    The paths are assumed, not taken from a published API description. The
+    stand-in server of the tests implements the same paths, so the tests do
+    not verify them against the real API.
+    """
+
+    LOGIN = "/api/login"
+    CLASS_DATES = "/api/class-dates"
+    CLASS_BOOKINGS = "/api/class-bookings"
+    CLASS_BOOKING = "/api/class-bookings/{booking_id}"
+    WAITING_LIST = "/api/class-waiting-list"
+
+
+class OctivApiError(Exception):
+    """Raised when the Octiv API cannot be reached or answers unexpectedly."""
+
+    def __init__(self, message: str, status: int = None, payload: dict = None):
+        super().__init__(message)
+        self.status = status
+        self.payload = payload or {}
+
+
+class OctivApiClient:
+    """
+    Minimal JSON client for the Octiv API over a single keep-alive connection.
+
+    The connection is opened lazily and reused for every request, so login and
+    booking share one TCP/TLS handshake. A connection dropped by the server is
+    re-opened once per request. Requests that may have reached the server are
+    only repeated for idempotent methods, so a lost response to a booking never
+    books twice.
+    """
+
+    def __init__(
+        self, api_url: str = DEFAULT_API_URL, timeout: float = DEFAULT_API_TIMEOUT
+    ):
+        parts = urlsplit(api_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.token = None
+        self.connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = (
+            http.client.HTTPSConnection
+            if self.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def request(
+        self, method: str, path: str, payload: dict = None, params: dict = None
+    ) -> tuple:
+        """
+        Send a JSON request and decode the JSON response.
+
+        Returns:
+            tuple[int, Any]: The HTTP status and the decoded body (None if empty).
+
+        Raises:
+            OctivApiError: If the server cannot be reached or sends invalid JSON.
+        """
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        body = json.dumps(payload) if payload is not None else None
+        headers = {"Accept": "application/json", "Connection": "keep-alive"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        with self._lock:
+            for attempt in range(2):
+                if self.connection is None:
+                    self.connection = self._connect()
+                sent = False
+                try:
+                    self.connection.request(method, path, body=body, headers=headers)
+                    sent = True
+                    response = self.connection.getresponse()
+                    status, raw = response.status, response.read()
+                    break
+                except (http.client.HTTPException, ConnectionError) as e:
+                    # Stale keep-alive connection, retry once on a fresh one.
+                    self.connection.close()
+                    self.connection = None
+                    if attempt or (sent and method.upper() not in IDEMPOTENT_METHODS):
+                        raise OctivApiError(f"{method} {path} failed: {e}")
+                except OSError as e:
+                    self.connection.close()
+                    self.connection = None
+                    raise OctivApiError(f"{method} {path} failed: {e}")
+
+        try:
+            return status, json.loads(raw) if raw else None
+        except ValueError:
+            raise OctivApiError(f"{method} {path} returned invalid JSON", status)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
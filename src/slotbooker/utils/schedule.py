@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+import re
+
+from .helpers import parse_yaml
+from .logging import LOG_DIR
+
+DEFAULT_ACCOUNT = "default"
+DEFAULT_SCHEDULE_CACHE = os.path.join(LOG_DIR, "schedule_cache.json")
+SCHEDULE_FILE = "classes.yaml"
+WEEKDAYS = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+NO_CLASS = "None"
+ENTRY_KEYS = {"time", "class", "wl"}
+TIME_FOLDER_PATTERN = re.compile(r"^([01]\d|2[0-3])([0-5]\d)$")
+TIME_PATTERN = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+
+
+class ScheduleError(Exception):
+    """Raised when schedule files are malformed; lists every problem found."""
+
+    def __init__(self, problems: list):
+        self.problems = problems
+        super().__init__(
+            "Invalid schedule:\n" + "\n".join(f"  {problem}" for problem in problems)
+        )
+
+
+def validate_schedule(document, path: str) -> list:
+    """
+    Check a parsed classes.yaml.
+
+    Args:
+        document: The parsed YAML document.
+        path (str): Path of the file, used in the messages.
+
+    Returns:
+        list[str]: Problems found, empty if the schedule is valid.
+    """
+    if not isinstance(document, dict):
+        return [f"{path}: expected a mapping with class_dict"]
+    problems = []
+    if not isinstance(document.get("book_class", True), bool):
+        problems.append(f"{path}: book_class must be true or false")
+    class_dict = document.get("class_dict")
+    if not isinstance(class_dict, dict) or not class_dict:
+        return problems + [f"{path}: class_dict must map weekdays to classes"]
+
+    for day, entries in class_dict.items():
+        where = f"{path}: class_dict.{day}"
+        if day not in WEEKDAYS:
+            problems.append(f"{where}: unknown weekday")
+        elif not isinstance(entries, list) or not entries:
+            problems.append(f"{where}: expected a list of time/class entries")
+        else:
+            for position, entry in enumerate(entries):
+                problems.extend(_validate_entry(entry, f"{where}[{position}]"))
+    return problems
+
+
+def _validate_entry(entry, where: str) -> list:
+    if not isinstance(entry, dict) or not {"time", "class"} <= entry.keys():
+        return [f"{where}: expected a mapping with time and class"]
+    problems = []
+    unknown = sorted(set(entry) - ENTRY_KEYS)
+    if unknown:
+        problems.append(f"{where}: unknown keys {unknown}")
+    time, class_name = entry["time"], entry["class"]
+    if not isinstance(class_name, str) or not class_name.strip():
+        problems.append(f"{where}: class must be a non-empty string")
+    # Unquoted 19:00 is parsed by YAML 1.1 as the integer 1140.
+    if not isinstance(time, str) or not (time == NO_CLASS or TIME_PATTERN.match(time)):
+        problems.append(f'{where}: time must be a quoted "HH:MM" or None')
+    if not isinstance(entry.get("wl", False), bool):
+        problems.append(f"{where}: wl must be true or false")
+    return problems
+
+
+class CompiledSchedule:
+    """
+    Validated schedules of all accounts, indexed by when they fire.
+
+    Attributes:
+        accounts (dict): (time folder, account) -> parsed classes.yaml; the
+            time folder of the single-account schedule is None.
+        index (dict): (fire time "HH:MM", weekday) -> {account: entries}, the
+            entries in priority order. Days without a class are left out.
+    """
+
+    def __init__(self, accounts: dict, default_fire_time: str = None):
+        self.accounts = accounts
+        self.index = {}
+        for (time_folder, account), document in accounts.items():
+            if not document.get("book_class", True):
+                continue
+            fire_time = (
+                f"{time_folder[:2]}:{time_folder[2:]}"
+                if time_folder
+                else default_fire_time
+            )
+            for day, entries in document["class_dict"].items():
+                entries = tuple(
+                    entry for entry in entries if entry["class"] != NO_CLASS
+                )
+                if entries:
+                    self.index.setdefault((fire_time, day), {})[account] = entries
+
+    def lookup(self, fire_time: str, weekday: str) -> dict:
+        """Accounts firing at `fire_time` ("HH:MM") for `weekday`, with their entries."""
+        return self.index.get((fire_time, weekday), {})
+
+    def fire_times(self) -> list:
+        """All (fire time, weekday) pairs that have bookings."""
+        return sorted(key for key in self.index if key[0] is not None)
+
+
+class ScheduleCompiler:
+    """
+    Compiles the classes.yaml files below a data directory into a `CompiledSchedule`.
+
+    The single-account schedule is `<data_dir>/classes.yaml`; time folders hold
+    one schedule per account, `<data_dir>/<HHMM>/<account>/classes.yaml`, firing
+    at HH:MM. Every file is validated when compiled. Parsed files are cached as
+    JSON and reused while their modification time and size, or else their
+    content hash, are unchanged.
+
+    Attributes:
+        data_dir (str): Directory holding the schedules.
+        cache_path (str): JSON cache of parsed files, None to disable caching.
+    """
+
+    def __init__(self, data_dir: str, cache_path: str = None):
+        self.data_dir = data_dir
+        self.cache_path = cache_path
+
+    @classmethod
+    def from_env(cls, data_dir: str) -> "ScheduleCompiler":
+        """Create a compiler caching to SCHEDULE_CACHE ("none" disables the cache)."""
+        cache_path = os.environ.get("SCHEDULE_CACHE", DEFAULT_SCHEDULE_CACHE)
+        return cls(data_dir, None if cache_path.lower() == "none" else cache_path)
+
+    def sources(self, time_folders: list = None, include_default: bool = True) -> dict:
+        """
+        Schedule files to compile.
+
+        Args:
+            time_folders (list): Time folders to include, all if None.
+            include_default (bool): Whether to include the single-account schedule.
+
+        Returns:
+            dict: (time folder, account) -> path.
+        """
+        sources = {}
+        default_path = os.path.join(self.data_dir, SCHEDULE_FILE)
+        if include_default and os.path.isfile(default_path):
+            sources[(None, DEFAULT_ACCOUNT)] = default_path
+        for time_folder in sorted(os.listdir(self.data_dir)):
+            time_dir = os.path.join(self.data_dir, time_folder)
+            if not TIME_FOLDER_PATTERN.match(time_folder) or not os.path.isdir(
+                time_dir
+            ):
+                continue
+            if time_folders is not None and time_folder not in time_folders:
+                continue
+            for account in sorted(os.listdir(time_dir)):
+                path = os.path.join(time_dir, account, SCHEDULE_FILE)
+                if os.path.isfile(path):
+                    sources[(time_folder, account)] = path
+        return sources
+
+    def compile(
+        self,
+        time_folders: list = None,
+        include_default: bool = True,
+        default_fire_time: str = None,
+    ) -> CompiledSchedule:
+        """
+        Validate and index the schedules.
+
+        Args:
+            time_folders (list): Time folders to compile, all if None.
+            include_default (bool): Whether to compile the single-account schedule.
+            default_fire_time (str): "HH:MM" the single-account schedule fires at.
+
+        Returns:
+            CompiledSchedule: The indexed schedules.
+
+        Raises:
+            ScheduleError: If any of the files is malformed.
+        """
+        import yaml
+
+        cache = self._load_cache()
+        accounts = {}
+        problems = []
+        changed = False
+        for key, path in self.sources(time_folders, include_default).items():
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            cached = cache.get(path)
+            if cached and (cached["mtime_ns"], cached["size"]) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                accounts[key] = cached["document"]
+                continue
+
+            with open(path, "rb") as file:
+                content = file.read()
+            digest = hashlib.sha256(content).hexdigest()
+            if cached and cached["sha256"] == digest:
+                document = cached["document"]
+            else:
+                try:
+                    document = parse_yaml(content)
+                except yaml.YAMLError as e:
+                    problems.append(f"{path}: {e}")
+                    continue
+                file_problems = validate_schedule(document, path)
+                if file_problems:
+                    problems.extend(file_problems)
+                    continue
+            cache[path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "document": document,
+            }
+            accounts[key] = document
+            changed = True
+
+        if problems:
+            raise ScheduleError(problems)
+        if changed:
+            self._save_cache(cache)
+        return CompiledSchedule(accounts, default_fire_time=default_fire_time)
+
+    def _load_cache(self) -> dict:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path) as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"! Could not read schedule cache: {e}")
+            return {}
+
+    def _save_cache(self, cache: dict) -> None:
+        if not self.cache_path:
+            return
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary_path = f"{self.cache_path}.tmp"
+            with open(temporary_path, "w") as file:
+                json.dump(cache, file)
+            os.replace(temporary_path, self.cache_path)
+        except OSError as e:
+            logging.warning(f"! Could not write schedule cache: {e}")
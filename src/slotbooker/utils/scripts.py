@@ -0,0 +1,246 @@
+"""JavaScript snippets executed in the browser through `SeleniumManager.execute_script`."""
+
+# Extracts all booking slots of the current day in a single round trip.
+#
+# Arguments:
+#   0: XPath of the bounding boxes (XPath.booking_section_head())
+#   1-4: XPath templates for label, time, enter and cancel button, "{i}" marks the slot index
+#   5: list of [class, time] pairs to locate; the scan stops once all have been found
+#
+# Returns a list of {index, class, time, enter, cancel} objects for the requested classes.
+SCRAPE_BOOKING_SLOTS = """
+const [boxesXPath, labelXPath, timeXPath, enterXPath, cancelXPath, wanted] = arguments;
+const first = (template, index) => document.evaluate(
+    template.replaceAll("{i}", index), document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+const text = (node) => (node.innerText || node.textContent || "").trim();
+
+const boxCount = document.evaluate(
+    `count(${boxesXPath})`, document, null, XPathResult.NUMBER_TYPE, null
+).numberValue;
+const wantedClasses = new Set(wanted.map(([name]) => name));
+const pending = new Set(wanted.map(([name, time]) => `${name}\\u0000${time}`));
+
+const slots = [];
+for (let index = 1; index <= boxCount && pending.size > 0; index++) {
+    const label = first(labelXPath, index);
+    if (!label || !wantedClasses.has(text(label))) {
+        continue;
+    }
+    const timeNode = first(timeXPath, index);
+    const slot = {
+        index: index,
+        class: text(label),
+        time: timeNode ? text(timeNode) : null,
+        enter: first(enterXPath, index) !== null,
+        cancel: first(cancelXPath, index) !== null,
+    };
+    slots.push(slot);
+    pending.delete(`${slot.class}\\u0000${slot.time}`);
+}
+return slots;
+"""
+
+# Reports for each passed element whether it is still attached to the document.
+#
+# Arguments:
+#   0: list of WebElements
+ELEMENTS_CONNECTED = "return arguments[0].map((element) => element.isConnected);"
+
+# Collects the page's local and session storage for the session cache.
+#
+# Returns {local_storage, session_storage} with plain string values.
+EXPORT_STORAGE = """
+return {
+    local_storage: Object.assign({}, window.localStorage),
+    session_storage: Object.assign({}, window.sessionStorage),
+};
+"""
+
+# Restores storage collected by EXPORT_STORAGE into the current origin.
+#
+# Arguments:
+#   0: local storage entries
+#   1: session storage entries
+RESTORE_STORAGE = """
+const [localEntries, sessionEntries] = arguments;
+for (const [key, value] of Object.entries(localEntries)) {
+    window.localStorage.setItem(key, value);
+}
+for (const [key, value] of Object.entries(sessionEntries)) {
+    window.sessionStorage.setItem(key, value);
+}
+"""
+
+# Requests a URL of the page's own origin with its cookies, so the server side
+# of the session is used while a booking holds until T0. Executed with
+# execute_async_script.
+#
+# Arguments:
+#   0: same-origin URL, see KEEP_ALIVE_URL
+#   1: timeout in milliseconds
+#   2: callback injected by WebDriver
+#
+# Returns the HTTP status, or 0 if the request failed or timed out.
+KEEP_ALIVE = """
+const [url, timeoutMs, done] = arguments;
+const controller = new AbortController();
+const timer = setTimeout(() => controller.abort(), timeoutMs);
+fetch(url, {credentials: "same-origin", cache: "no-store", signal: controller.signal})
+    .then((response) => done(response.status))
+    .catch(() => done(0))
+    .finally(() => clearTimeout(timer));
+"""
+
+# Resolves as soon as an element matched by any of several locators is in the
+# requested state, observing DOM mutations instead of polling. Locators are
+# checked in order on every mutation, so a locator that does not match (or is
+# invalid on this page) costs microseconds instead of a timeout. Executed with
+# execute_async_script.
+#
+# Arguments:
+#   0: list of [strategy, value] pairs, strategy "xpath" or "css selector"
+#   1: timeout in milliseconds
+#   2: required state, "present", "visible" or "clickable"
+#   3: callback injected by WebDriver
+#
+# Returns [index of the matching locator, element, lookup milliseconds of the
+# locators checked in the final round], or null once the timeout has passed.
+WAIT_FOR_ELEMENT = """
+const [locators, timeoutMs, state, done] = arguments;
+const lookup = (strategy, value) => {
+    if (strategy === "css selector") {
+        return document.querySelector(value);
+    }
+    return document.evaluate(
+        value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+};
+const ready = (node) => {
+    if (!node || state === "present") {
+        return Boolean(node);
+    }
+    const visible = node.getClientRects().length > 0
+        && window.getComputedStyle(node).visibility !== "hidden";
+    return visible && !(state === "clickable" && node.disabled);
+};
+const find = () => {
+    const timings = [];
+    for (let index = 0; index < locators.length; index++) {
+        const started = performance.now();
+        let node = null;
+        try {
+            node = lookup(...locators[index]);
+        } catch (error) {
+            node = null;
+        }
+        timings.push(performance.now() - started);
+        if (ready(node)) {
+            return [index, node, timings];
+        }
+    }
+    return null;
+};
+
+const found = find();
+if (found) {
+    done(found);
+    return;
+}
+let timer = null;
+const observer = new MutationObserver(() => {
+    const match = find();
+    if (match) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(match);
+    }
+});
+observer.observe(document, {
+    childList: true, subtree: true, attributes: true, characterData: true,
+});
+timer = setTimeout(() => {
+    observer.disconnect();
+    done(find());
+}, timeoutMs);
+"""
+
+# Reads the page-side outcome of a booking click in one round trip.
+#
+# Arguments:
+#   0: XPath of the error dialog title (XPath.error_window())
+#   1: XPath of the error dialog text (XPath.error_text_window())
+#   2: XPath of the button a booked slot shows, or null
+#
+# Returns {error: text of the error dialog or null, booked: bool}. The text is
+# an empty string while the dialog is rendered without it.
+BOOKING_OUTCOME = """
+const [errorXPath, errorTextXPath, bookedXPath] = arguments;
+const first = (xpath) => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+
+if (first(errorXPath)) {
+    const node = first(errorTextXPath);
+    return {error: node ? (node.innerText || node.textContent || "").trim() : "", booked: false};
+}
+return {error: null, booked: bookedXPath !== null && first(bookedXPath) !== null};
+"""
+
+# Serializes a sanitized copy of the current document for the DOM snapshot corpus.
+# Scripts, styles, media, and frames are dropped, only structural attributes are
+# kept, and input values are removed. Only texts inside the nodes matched by the
+# given XPaths are kept, with e-mail addresses masked; every other text, e.g.
+# member and attendee names, is replaced by "[text]". Element positions by tag
+# name stay the same, so XPathEnum paths still apply.
+#
+# Arguments:
+#   0: absolute XPaths of the nodes whose texts are kept
+#
+# Returns the document as an XHTML string.
+SNAPSHOT_DOM = """
+const [keptXPaths] = arguments;
+const KEEP_ATTRIBUTES = new Set(["class", "id", "type", "name", "disabled", "role"]);
+const EMAIL = /[\\w.+-]+@[\\w-]+(\\.[\\w-]+)+/g;
+const root = document.documentElement.cloneNode(true);
+
+root.querySelectorAll(
+    "script, style, noscript, iframe, svg, img, video, audio, canvas, link, meta"
+).forEach((node) => node.remove());
+for (const element of [root, ...root.querySelectorAll("*")]) {
+    for (const attribute of [...element.attributes]) {
+        if (!KEEP_ATTRIBUTES.has(attribute.name)) {
+            element.removeAttribute(attribute.name);
+        }
+    }
+}
+// The copy is detached, so the absolute paths are evaluated relative to its root.
+const kept = new Set();
+for (const xpath of keptXPaths) {
+    const matches = document.evaluate(
+        xpath.replace("/html", "."), root, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    for (let index = 0; index < matches.snapshotLength; index++) {
+        kept.add(matches.snapshotItem(index));
+    }
+}
+const isKept = (node) => {
+    for (let parent = node.parentNode; parent; parent = parent.parentNode) {
+        if (kept.has(parent)) {
+            return true;
+        }
+    }
+    return false;
+};
+const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+while (walker.nextNode()) {
+    const node = walker.currentNode;
+    if (!node.nodeValue.trim()) {
+        continue;
+    }
+    node.nodeValue = isKept(node) ? node.nodeValue.replace(EMAIL, "[email]") : "[text]";
+}
+return new XMLSerializer().serializeToString(root);
+"""
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from selenium.webdriver.common.by import By
+
+from .logging import LOG_DIR
+
+LEGACY_STRATEGY = "legacy"
+DEFAULT_SELECTOR_CACHE = os.path.join(LOG_DIR, "selector_cache.json")
+# Bookers of one run share the cache file; their saves merge one at a time.
+_save_lock = threading.Lock()
+
+
+class Selector(str):
+    """
+    An XPath of a logical page element, carrying alternative locators for it.
+
+    The string value is the legacy absolute XPath, so a `Selector` works
+    wherever an XPath is expected. `SeleniumManager.wait_for_element` races all
+    strategies instead: the absolute XPath first, CSS selectors and
+    attribute/text-anchored XPaths as fallbacks for when the layout changed.
+    The alternatives are unverified guesses, so they never take precedence over
+    an absolute XPath that still matches.
+
+    Attributes:
+        name (str): Key of the logical element, e.g. "weekday_button:Monday".
+        strategies (list[tuple]): (strategy name, By, locator), in order of preference.
+    """
+
+    def __new__(cls, xpath: str, name: str, strategies: list = ()):
+        selector = super().__new__(cls, xpath)
+        selector.name = name
+        selector.strategies = [(LEGACY_STRATEGY, By.XPATH, xpath), *strategies]
+        return selector
+
+
+class SelectorEngine:
+    """
+    Remembers which strategy found each logical element and how long lookups took.
+
+    The legacy XPath is always tried first. If an alternative strategy found
+    the element instead, it is tried right after the legacy XPath on later
+    lookups and is persisted as JSON, so the next run starts with the fallback
+    that matched before. Lookup times are accumulated per element and strategy. Saving merges
+    the changes of this engine into the file's current content, so concurrent
+    bookers do not overwrite each other's results.
+
+    Attributes:
+        cache_path (str): JSON file the winners and timings persist to, None to keep them in memory.
+        winners (dict): element name -> name of the strategy that found it last.
+        timings (dict): element name -> strategy name -> {"lookups", "total_ms"}.
+    """
+
+    def __init__(self, cache_path: str = None):
+        self.cache_path = cache_path
+        self.winners = {}
+        self.timings = {}
+        # Changes since the last save, merged into the file on `save`
+        self._changed_winners = {}
+        self._pending_timings = {}
+        if cache_path and os.path.exists(cache_path):
+            self.winners, self.timings = self._read()
+
+    @classmethod
+    def from_env(cls) -> "SelectorEngine":
+        """
+        Create an engine persisting to SELECTOR_CACHE ("none" disables persistence).
+
+        Returns:
+            SelectorEngine: The engine.
+        """
+        cache_path = os.environ.get("SELECTOR_CACHE", DEFAULT_SELECTOR_CACHE)
+        return cls(None if cache_path.lower() == "none" else cache_path)
+
+    def _read(self) -> tuple:
+        """Winners and timings stored in the cache file, empty if it is unreadable."""
+        try:
+            with open(self.cache_path) as file:
+                cache = json.load(file)
+            return cache.get("winners", {}), cache.get("timings", {})
+        except FileNotFoundError:
+            return {}, {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"! Could not read selector cache: {e}")
+            return {}, {}
+
+    def order(self, selector: Selector) -> list:
+        """Strategies of `selector`, the legacy XPath first and the last winning one second."""
+        winner = self.winners.get(selector.name)
+        return sorted(
+            selector.strategies,
+            key=lambda strategy: (
+                strategy[0] != LEGACY_STRATEGY,
+                strategy[0] != winner,
+            ),
+        )
+
+    def record(
+        self, selector: Selector, strategies: list, index: int, timings: list
+    ) -> None:
+        """
+        Store the outcome of a lookup.
+
+        Args:
+            selector (Selector): The looked up element.
+            strategies (list): The strategies in the order they were tried.
+            index (int): Index of the matching strategy, None if none matched.
+            timings (list): Lookup milliseconds of the strategies tried last.
+        """
+        for (strategy, _, _), milliseconds in zip(strategies, timings):
+            for all_timings in (self.timings, self._pending_timings):
+                _add_timing(all_timings, selector.name, strategy, 1, milliseconds)
+        if index is not None:
+            winner = strategies[index][0]
+            if self.winners.get(selector.name) != winner:
+                logging.info(f"Selector {selector.name} resolved by {winner}")
+                self.winners[selector.name] = winner
+                self._changed_winners[selector.name] = winner
+
+    def save(self) -> None:
+        """Merge the changes since the last save into the cache file."""
+        if not self.cache_path or not (self._changed_winners or self._pending_timings):
+            return
+        directory = os.path.dirname(self.cache_path) or "."
+        with _save_lock:
+            winners, timings = self._read()
+            winners.update(self._changed_winners)
+            for name, strategies in self._pending_timings.items():
+                for strategy, stats in strategies.items():
+                    _add_timing(
+                        timings, name, strategy, stats["lookups"], stats["total_ms"]
+                    )
+            try:
+                os.makedirs(directory, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w", dir=directory, suffix=".tmp", delete=False
+                ) as file:
+                    json.dump({"winners": winners, "timings": timings}, file)
+                os.replace(file.name, self.cache_path)
+            except OSError as e:
+                logging.warning(f"! Could not write selector cache: {e}")
+                return
+        self.winners, self.timings = winners, timings
+        self._changed_winners, self._pending_timings = {}, {}
+
+
+def _add_timing(
+    timings: dict, name: str, strategy: str, lookups: int, total_ms: float
+) -> None:
+    stats = timings.setdefault(name, {}).setdefault(
+        strategy, {"lookups": 0, "total_ms": 0.0}
+    )
+    stats["lookups"] += lookups
+    stats["total_ms"] += total_ms
@@ -1,13 +1,50 @@
+import logging
+import os
+import time
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    UnexpectedAlertPresentException,
+    WebDriverException,
+)
+from .scripts import WAIT_FOR_ELEMENT
+from .selector_engine import Selector, SelectorEngine
 from .webdriver_manager import WebDriverManager
 
+# Fallback polling starts fast and backs off up to the former WebDriverWait interval
+POLL_MIN_INTERVAL = 0.01
+POLL_MAX_INTERVAL = 0.25
+
+# Conditions the in-browser MutationObserver can evaluate, by required element state
+EVENT_CONDITIONS = {
+    ec.presence_of_element_located: "present",
+    ec.visibility_of_element_located: "visible",
+    ec.element_to_be_clickable: "clickable",
+}
+
 
 class SeleniumManager(WebDriverManager):
-    def __init__(self, chromedriver: str, env: str = "prd"):
-        super().__init__(chromedriver=chromedriver, env=env)
+    def __init__(
+        self,
+        chromedriver: str,
+        env: str = "prd",
+        browser_pool=None,
+        profile: str = None,
+    ):
+        super().__init__(
+            chromedriver=chromedriver,
+            env=env,
+            browser_pool=browser_pool,
+            profile=profile,
+        )
+        self.wait_mode = os.environ.get("WAIT_MODE", "event").lower()
+        self._script_timeout = None
+        self.selector_engine = SelectorEngine.from_env()
 
     def wait_for_element(
         self,
@@ -17,21 +54,140 @@ class SeleniumManager(WebDriverManager):
         condition=ec.presence_of_element_located,
         error_message: str = "",
     ):
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                condition((by, xpath)), error_message
-            )
-        except (TimeoutException, NoSuchElementException):
+        """
+        Wait until an element satisfies `condition`.
+
+        XPath lookups with a presence, visibility, or clickability condition
+        resolve on the DOM mutation that satisfies them, through a
+        MutationObserver injected with `execute_async_script`. Other conditions,
+        and pages where the script fails (e.g. because of a navigation), fall
+        back to adaptive polling for the remaining time. `error_message` is kept
+        for compatibility with the former WebDriverWait-based signature.
+
+        A `Selector` races all of its strategies within the same wait, in the
+        order of the `selector_engine`, which also records the outcome.
+
+        Returns:
+            WebElement: The element, or None if the timeout passed.
+        """
+        if isinstance(xpath, Selector) and by == By.XPATH:
+            strategies = self.selector_engine.order(xpath)
+        else:
+            strategies = [(None, by, xpath)]
+        index, element, timings = self._wait_for_any(strategies, timeout, condition)
+        if isinstance(xpath, Selector) and by == By.XPATH:
+            self.selector_engine.record(xpath, strategies, index, timings)
+        return element
+
+    def _wait_for_any(self, strategies: list, timeout: float, condition) -> tuple:
+        """
+        Wait until any of several locators matches an element satisfying `condition`.
+
+        Args:
+            strategies (list): (strategy name, By, locator) tuples, checked in order.
+            timeout (float): Seconds to wait.
+            condition: Expected condition factory taking a locator.
+
+        Returns:
+            tuple: (index of the matching strategy, element, lookup milliseconds
+                of the strategies checked last); index and element are None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        state = EVENT_CONDITIONS.get(condition)
+        if self.wait_mode == "event" and state is not None:
+            try:
+                match = self._wait_for_mutation(strategies, timeout, state)
+                return tuple(match) if match else (None, None, [])
+            except WebDriverException:
+                pass
+        timings = []
+
+        def race(driver):
+            timings.clear()
+            for index, (_, by, locator) in enumerate(strategies):
+                started = time.perf_counter()
+                try:
+                    element = condition((by, locator))(driver)
+                except (
+                    InvalidSelectorException,
+                    NoSuchElementException,
+                    StaleElementReferenceException,
+                ):
+                    element = None
+                timings.append((time.perf_counter() - started) * 1000)
+                if element:
+                    return index, element
             return None
 
+        index, element = self._poll(race, deadline) or (None, None)
+        return index, element, list(timings)
+
+    def _wait_for_mutation(self, strategies: list, timeout: float, state: str):
+        # The script timeout must outlast the in-page timeout; only raise it once.
+        if self._script_timeout is None or self._script_timeout < timeout + 1:
+            self._script_timeout = timeout + 1
+            self.driver.set_script_timeout(self._script_timeout)
+        return self.driver.execute_async_script(
+            WAIT_FOR_ELEMENT,
+            [[by, locator] for _, by, locator in strategies],
+            int(timeout * 1000),
+            state,
+        )
+
+    def _poll(self, condition, deadline: float):
+        """Evaluate `condition` with exponentially growing intervals until `deadline`."""
+        interval = POLL_MIN_INTERVAL
+        while True:
+            try:
+                result = condition(self.driver)
+                if result:
+                    return result
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, POLL_MAX_INTERVAL)
+
     def wait_for_element_alert(self, timeout: int = 3):
-        try:
-            return WebDriverWait(self.driver, timeout=timeout).until(
-                ec.alert_is_present(), "Timed out waiting for alert to appear."
-            )
-        except (TimeoutException, NoSuchElementException):
+        """Wait for a JavaScript alert; alerts are invisible to the DOM, so this polls."""
+        return self._poll(ec.alert_is_present(), time.monotonic() + timeout)
+
+    def wait_for_first(self, conditions: dict, timeout: float = 3) -> tuple:
+        """
+        Race several conditions and return the first one that is satisfied.
+
+        An alert that opens after the condition named "alert" was checked makes the
+        following conditions fail with `UnexpectedAlertPresentException`; it then
+        wins the race as the "alert" outcome instead of being lost.
+
+        Args:
+            conditions (dict): name -> callable taking the driver, checked in order.
+            timeout (float): Seconds to wait for any condition.
+
+        Returns:
+            tuple: (name, result) of the first satisfied condition, or (None, None).
+        """
+
+        def race(driver):
+            for name, condition in conditions.items():
+                try:
+                    result = condition(driver)
+                except UnexpectedAlertPresentException:
+                    if "alert" not in conditions:
+                        raise
+                    try:
+                        return "alert", driver.switch_to.alert
+                    except NoAlertPresentException:
+                        logging.warning("! Alert closed before it could be read")
+                        return None
+                if result:
+                    return name, result
             return None
 
+        return self._poll(race, time.monotonic() + timeout) or (None, None)
+
     def input_text(self, xpath: str, text: str) -> None:
         element = self.wait_for_element(
             xpath=xpath, condition=ec.element_to_be_clickable
@@ -46,20 +202,39 @@ class SeleniumManager(WebDriverManager):
         if element:
             element.click()
 
+    def close_driver(self) -> None:
+        """Closes the WebDriver and persists what the selector engine learned."""
+        self.selector_engine.save()
+        super().close_driver()
+
     def find_element(self, by=By.XPATH, xpath=None):
         return self.driver.find_element(by, xpath)
 
     def find_elements(self, by=By.XPATH, xpath=None):
         return self.driver.find_elements(by, xpath)
 
-    def execute_script(self, script, element):
-        self.driver.execute_script(script, element)
+    def execute_script(self, script, *args, element=None):
+        if element is not None:
+            args = (element, *args)
+        return self.driver.execute_script(script, *args)
+
+    def execute_async_script(self, script, *args):
+        return self.driver.execute_async_script(script, *args)
+
+    def get_cookies(self) -> list:
+        return self.driver.get_cookies()
+
+    def add_cookie(self, cookie: dict) -> None:
+        self.driver.add_cookie(cookie)
+
+    def delete_all_cookies(self) -> None:
+        self.driver.delete_all_cookies()
 
     def get_page(self, base_url) -> None:
         self.driver.get(base_url)
 
-    def switch_to_alert(self) -> None:
-        self.driver.switch_to.alert
+    def switch_to_alert(self):
+        return self.driver.switch_to.alert
 
     def get_element_text(self, by=By.XPATH, xpath: str = None) -> str:
         element = self.find_element(by, xpath)
@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+
+DEFAULT_SESSION_TTL = 12 * 60 * 60
+SALT_SIZE = 16
+KDF_ITERATIONS = 200_000
+
+
+class SessionCache:
+    """
+    Encrypted on-disk cache of authenticated browser sessions, one file per account.
+
+    Each entry is a Fernet token prefixed with a random salt. The key is derived
+    from the account's username and password, so a cached session can only be
+    restored with the same credentials. Fernet embeds the creation time in the
+    token, which is used for expiry.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache files.
+        ttl (int): Seconds after which a cached session is considered expired.
+    """
+
+    def __init__(self, cache_dir: str, ttl: int = DEFAULT_SESSION_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> "SessionCache":
+        """
+        Create a cache from SESSION_CACHE_DIR and SESSION_CACHE_TTL.
+
+        Returns:
+            SessionCache: The cache, or None if SESSION_CACHE_DIR is not set.
+        """
+        cache_dir = os.environ.get("SESSION_CACHE_DIR")
+        if not cache_dir:
+            return None
+        return cls(
+            cache_dir=cache_dir,
+            ttl=int(os.environ.get("SESSION_CACHE_TTL", DEFAULT_SESSION_TTL)),
+        )
+
+    def _path(self, username: str) -> str:
+        digest = hashlib.sha256(username.encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{digest}.session")
+
+    @staticmethod
+    def _fernet(username: str, password: str, salt: bytes):
+        # cryptography is only loaded by runs that use the cache
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS
+        )
+        key = kdf.derive(f"{username}\0{password}".encode())
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def save(self, username: str, password: str, state: dict) -> None:
+        """
+        Encrypt and store the session state of an account.
+
+        Args:
+            username (str): Account username.
+            password (str): Account password, used to derive the key.
+            state (dict): JSON-serializable session state.
+        """
+        salt = os.urandom(SALT_SIZE)
+        token = self._fernet(username, password, salt).encrypt(
+            json.dumps(state).encode()
+        )
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        path = self._path(username)
+        temp_path = f"{path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(salt + token)
+        os.replace(temp_path, path)
+
+    def load(self, username: str, password: str) -> dict:
+        """
+        Load the session state of an account.
+
+        Args:
+            username (str): Account username.
+            password (str): Account password, used to derive the key.
+
+        Returns:
+            dict: The session state, or None if missing, expired, or unreadable.
+        """
+        try:
+            with open(self._path(username), "rb") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+
+        from cryptography.fernet import InvalidToken
+
+        salt, token = content[:SALT_SIZE], content[SALT_SIZE:]
+        try:
+            payload = self._fernet(username, password, salt).decrypt(
+                token, ttl=self.ttl
+            )
+        except InvalidToken:
+            logging.info("Cached session expired or invalid")
+            self.clear(username)
+            return None
+        return json.loads(payload)
+
+    def clear(self, username: str) -> None:
+        """Remove the cached session of an account."""
+        try:
+            os.remove(self._path(username))
+        except FileNotFoundError:
+            pass
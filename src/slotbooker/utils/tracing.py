@@ -0,0 +1,184 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+TRACE_FORMATS = ("json", "chrome", "none")
+
+# Name of the innermost running span of the current thread, e.g. "click"
+current_phase = contextvars.ContextVar("current_phase", default=None)
+
+
+class Span:
+    """
+    A timed phase of a booking run.
+
+    Attributes:
+        span_id (int): Index of the span within its trace.
+        name (str): Name of the phase, e.g. "login".
+        parent_id (int): Id of the enclosing span, None for top-level spans.
+        thread_id (int): Thread the span ran on.
+        start_ns (int): `time.monotonic_ns()` at the start.
+        end_ns (int): `time.monotonic_ns()` at the end, None while running.
+        attributes (dict): Additional details, e.g. the class of a booking attempt.
+    """
+
+    def __init__(
+        self,
+        span_id: int,
+        name: str,
+        parent_id: int,
+        attributes: dict,
+    ):
+        self.span_id = span_id
+        self.name = name
+        self.parent_id = parent_id
+        self.thread_id = threading.get_ident()
+        self.attributes = attributes
+        self.start_ns = time.monotonic_ns()
+        self.end_ns = None
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.monotonic_ns()) - self.start_ns
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.duration_ns / 1e6:.3f}ms)"
+
+
+class Tracer:
+    """
+    Records nested spans on the monotonic clock.
+
+    Spans opened while another span of the same thread is running become its
+    children. The trace is written as compact JSON, or in the Chrome trace-event
+    format that chrome://tracing and Perfetto load.
+
+    Attributes:
+        spans (list[Span]): All spans in start order.
+        attributes (dict): Details of the whole run, e.g. the account.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.attributes = {}
+        self.origin_ns = time.monotonic_ns()
+        self.origin_wall = datetime.now().astimezone()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Time the enclosed block as a span.
+
+        Args:
+            name (str): Name of the phase.
+            **attributes: Details stored with the span.
+
+        Yields:
+            Span: The running span; attributes may be added while it runs.
+        """
+        stack = self._stack()
+        with self._lock:
+            span = Span(
+                span_id=len(self.spans),
+                name=name,
+                parent_id=stack[-1].span_id if stack else None,
+                attributes=attributes,
+            )
+            self.spans.append(span)
+        stack.append(span)
+        token = current_phase.set(name)
+        try:
+            yield span
+        finally:
+            span.end_ns = time.monotonic_ns()
+            current_phase.reset(token)
+            stack.pop()
+
+    def to_dict(self) -> dict:
+        """Compact trace: span offsets and durations in microseconds since the origin."""
+        return {
+            "origin": self.origin_wall.isoformat(),
+            "attributes": self.attributes,
+            "spans": [
+                {
+                    "id": span.span_id,
+                    "name": span.name,
+                    "parent": span.parent_id,
+                    "start_us": (span.start_ns - self.origin_ns) // 1000,
+                    "duration_us": span.duration_ns // 1000,
+                    **({"attributes": span.attributes} if span.attributes else {}),
+                }
+                for span in self.spans
+            ],
+        }
+
+    def to_chrome_trace(self) -> dict:
+        """Trace in the Chrome trace-event format, one complete ("X") event per span."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": (span.start_ns - self.origin_ns) / 1000,
+                    "dur": span.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": span.attributes,
+                }
+                for span in self.spans
+            ],
+            "otherData": {"origin": self.origin_wall.isoformat(), **self.attributes},
+        }
+
+    def write(self, path: str, format: str = "json") -> str:
+        """
+        Write the trace to disk.
+
+        Args:
+            path (str): Target file.
+            format (str): "json" for the compact trace, "chrome" for trace events.
+
+        Returns:
+            str: The written path.
+        """
+        trace = self.to_chrome_trace() if format == "chrome" else self.to_dict()
+        with open(path, "w") as file:
+            json.dump(trace, file, separators=(",", ":"))
+        return path
+
+
+def get_trace_format() -> str:
+    """Trace format from TRACE_FORMAT: "json" (default), "chrome", or "none"."""
+    trace_format = os.environ.get("TRACE_FORMAT", "json").lower()
+    if trace_format not in TRACE_FORMATS:
+        logging.warning(f"! Unknown TRACE_FORMAT {trace_format}, writing json")
+        return "json"
+    return trace_format
+
+
+def traced(name: str):
+    """Record calls of a method as a span of the instance's `tracer`."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.tracer.span(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
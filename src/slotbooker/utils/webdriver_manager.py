@@ -7,17 +7,31 @@ from selenium.common.exceptions import (
 )
 import logging
 
+from .browser_profile import apply_profile_options, apply_profile_session, get_profile
+
 
 class WebDriverManager:
-    def __init__(self, chromedriver: str, env: str = "prd"):
+    def __init__(
+        self,
+        chromedriver: str,
+        env: str = "prd",
+        browser_pool=None,
+        profile: str = None,
+    ):
         """Initializes the WebDriverManager with the given ChromeDriver path and environment.
 
         Args:
             chromedriver (str): location of the ChromeDriver.
             env (str): environment ("prd" for production or "dev" for development).
+            browser_pool (BrowserPool): shared browser to lease a context from instead
+                of launching a dedicated Chrome.
+            profile (str): browser profile ("default" or "lean"), defaults to the
+                BROWSER_PROFILE environment variable.
         """
         self.chromedriver = chromedriver
         self.env = env
+        self.browser_pool = browser_pool
+        self.profile = get_profile(profile)
         self.driver = self.set_driver()  # Initialize the driver
 
     def set_driver(self) -> webdriver.Chrome:
@@ -26,6 +40,10 @@ class WebDriverManager:
         Returns:
             webdriver.Chrome: Driver Object Selenium can work on.
         """
+        if self.browser_pool is not None:
+            self.driver = self.browser_pool.lease()
+            return self.driver
+
         service = Service(executable_path=self.chromedriver)
         options = webdriver.ChromeOptions()
         options.add_argument("--disable-gpu")
@@ -34,6 +52,7 @@ class WebDriverManager:
         options.add_experimental_option("detach", True)
         if self.env != "dev":
             options.add_argument("--headless")  # needs to be set to run in docker image
+        apply_profile_options(options, self.profile)
 
         try:
             self.driver = webdriver.Chrome(service=service, options=options)
@@ -45,12 +64,16 @@ class WebDriverManager:
             raise ValueError(
                 "Failed to create a WebDriver session. Please check the ChromeDriver path and ensure it is compatible with your Chrome version."
             )
+        apply_profile_session(self.driver, self.profile)
         return self.driver
 
     def close_driver(self) -> None:
         """Closes the WebDriver."""
         if self.driver:
-            self.driver.quit()
+            if self.browser_pool is not None:
+                self.browser_pool.release(self.driver)
+            else:
+                self.driver.quit()
             self.driver = None
 
     def get_driver(self):
@@ -1,5 +1,9 @@
 from enum import Enum
 
+from selenium.webdriver.common.by import By
+
+from .selector_engine import Selector
+
 
 class XPathEnum(str, Enum):
     """Enum for commonly used XPath strings."""
@@ -34,8 +38,22 @@ class XPathEnum(str, Enum):
     CANCEL_SLOT = f"{BOOKING_SECTION}[{{slot}}]/div/div[2]/div[3]/button"
 
 
+# Both login steps submit through the only button of the login form
+_LOGIN_BUTTON_STRATEGIES = [
+    ("css", By.CSS_SELECTOR, "form button[type='submit']"),
+    ("anchored", By.XPATH, "(//form//button)[last()]"),
+]
+
+
 class XPath:
-    """Helper class with static methods for XPath generation."""
+    """
+    Helper class with static methods for XPath generation.
+
+    Single interactive elements are returned as `Selector`s: their value is the
+    absolute XPath, and they carry CSS and anchored alternatives that
+    `SeleniumManager.wait_for_element` falls back to when it does not match. Slot paths stay absolute
+    XPaths, as their positions are what identifies the slot.
+    """
 
     @staticmethod
     def booking_section_head() -> str:
@@ -43,25 +61,55 @@ class XPath:
 
     # Username XPaths
     @staticmethod
-    def login_username_input() -> str:
-        return XPathEnum.LOGIN_USERNAME_INPUT.value
+    def login_username_input() -> Selector:
+        return Selector(
+            XPathEnum.LOGIN_USERNAME_INPUT.value,
+            name="login_username_input",
+            strategies=[
+                (
+                    "css",
+                    By.CSS_SELECTOR,
+                    "form input[type='email'], form input[name='username'], form input[name='email']",
+                ),
+                (
+                    "anchored",
+                    By.XPATH,
+                    "(//form//input[not(@type) or @type='text' or @type='email'])[1]",
+                ),
+            ],
+        )
 
     @staticmethod
-    def login_username_button() -> str:
-        return XPathEnum.LOGIN_USERNAME_BUTTON.value
+    def login_username_button() -> Selector:
+        return Selector(
+            XPathEnum.LOGIN_USERNAME_BUTTON.value,
+            name="login_username_button",
+            strategies=_LOGIN_BUTTON_STRATEGIES,
+        )
 
     # Password XPaths
     @staticmethod
-    def login_password_input() -> str:
-        return XPathEnum.LOGIN_PASSWORD_INPUT.value
+    def login_password_input() -> Selector:
+        return Selector(
+            XPathEnum.LOGIN_PASSWORD_INPUT.value,
+            name="login_password_input",
+            strategies=[
+                ("css", By.CSS_SELECTOR, "form input[type='password']"),
+                ("anchored", By.XPATH, "//form//input[@type='password']"),
+            ],
+        )
 
     @staticmethod
     def login_password_check() -> str:
         return XPathEnum.LOGIN_PASSWORD_CHECK.value
 
     @staticmethod
-    def login_password_button() -> str:
-        return XPathEnum.LOGIN_PASSWORD_BUTTON.value
+    def login_password_button() -> Selector:
+        return Selector(
+            XPathEnum.LOGIN_PASSWORD_BUTTON.value,
+            name="login_password_button",
+            strategies=_LOGIN_BUTTON_STRATEGIES,
+        )
 
     @staticmethod
     def login_error_window() -> str:
@@ -69,11 +117,22 @@ class XPath:
 
     # Switch week button
     @staticmethod
-    def switch_week_button() -> str:
-        return XPathEnum.SWITCH_WEEK_BUTTON.value
+    def switch_week_button() -> Selector:
+        # The icon following the last day of the day bar
+        return Selector(
+            XPathEnum.SWITCH_WEEK_BUTTON.value,
+            name="switch_week_button",
+            strategies=[
+                (
+                    "anchored",
+                    By.XPATH,
+                    "(//div[p[normalize-space()='Sunday']]/following::i)[1]",
+                ),
+            ],
+        )
 
     @staticmethod
-    def weekday_button(day_to_book: int) -> str:
+    def weekday_button(day_to_book: str) -> Selector:
         day_indices = {
             "Monday": 2,
             "Tuesday": 3,
@@ -83,8 +142,14 @@ class XPath:
             "Saturday": 7,
             "Sunday": 8,
         }
-        return XPathEnum.GET_DAY_BUTTON.value.format(
-            day_index=day_indices.get(day_to_book, 0)
+        return Selector(
+            XPathEnum.GET_DAY_BUTTON.value.format(
+                day_index=day_indices.get(day_to_book, 0)
+            ),
+            name=f"weekday_button:{day_to_book}",
+            strategies=[
+                ("anchored", By.XPATH, f"//div/p[normalize-space()='{day_to_book}']"),
+            ],
         )
 
     @staticmethod
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from slotbooker.utils.selenium_manager import SeleniumManager
+
+
+@pytest.fixture(scope="session")
+def selenium_manager():
+    """A headless Chrome session; benchmarks are skipped where Chrome is unavailable."""
+    try:
+        manager = SeleniumManager(chromedriver=os.environ.get("CHROMEDRIVER"))
+    except ValueError:
+        pytest.skip("Chrome/ChromeDriver not available")
+    yield manager
+    manager.close_driver()
+
+
+@pytest.fixture
+def serve_page(tmp_path):
+    """Write an HTML document to disk and return its file:// URL."""
+
+    def _serve(html: str, name: str = "page.html") -> str:
+        path = tmp_path / name
+        path.write_text(html, encoding="utf-8")
+        return path.as_uri()
+
+    return _serve
+
+
+@pytest.fixture
+def serve_site():
+    """
+    Serve pages over local HTTP and return the base URL.
+
+    Takes a dict of path -> (content type, body, delay in seconds); a delay
+    simulates slow assets such as images and web fonts.
+    """
+    servers = []
+
+    def _serve(routes: dict) -> str:
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):  # noqa: N802
+                if self.path not in routes:
+                    self.send_error(404)
+                    return
+                content_type, body, delay = routes[self.path]
+                time.sleep(delay)
+                body = body.encode() if isinstance(body, str) else body
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield _serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def measure(function, repeat: int = 5) -> float:
+    """Best-of-`repeat` wall time of `function()` in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def process_tree_rss(pid: int) -> int:
+    """Resident memory in bytes of a process and all its descendants (Linux only)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file:
+                stat = file.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, the fields after it are fixed.
+        fields = stat[stat.rindex(")") + 2 :].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/statm") as file:
+                total += int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            continue
+    return total
@@ -0,0 +1,74 @@
+"""Static pages reproducing the Octiv DOM structure addressed by `XPathEnum`."""
+
+from html import escape
+
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+def _slot_box(time: str, class_name: str, booked: bool) -> str:
+    # div[1] holds the bookable variant, div[2] the cancellable one of a booked slot.
+    enter = (
+        f"<div><div><p>{escape(time)}</p></div>"
+        f"<div><p>{escape(class_name)}</p></div>"
+        "<div><button class='enter'>Book</button></div></div>"
+    )
+    cancel = (
+        f"<div><div><p>{escape(time)}</p></div>"
+        f"<div><p>{escape(class_name)}</p></div>"
+        "<div><button class='cancel'>Cancel</button></div></div>"
+    )
+    return f"<div><div>{enter}{cancel if booked else ''}</div></div>"
+
+
+def render_schedule_page(slots: list, booked: tuple = (), head: str = "") -> str:
+    """
+    Render a schedule page with the given booking slots.
+
+    Args:
+        slots (list): (time, class) tuples in display order.
+        booked (tuple): Indices into `slots` that are already booked.
+        head (str): Extra markup for the document head, e.g. stylesheets.
+
+    Returns:
+        str: The HTML document.
+    """
+    day_bar = (
+        "<div><div><p>Week</p></div></div>"
+        + "".join(f"<div><div><p>{day}</p></div></div>" for day in WEEKDAYS)
+        + "<div><div><div><i>&gt;</i></div></div></div>"
+    )
+    boxes = "".join(
+        _slot_box(time, class_name, index in booked)
+        for index, (time, class_name) in enumerate(slots)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'>{head}</head><body>"
+        "<div>"
+        "<div></div>"  # div[1] navigation
+        "<div></div>"  # div[2] error section, empty unless an error is shown
+        "<div></div>"  # div[3] login section
+        "<div></div><div></div>"
+        "<div><div>"  # div[6]/div booking section
+        "<div><p>Schedule</p></div><div></div>"
+        f"<div>{day_bar}</div>"
+        f"{boxes}"
+        "</div></div>"
+        "</div></body></html>"
+    )
+
+
+def busy_day(slot_count: int = 24) -> list:
+    """A day with many slots, the requested classes appearing late in the list."""
+    classes = ["CrossFit", "Weightlifting", "Mobility", "Open Gym", "Remote Coaching"]
+    return [
+        (f"{6 + index // 2:02d}:{30 * (index % 2):02d}", classes[index % len(classes)])
+        for index in range(slot_count)
+    ]
@@ -0,0 +1,74 @@
+import os
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from slotbooker.utils.browser_pool import BrowserPool
+from slotbooker.utils.selenium_manager import SeleniumManager
+from tests.benchmarks.conftest import process_tree_rss
+
+ACCOUNTS = 3
+
+
+def driver_rss(manager: SeleniumManager) -> int:
+    return process_tree_rss(manager.driver.service.process.pid)
+
+
+def start_dedicated(count: int) -> (list, list):
+    managers, startup = [], []
+    for _ in range(count):
+        start = time.perf_counter()
+        managers.append(SeleniumManager(chromedriver=os.environ.get("CHROMEDRIVER")))
+        startup.append(time.perf_counter() - start)
+    return managers, startup
+
+
+def test_shared_browser_is_cheaper_per_additional_account():
+    try:
+        dedicated, dedicated_startup = start_dedicated(ACCOUNTS)
+    except ValueError:
+        pytest.skip("Chrome/ChromeDriver not available")
+    dedicated_rss = sum(driver_rss(manager) for manager in dedicated)
+    for manager in dedicated:
+        manager.close_driver()
+
+    pool = BrowserPool(chromedriver=os.environ.get("CHROMEDRIVER"))
+    try:
+        start = time.perf_counter()
+        pool.start()
+        pool_start = time.perf_counter() - start
+        browser_rss = process_tree_rss(pool.host_driver.service.process.pid)
+
+        pooled, pooled_startup = [], []
+        for _ in range(ACCOUNTS):
+            start = time.perf_counter()
+            pooled.append(
+                SeleniumManager(
+                    chromedriver=os.environ.get("CHROMEDRIVER"), browser_pool=pool
+                )
+            )
+            pooled_startup.append(time.perf_counter() - start)
+
+        # The shared Chrome hangs off the host session, leases only add a driver.
+        pooled_rss = process_tree_rss(pool.host_driver.service.process.pid) + sum(
+            driver_rss(manager) for manager in pooled
+        )
+        for manager in pooled:
+            manager.close_driver()
+    except WebDriverException as e:
+        pytest.skip(f"Shared browser contexts not supported: {e}")
+    finally:
+        pool.close()
+
+    dedicated_per_account = dedicated_rss / ACCOUNTS
+    pooled_per_additional = (pooled_rss - browser_rss) / ACCOUNTS
+    print(
+        f"\ndedicated: {sum(dedicated_startup) / ACCOUNTS:.2f}s and "
+        f"{dedicated_per_account / 2**20:.0f}MB per account\n"
+        f"shared: {pool_start:.2f}s and {browser_rss / 2**20:.0f}MB browser start, "
+        f"{sum(pooled_startup) / ACCOUNTS:.2f}s and "
+        f"{pooled_per_additional / 2**20:.0f}MB per account"
+    )
+    assert sum(pooled_startup) < sum(dedicated_startup)
+    assert pooled_rss < dedicated_rss
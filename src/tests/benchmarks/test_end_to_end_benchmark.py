@@ -0,0 +1,79 @@
+import os
+from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
+
+from slotbooker.slotbooker import Booker, BookingState
+from slotbooker.utils.alerts import ErrorTypes
+from tests.benchmarks.fixture_site import busy_day
+from tests.standin.site_server import WEEKDAYS, StandInSiteServer, StandInSiteState
+
+LATENCY = 0.05
+CLASS_DICT = {
+    day: [
+        {"time": "07:30", "class": "Open Gym", "wl": True},
+        {"time": "08:00", "class": "Remote Coaching"},
+    ]
+    for day in WEEKDAYS
+}
+SCENARIOS = {
+    "booked": ({}, BookingState.SUCCESS),
+    "waiting_list": ({"full_classes": {"Open Gym"}}, BookingState.SUCCESS),
+    "error": ({"booking_error": ErrorTypes.MaxBookings.value}, BookingState.FAIL),
+}
+
+
+def phase_timings(booker: Booker) -> dict:
+    """Total milliseconds per span name of the booker's trace."""
+    timings = defaultdict(float)
+    for span in booker.tracer.to_dict()["spans"]:
+        timings[span["name"]] += span["duration_us"] / 1000
+    return dict(timings)
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_booking_end_to_end(scenario):
+    failures, expected_state = SCENARIOS[scenario]
+    state = StandInSiteState(
+        users={"charly": "secret"}, slots=busy_day(24), latency=LATENCY
+    )
+    for name, value in failures.items():
+        setattr(state, name, value)
+
+    environment = {
+        "CLOCK_SYNC": "false",
+        "DAYS_BEFORE_BOOKABLE": "7",
+        "EXECUTION_BOOKING_TIME": "00:00:00.000000",
+        "TRACE_FORMAT": "none",
+    }
+    with StandInSiteServer(state) as site, patch.dict("os.environ", environment):
+        os.environ.pop("SESSION_CACHE_DIR", None)
+        try:
+            booker = Booker(
+                base_url=f"{site.url}/login",
+                chromedriver=os.environ.get("CHROMEDRIVER"),
+            )
+        except ValueError:
+            pytest.skip("Chrome/ChromeDriver not available")
+        try:
+            assert booker.login("charly", "secret") is True
+            booker.switch_day()
+            booker.book_class(class_dict=CLASS_DICT)
+        finally:
+            booker.close_driver()
+
+    timings = phase_timings(booker)
+    print(f"\n{scenario}: {booker.booking_successful.name}")
+    for name, milliseconds in timings.items():
+        print(f"  {name:<14} {milliseconds:9.1f}ms")
+
+    assert booker.booking_successful == expected_state
+    if scenario == "booked":
+        assert [entry[3] for entry in state.bookings] == ["Open Gym"]
+        # The booked slot resolves the outcome race long before its timeout.
+        assert timings["outcome"] < 1000
+    if scenario == "waiting_list":
+        # Joining the waiting list of a full class moves on to the next class.
+        assert [entry[3] for entry in state.waiting_list] == ["Open Gym"]
+        assert [entry[3] for entry in state.bookings] == ["Remote Coaching"]
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Size of the synthetic daemon log; the benchmark only runs when it is set
+SIZE_MB = int(os.environ.get("LOG_REPORT_BENCHMARK_MB", "0"))
+# Peak RSS allowed for rendering, independent of the log size
+MEMORY_BUDGET_MB = 64
+
+LINES = [
+    "2026-10-15 18:58:00,120 INFO Pre-warming 3 account(s) for 1900\n",
+    "2026-10-15 18:59:59,870 INFO Holding session of <charly> until T0\n",
+    "2026-10-15 19:00:00,004 SUCCESS Booked successfully Open Gym & Sauna\n",
+    "2026-10-15 19:00:00,210 WARNING ! Class Remote Coaching is full\n",
+    "    at continuation line of a traceback\n",
+]
+
+
+def write_synthetic_log(path, size_mb: int) -> None:
+    block = "".join(LINES) * 2000
+    with open(path, "w") as file:
+        for _ in range(size_mb * 1024 * 1024 // len(block) + 1):
+            file.write(block)
+
+
+@pytest.mark.skipif(not SIZE_MB, reason="set LOG_REPORT_BENCHMARK_MB, e.g. 300")
+def test_report_of_a_large_log_renders_in_bounded_memory(tmp_path):
+    log_file = tmp_path / "log.txt"
+    write_synthetic_log(log_file, SIZE_MB)
+
+    # A fresh interpreter, so the peak RSS belongs to the rendering alone.
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, resource, sys, time\n"
+            "from slotbooker.utils.logging import write_html_report\n"
+            "start = time.perf_counter()\n"
+            "write_html_report(sys.argv[1], sys.argv[2])\n"
+            "print(json.dumps([time.perf_counter() - start,"
+            " resource.getrusage(resource.RUSAGE_SELF).ru_maxrss]))",
+            str(log_file),
+            str(tmp_path / "log.html"),
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, max_rss_kb = json.loads(result.stdout)
+
+    size = os.path.getsize(log_file) / 1024 / 1024
+    print(
+        f"\n{size:.0f}MB log: {elapsed:.1f}s ({size / elapsed:.0f}MB/s), "
+        f"peak RSS {max_rss_kb / 1024:.0f}MB"
+    )
+    assert max_rss_kb / 1024 < MEMORY_BUDGET_MB
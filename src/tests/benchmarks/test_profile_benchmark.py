@@ -0,0 +1,65 @@
+import os
+import time
+
+import pytest
+
+from slotbooker.utils.selenium_manager import SeleniumManager
+from slotbooker.utils.xpaths import XPath
+from tests.benchmarks.conftest import process_tree_rss
+from tests.benchmarks.fixture_site import busy_day, render_schedule_page
+
+ASSET_DELAY = 0.3
+ASSETS = 6
+LOADS = 3
+
+
+def site_routes() -> dict:
+    head = "<link rel='stylesheet' href='/style.css'>" + "".join(
+        f"<img src='/image-{index}.png'>" for index in range(ASSETS)
+    )
+    routes = {
+        "/": ("text/html", render_schedule_page(busy_day(24), head=head), 0),
+        "/style.css": (
+            "text/css",
+            "@font-face { font-family: Brand; src: url('/brand.woff2'); }"
+            "body { font-family: Brand; }",
+            0,
+        ),
+        "/brand.woff2": ("font/woff2", b"\0" * 1024, ASSET_DELAY),
+    }
+    for index in range(ASSETS):
+        routes[f"/image-{index}.png"] = ("image/png", b"\0" * 4096, ASSET_DELAY)
+    return routes
+
+
+def page_ready_time(manager: SeleniumManager, url: str) -> float:
+    timings = []
+    for _ in range(LOADS):
+        manager.get_page("about:blank")
+        start = time.perf_counter()
+        manager.get_page(url)
+        manager.wait_for_element(xpath=XPath.booking_section_head(), timeout=10)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_lean_profile_is_ready_sooner_than_default(serve_site):
+    url = serve_site(site_routes())
+    results = {}
+    for profile in ["default", "lean"]:
+        try:
+            manager = SeleniumManager(
+                chromedriver=os.environ.get("CHROMEDRIVER"), profile=profile
+            )
+        except ValueError:
+            pytest.skip("Chrome/ChromeDriver not available")
+        try:
+            ready = page_ready_time(manager, url)
+            rss = process_tree_rss(manager.driver.service.process.pid)
+        finally:
+            manager.close_driver()
+        results[profile] = ready
+        print(f"\n{profile}: page ready {ready * 1000:.0f}ms, {rss / 2**20:.0f}MB")
+
+    # The default profile waits for the slow images and font, lean skips them.
+    assert results["lean"] < ASSET_DELAY <= results["default"]
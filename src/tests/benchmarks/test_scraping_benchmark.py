@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+import pytest
+
+from slotbooker.slotbooker import Booker
+from slotbooker.utils.xpaths import XPath
+from tests.benchmarks.conftest import measure
+from tests.benchmarks.fixture_site import busy_day, render_schedule_page
+
+CLASS_DICT = [
+    {"time": "07:30", "class": "Open Gym"},
+    {"time": "08:00", "class": "Remote Coaching"},
+]
+
+
+@pytest.fixture
+def booker(selenium_manager):
+    with patch("slotbooker.slotbooker.SeleniumManager", return_value=selenium_manager):
+        booker = Booker(base_url="file://")
+    booker.class_dict = CLASS_DICT
+    return booker
+
+
+@pytest.mark.parametrize("slot_count", [8, 24, 48])
+def test_script_scraping_beats_per_element_round_trips(
+    booker, selenium_manager, serve_page, slot_count
+):
+    selenium_manager.get_page(serve_page(render_schedule_page(busy_day(slot_count))))
+    class_entry_list = [entry["class"] for entry in CLASS_DICT]
+
+    def legacy():
+        boxes = selenium_manager.find_elements(xpath=XPath.booking_section_head())
+        return booker._generate_bounding_box_class_dict(class_entry_list, boxes)
+
+    def script():
+        return booker._generate_booking_slots_dict_script()
+
+    legacy_slots, script_slots = legacy(), script()
+    for entry in CLASS_DICT:
+        assert (
+            script_slots[entry["class"]][entry["time"]]["xpath"]
+            == legacy_slots[entry["class"]][entry["time"]]["xpath"]
+        )
+
+    legacy_time, script_time = measure(legacy), measure(script)
+    print(
+        f"\n{slot_count} slots: legacy {legacy_time * 1000:.1f}ms, "
+        f"script {script_time * 1000:.1f}ms ({legacy_time / script_time:.1f}x)"
+    )
+    assert script_time < legacy_time
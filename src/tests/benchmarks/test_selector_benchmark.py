@@ -0,0 +1,51 @@
+import time
+
+from selenium.webdriver.support import expected_conditions as ec
+
+from slotbooker.utils.selector_engine import SelectorEngine
+from slotbooker.utils.xpaths import XPath
+
+from .fixture_site import render_schedule_page
+
+SLOTS = [("18:00", "Open Gym"), ("19:00", "Remote Coaching")]
+
+
+def shifted(page: str) -> str:
+    # A wrapper around the app breaks every absolute XPath below /html/body/div.
+    return page.replace("<body>", "<body><div id='banner'></div><main>", 1).replace(
+        "</body>", "</main></body>", 1
+    )
+
+
+def lookup(manager, selector, timeout: float = 2) -> float:
+    start = time.perf_counter()
+    element = manager.wait_for_element(
+        xpath=selector, timeout=timeout, condition=ec.element_to_be_clickable
+    )
+    elapsed = time.perf_counter() - start
+    assert element is not None
+    return elapsed
+
+
+def test_selectors_survive_layout_shifts(selenium_manager, serve_page):
+    selenium_manager.selector_engine = SelectorEngine()
+    selectors = [XPath.weekday_button("Wednesday"), XPath.switch_week_button()]
+
+    selenium_manager.get_page(serve_page(shifted(render_schedule_page(SLOTS))))
+    for selector in selectors:
+        # The legacy XPath alone no longer matches and would wait for the timeout.
+        assert selenium_manager.find_elements(xpath=str(selector)) == []
+        elapsed = lookup(selenium_manager, selector)
+        print(f"\n{selector.name}: {elapsed * 1000:.1f}ms on the shifted layout")
+        assert elapsed < 0.5
+
+    selenium_manager.get_page(serve_page(render_schedule_page(SLOTS)))
+    for selector in selectors:
+        lookup(selenium_manager, selector)
+
+    for name, strategies in selenium_manager.selector_engine.timings.items():
+        for strategy, stats in strategies.items():
+            print(
+                f"{name} {strategy}: {stats['total_ms'] / stats['lookups']:.3f}ms "
+                f"per lookup over {stats['lookups']}"
+            )
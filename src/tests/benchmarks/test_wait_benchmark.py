@@ -0,0 +1,65 @@
+import random
+import statistics
+import time
+
+from selenium.webdriver.support import expected_conditions as ec
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Inserts a clickable button after the given delay in milliseconds.
+INSERT_LATER = """
+setTimeout(() => {
+    const button = document.createElement("button");
+    button.id = `target-${arguments[1]}`;
+    button.textContent = "Book";
+    document.body.appendChild(button);
+}, arguments[0]);
+"""
+CALLS = 10
+
+
+def legacy_wait(manager, xpath: str):
+    # The former implementation: WebDriverWait with its default 0.5s poll interval.
+    return WebDriverWait(manager.driver, 5).until(
+        ec.element_to_be_clickable(("xpath", xpath))
+    )
+
+
+def latencies(manager, serve_page, wait, delays: list) -> list:
+    manager.get_page(serve_page("<!DOCTYPE html><html><body></body></html>"))
+    overheads = []
+    for index, delay in enumerate(delays):
+        manager.execute_script(INSERT_LATER, delay, index)
+        start = time.perf_counter()
+        assert wait(manager, f"//button[@id='target-{index}']") is not None
+        overheads.append(time.perf_counter() - start - delay / 1000)
+    return overheads
+
+
+def test_event_waits_resolve_closer_to_the_dom_change(selenium_manager, serve_page):
+    rng = random.Random(7)
+    delays = [rng.randint(50, 800) for _ in range(CALLS)]
+
+    def event_wait(manager, xpath):
+        return manager.wait_for_element(
+            xpath=xpath, condition=ec.element_to_be_clickable
+        )
+
+    def poll_wait(manager, xpath):
+        manager.wait_mode = "poll"
+        try:
+            return event_wait(manager, xpath)
+        finally:
+            manager.wait_mode = "event"
+
+    results = {
+        "legacy": latencies(selenium_manager, serve_page, legacy_wait, delays),
+        "poll": latencies(selenium_manager, serve_page, poll_wait, delays),
+        "event": latencies(selenium_manager, serve_page, event_wait, delays),
+    }
+    for name, overheads in results.items():
+        print(
+            f"\n{name}: median {statistics.median(overheads) * 1000:.1f}ms, "
+            f"max {max(overheads) * 1000:.1f}ms after the element appeared"
+        )
+    assert statistics.median(results["event"]) < statistics.median(results["legacy"])
+    assert statistics.median(results["poll"]) < statistics.median(results["legacy"])
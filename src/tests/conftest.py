@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_logs(tmp_path, monkeypatch):
+    """Keep the logs, traces, and schedule cache of a test out of the working tree."""
+    monkeypatch.setattr("slotbooker.utils.logging.LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setenv("TRACE_FORMAT", "none")
+    monkeypatch.setenv("SCHEDULE_CACHE", str(tmp_path / "schedule_cache.json"))
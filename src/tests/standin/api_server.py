@@ -0,0 +1,137 @@
+"""
+Local stand-in for the Octiv HTTP API used by the `HttpBooker` backend.
+
+It serves the assumed paths of `EndpointEnum`, so tests against it check the
+client logic but cannot catch an endpoint that differs on the real API.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from slotbooker.utils.octiv_api import EndpointEnum
+
+
+class StandInApiState:
+    """
+    Mutable state of the stand-in API.
+
+    Attributes:
+        users (dict): username -> password of valid accounts.
+        class_dates (list): Classes offered for every date.
+        full_classes (set): Ids of classes that are fully booked.
+        booking_error (str): Error message returned for every booking, if set.
+        bookings (list): (user id, class date id) of accepted bookings.
+        waiting_list (list): (user id, class date id) of waiting list entries.
+        connections (int): Number of TCP connections accepted so far.
+    """
+
+    def __init__(self, users: dict, class_dates: list):
+        self.users = users
+        self.class_dates = class_dates
+        self.full_classes = set()
+        self.booking_error = None
+        self.bookings = []
+        self.waiting_list = []
+        self.connections = 0
+
+
+class StandInApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StandInApiState = None
+
+    def setup(self):
+        super().setup()
+        self.state.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict = None) -> None:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _user_id(self):
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        return token.removeprefix("token-") if token.startswith("token-") else None
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        payload = self._read_json()
+
+        if path == EndpointEnum.LOGIN.value:
+            username = payload.get("username")
+            if self.state.users.get(username) != payload.get("password"):
+                return self._send_json(
+                    401, {"message": "The user credentials were incorrect."}
+                )
+            return self._send_json(
+                200, {"accessToken": f"token-{username}", "userId": username}
+            )
+
+        user_id = self._user_id()
+        if user_id is None:
+            return self._send_json(401, {"message": "Unauthenticated."})
+
+        class_date_id = payload.get("classDateId")
+        if path == EndpointEnum.CLASS_BOOKINGS.value:
+            if self.state.booking_error:
+                return self._send_json(422, {"message": self.state.booking_error})
+            if class_date_id in self.state.full_classes:
+                return self._send_json(409, {"message": "Class is fully booked."})
+            self.state.bookings.append((user_id, class_date_id))
+            return self._send_json(201, {"id": len(self.state.bookings)})
+
+        if path == EndpointEnum.WAITING_LIST.value:
+            self.state.waiting_list.append((user_id, class_date_id))
+            return self._send_json(201, {})
+
+        self._send_json(404, {"message": "Not found."})
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path != EndpointEnum.CLASS_DATES.value:
+            return self._send_json(404, {"message": "Not found."})
+        if self._user_id() is None:
+            return self._send_json(401, {"message": "Unauthenticated."})
+
+        date = parse_qs(parts.query).get("date", [""])[0]
+        self._send_json(
+            200,
+            {
+                "data": [
+                    dict(class_date, date=date) for class_date in self.state.class_dates
+                ]
+            },
+        )
+
+
+class StandInApiServer:
+    """Runs the stand-in API on a free local port in a background thread."""
+
+    def __init__(self, state: StandInApiState):
+        handler = type("Handler", (StandInApiHandler,), {"state": state})
+        self.state = state
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "StandInApiServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
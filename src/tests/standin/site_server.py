@@ -0,0 +1,352 @@
+"""Local stand-in for the Octiv web app driven by the Selenium `Booker`.
+
+The page is a small single-page app reproducing the DOM structure addressed by
+`XPathEnum`: the two-step login form, the week and day buttons, the booking
+section with its bounding boxes and enter/cancel buttons, the "class full"
+confirm alert, and the error dialog. All data goes through a JSON API whose
+latency and failure modes are configurable through `StandInSiteState`.
+"""
+
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from slotbooker.utils.alerts import AlertTypes
+
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+APP_SCRIPT = """
+const WEEKDAYS = %(weekdays)s;
+const FULL_MESSAGE = %(full_message)s;
+const CANCEL_MESSAGE = %(cancel_message)s;
+const state = {step: 1, username: "", token: null, offset: 0, week: null, day: null};
+const byId = (id) => document.getElementById(id);
+const esc = (text) => String(text).replace(/[&<>"']/g, (c) => `&#${c.charCodeAt(0)};`);
+
+async function api(method, path, body) {
+    const response = await fetch(path, {
+        method: method,
+        headers: {"Content-Type": "application/json", "Authorization": `Bearer ${state.token}`},
+        body: body === undefined ? undefined : JSON.stringify(body),
+    });
+    return {status: response.status, body: await response.json()};
+}
+
+function showError(title, text) {
+    byId("errors").innerHTML = "<div><div><div><div><div><div></div>"
+        + `<div><p>${esc(title)}</p><p>${esc(text)}</p></div>`
+        + "</div></div></div></div></div>";
+}
+
+function renderLogin() {
+    if (state.token) {
+        byId("login").innerHTML = "";
+        return;
+    }
+    const password = state.step === 1 ? "" : '<div><input name="password" type="password"></div>'
+        + '<div><div><div><div><div><i class="remember">&#10003;</i></div></div></div></div></div>';
+    byId("login").innerHTML = "<div><div><div><div><div><div><form>"
+        + `<div><input name="username" value="${esc(state.username)}"></div>${password}`
+        + `<button type="button">${state.step === 1 ? "Next" : "Login"}</button>`
+        + "</form></div></div></div></div></div></div>";
+    byId("login").querySelector("button").addEventListener("click", submitLogin);
+}
+
+async function submitLogin() {
+    const form = byId("login").querySelector("form");
+    state.username = form.username.value;
+    if (state.step === 1) {
+        state.step = 2;
+        renderLogin();
+        return;
+    }
+    const {status, body} = await api(
+        "POST", "/api/login", {username: state.username, password: form.password.value}
+    );
+    if (status !== 200) {
+        showError("Fehler", body.message);
+        return;
+    }
+    byId("errors").innerHTML = "";
+    state.token = body.token;
+    renderLogin();
+    await loadWeek(0);
+}
+
+async function loadWeek(offset) {
+    // The day bar disappears while the week loads, like a loading skeleton.
+    state.offset = offset;
+    state.week = null;
+    renderSchedule();
+    const {body} = await api("GET", `/api/week?offset=${offset}`);
+    state.week = body;
+    state.day = body.today || body.dates[0];
+    renderSchedule();
+}
+
+function variant(slot, button) {
+    return `<div><div><p>${esc(slot.time)}</p></div><div><p>${esc(slot.class)}</p></div>`
+        + `<div>${button}</div></div>`;
+}
+
+function slotBox(slot, index) {
+    const enter = variant(slot, `<button class="enter" data-index="${index}">Book</button>`);
+    const cancel = slot.booked
+        ? variant(slot, `<button class="cancel" data-index="${index}">Cancel</button>`)
+        : "";
+    return `<div><div>${enter}${cancel}</div></div>`;
+}
+
+function renderSchedule() {
+    if (!state.token) {
+        byId("schedule").innerHTML = "";
+        return;
+    }
+    let dayBar = "";
+    let boxes = "";
+    if (state.week) {
+        dayBar = `<div><div><p>Week ${state.offset}</p></div></div>`
+            + state.week.dates.map(
+                (date, index) => `<div><div><p data-date="${date}">${WEEKDAYS[index]}</p></div></div>`
+            ).join("")
+            + '<div><div><div><i class="next-week">&gt;</i></div></div></div>';
+        boxes = state.week.days[state.day].map(slotBox).join("");
+    }
+    byId("schedule").innerHTML = `<div><p>Schedule</p></div><div></div><div>${dayBar}</div>${boxes}`;
+}
+
+async function book(index) {
+    byId("errors").innerHTML = "";
+    const request = {date: state.day, index: index};
+    const {status, body} = await api("POST", "/api/bookings", request);
+    if (status === 201) {
+        state.week.days[state.day][index].booked = true;
+        renderSchedule();
+    } else if (status === 409) {
+        if (confirm(FULL_MESSAGE)) {
+            await api("POST", "/api/waiting-list", request);
+        }
+    } else {
+        showError("Fehler", body.message);
+    }
+}
+
+async function cancel(index) {
+    if (!confirm(CANCEL_MESSAGE)) {
+        return;
+    }
+    await api("DELETE", "/api/bookings", {date: state.day, index: index});
+    state.week.days[state.day][index].booked = false;
+    renderSchedule();
+}
+
+byId("schedule").addEventListener("click", (event) => {
+    const target = event.target;
+    if (target.matches("p[data-date]")) {
+        state.day = target.dataset.date;
+        renderSchedule();
+    } else if (target.matches("i.next-week")) {
+        loadWeek(state.offset + 1);
+    } else if (target.matches("button.enter")) {
+        book(Number(target.dataset.index));
+    } else if (target.matches("button.cancel")) {
+        cancel(Number(target.dataset.index));
+    }
+});
+renderLogin();
+"""
+
+APP_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Octiv stand-in</title></head>
+<body><div>
+<div></div>
+<div id="errors"></div>
+<div id="login"></div>
+<div></div>
+<div></div>
+<div><div id="schedule"></div></div>
+</div>
+<script>%s</script>
+</body></html>
+"""
+
+
+class StandInSiteState:
+    """
+    Mutable state of the stand-in site.
+
+    Attributes:
+        users (dict): username -> password of valid accounts.
+        slots (list): (time, class) tuples offered on every day, in display order.
+        latency (float): Seconds every API request is delayed.
+        full_classes (set): Names of classes that are fully booked.
+        booking_error (str): Error dialog text shown for every booking, if set.
+        bookings (list): (username, date, time, class) of accepted bookings.
+        waiting_list (list): (username, date, time, class) of waiting list entries.
+        requests (int): Number of API requests served so far.
+    """
+
+    def __init__(self, users: dict, slots: list, latency: float = 0.0):
+        self.users = users
+        self.slots = slots
+        self.latency = latency
+        self.full_classes = set()
+        self.booking_error = None
+        self.bookings = []
+        self.waiting_list = []
+        self.requests = 0
+
+    def week(self, username: str, offset: int) -> dict:
+        """Dates and slots of the week `offset` weeks from the current one."""
+        today = date.today()
+        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=offset)
+        dates = [(monday + timedelta(days=index)).isoformat() for index in range(7)]
+        booked = {
+            (day, time) for user, day, time, _ in self.bookings if user == username
+        }
+        return {
+            "dates": dates,
+            "today": today.isoformat() if today.isoformat() in dates else None,
+            "days": {
+                day: [
+                    {"time": time, "class": name, "booked": (day, time) in booked}
+                    for time, name in self.slots
+                ]
+                for day in dates
+            },
+        }
+
+
+class StandInSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StandInSiteState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _username(self):
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        return token.removeprefix("token-") if token.startswith("token-") else None
+
+    def _api(self) -> bool:
+        """Account and delay API requests, True for paths below /api/."""
+        if not self.path.startswith("/api/"):
+            return False
+        self.state.requests += 1
+        time.sleep(self.state.latency)
+        return True
+
+    def do_GET(self):  # noqa: N802
+        parts = urlsplit(self.path)
+        if not self._api():
+            if parts.path == "/favicon.ico":
+                return self._send(404, b"", "text/plain")
+            page = APP_PAGE % (
+                APP_SCRIPT
+                % {
+                    "weekdays": json.dumps(WEEKDAYS),
+                    "full_message": json.dumps(AlertTypes.ClassFullGerman.value),
+                    "cancel_message": json.dumps(AlertTypes.CancelBooking.value),
+                }
+            )
+            return self._send(200, page.encode(), "text/html; charset=utf-8")
+
+        username = self._username()
+        if parts.path != "/api/week":
+            return self._send_json(404, {"message": "Not found."})
+        if username is None:
+            return self._send_json(401, {"message": "Unauthenticated."})
+        offset = int(parse_qs(parts.query).get("offset", ["0"])[0])
+        self._send_json(200, self.state.week(username, offset))
+
+    def do_POST(self):  # noqa: N802
+        self._api()
+        path = urlsplit(self.path).path
+        payload = self._read_json()
+
+        if path == "/api/login":
+            username = payload.get("username")
+            if self.state.users.get(username) != payload.get("password"):
+                return self._send_json(
+                    401, {"message": AlertTypes.LoginCredentials.value}
+                )
+            return self._send_json(200, {"token": f"token-{username}"})
+
+        username = self._username()
+        if username is None:
+            return self._send_json(401, {"message": "Unauthenticated."})
+        time_slot, class_name = self.state.slots[payload["index"]]
+        entry = (username, payload["date"], time_slot, class_name)
+
+        if path == "/api/bookings":
+            if self.state.booking_error:
+                return self._send_json(422, {"message": self.state.booking_error})
+            if class_name in self.state.full_classes:
+                return self._send_json(409, {"message": AlertTypes.ClassFull.value})
+            self.state.bookings.append(entry)
+            return self._send_json(201, {})
+
+        if path == "/api/waiting-list":
+            self.state.waiting_list.append(entry)
+            return self._send_json(201, {})
+
+        self._send_json(404, {"message": "Not found."})
+
+    def do_DELETE(self):  # noqa: N802
+        self._api()
+        payload = self._read_json()
+        username = self._username()
+        if urlsplit(self.path).path != "/api/bookings" or username is None:
+            return self._send_json(404, {"message": "Not found."})
+        time_slot, class_name = self.state.slots[payload["index"]]
+        entry = (username, payload["date"], time_slot, class_name)
+        if entry in self.state.bookings:
+            self.state.bookings.remove(entry)
+        self._send_json(200, {})
+
+
+class StandInSiteServer:
+    """Runs the stand-in site on a free local port in a background thread."""
+
+    def __init__(self, state: StandInSiteState):
+        handler = type("Handler", (StandInSiteHandler,), {"state": state})
+        self.state = state
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "StandInSiteServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,141 @@
+"""Local SMTP stand-in recording the messages the `MailHandler` sends.
+
+Speaks the subset of SMTP that `smtplib` uses without TLS: EHLO/HELO, AUTH
+PLAIN, MAIL, RCPT, DATA, RSET, NOOP and QUIT. Connections can be dropped from
+the test to exercise reconnects.
+"""
+
+import base64
+import socketserver
+import threading
+from email import message_from_bytes, policy
+
+
+class StandInSmtpState:
+    """
+    Mutable state of the stand-in server.
+
+    Attributes:
+        users (dict): user -> password of valid logins.
+        connections (int): Number of connections accepted so far.
+        logins (int): Number of successful logins.
+        messages (list): (sender, recipients, EmailMessage) of every accepted message.
+        failures (int): Number of upcoming messages rejected with a transient error.
+    """
+
+    def __init__(self, users: dict):
+        self.users = users
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.failures = 0
+        self.open_sockets = []
+        self.lock = threading.Lock()
+
+
+class StandInSmtpHandler(socketserver.StreamRequestHandler):
+    state: StandInSmtpState = None
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        with self.state.lock:
+            self.state.connections += 1
+            self.state.open_sockets.append(self.request)
+        self.sender, self.recipients, self.authenticated = None, [], False
+        self.reply("220 stand-in ESMTP")
+        for raw_line in self.rfile:
+            command, _, argument = raw_line.decode().rstrip("\r\n").partition(" ")
+            if command.upper() == "QUIT":
+                self.reply("221 bye")
+                break
+            handler = getattr(self, f"smtp_{command.upper()}", None)
+            if handler is None:
+                self.reply("502 not implemented")
+            else:
+                handler(argument)
+
+    def smtp_EHLO(self, argument: str) -> None:  # noqa: N802
+        self.reply("250-stand-in")
+        self.reply("250 AUTH PLAIN")
+
+    def smtp_HELO(self, argument: str) -> None:  # noqa: N802
+        self.reply("250 stand-in")
+
+    def smtp_AUTH(self, argument: str) -> None:  # noqa: N802
+        _, _, credentials = argument.partition(" ")
+        _, user, password = base64.b64decode(credentials).decode().split("\0")
+        if self.state.users.get(user) != password:
+            self.reply("535 authentication failed")
+            return
+        self.authenticated = True
+        with self.state.lock:
+            self.state.logins += 1
+        self.reply("235 authenticated")
+
+    def smtp_MAIL(self, argument: str) -> None:  # noqa: N802
+        if not self.authenticated:
+            self.reply("530 authentication required")
+            return
+        self.sender, self.recipients = argument.split(":", 1)[1].strip("<> "), []
+        self.reply("250 ok")
+
+    def smtp_RCPT(self, argument: str) -> None:  # noqa: N802
+        self.recipients.append(argument.split(":", 1)[1].strip("<> "))
+        self.reply("250 ok")
+
+    def smtp_DATA(self, argument: str) -> None:  # noqa: N802
+        self.reply("354 end data with <CR><LF>.<CR><LF>")
+        data = b""
+        for line in self.rfile:
+            if line == b".\r\n":
+                break
+            data += line[1:] if line.startswith(b"..") else line
+        message = message_from_bytes(data, policy=policy.default)
+        with self.state.lock:
+            if self.state.failures > 0:
+                self.state.failures -= 1
+                self.reply("451 try again later")
+                return
+            self.state.messages.append((self.sender, self.recipients, message))
+        self.reply("250 queued")
+
+    def smtp_RSET(self, argument: str) -> None:  # noqa: N802
+        self.reply("250 ok")
+
+    smtp_NOOP = smtp_RSET  # noqa: N815
+
+
+class StandInSmtpServer:
+    """Runs the stand-in SMTP server on a free local port in a background thread."""
+
+    def __init__(self, state: StandInSmtpState):
+        handler = type("Handler", (StandInSmtpHandler,), {"state": state})
+        self.state = state
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def drop_connections(self) -> None:
+        """Close every open client connection, like an idle timeout of the server."""
+        with self.state.lock:
+            sockets, self.state.open_sockets = self.state.open_sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "StandInSmtpServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.drop_connections()
+        self.server.shutdown()
+        self.server.server_close()
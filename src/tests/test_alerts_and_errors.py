@@ -0,0 +1,111 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import (
+    NoAlertPresentException,
+    UnexpectedAlertPresentException,
+)
+
+from slotbooker.utils.alerts import AlertErrorHandler, AlertTypes, ErrorTypes
+from slotbooker.utils.selenium_manager import SeleniumManager
+from slotbooker.utils.xpaths import XPath
+
+
+def no_alert(_):
+    raise NoAlertPresentException()
+
+
+@pytest.fixture
+def manager():
+    with patch("slotbooker.utils.webdriver_manager.webdriver.Chrome"):
+        manager = SeleniumManager(chromedriver=None)
+    # Every MagicMock has its own class, so the property only affects this driver.
+    type(manager.driver.switch_to).alert = property(no_alert)
+    return manager
+
+
+def page_outcomes(manager, outcomes: list) -> None:
+    """Let the booking outcome script return `outcomes`, one per round."""
+    manager.driver.execute_script.side_effect = outcomes + [outcomes[-1]] * 100
+
+
+def test_booked_slot_resolves_immediately(manager):
+    page_outcomes(
+        manager,
+        [{"error": None, "booked": False}, {"error": None, "booked": True}],
+    )
+
+    start = time.monotonic()
+    result = AlertErrorHandler.check_booking_alert(
+        manager, waiting_list=None, booked_xpath=XPath.cancel_slot(slot=4)
+    )
+
+    assert result is None
+    assert time.monotonic() - start < 0.5
+    assert manager.driver.execute_script.call_args.args[-1] == XPath.cancel_slot(slot=4)
+
+
+def test_error_dialog_is_classified_once_its_text_renders(manager):
+    page_outcomes(
+        manager,
+        [
+            {"error": "", "booked": False},
+            {"error": ErrorTypes.MaxBookings.value, "booked": False},
+        ],
+    )
+
+    start = time.monotonic()
+    result = AlertErrorHandler.check_booking_alert(manager, waiting_list=None)
+
+    assert result is ErrorTypes.MaxBookings
+    assert time.monotonic() - start < 0.5
+
+
+def test_unknown_error_dialog():
+    assert AlertErrorHandler.evaluate_error("Oops") is ErrorTypes.NotIdentifyError
+
+
+def test_waiting_list_alert_wins_the_race(manager):
+    alert = MagicMock()
+    alert.text = AlertTypes.ClassFullGerman.value
+    type(manager.driver.switch_to).alert = property(lambda _: alert)
+
+    result = AlertErrorHandler.check_booking_alert(manager, waiting_list=True)
+
+    assert result
+    alert.accept.assert_called_once()
+    manager.driver.execute_script.assert_not_called()
+
+
+def test_alert_opening_mid_race_is_accepted(manager):
+    alert = MagicMock()
+    alert.text = AlertTypes.ClassFullGerman.value
+    alert_checks = iter([NoAlertPresentException(), alert])
+
+    def switch_to_alert(_):
+        result = next(alert_checks)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    # The alert opens after its check, so the page script runs into it.
+    type(manager.driver.switch_to).alert = property(switch_to_alert)
+    manager.driver.execute_script.side_effect = UnexpectedAlertPresentException()
+
+    result = AlertErrorHandler.check_booking_alert(manager, waiting_list=True)
+
+    assert result
+    alert.accept.assert_called_once()
+
+
+def test_no_signal_counts_as_booked_after_timeout(manager):
+    page_outcomes(manager, [{"error": None, "booked": False}])
+
+    start = time.monotonic()
+    result = AlertErrorHandler.check_booking_alert(
+        manager, waiting_list=None, timeout=0.2
+    )
+
+    assert result is None
+    assert 0.2 <= time.monotonic() - start < 0.5
@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+
+from slotbooker.utils.browser_pool import BrowserPool
+from slotbooker.utils.selenium_manager import SeleniumManager
+
+
+def make_driver(session_id):
+    driver = MagicMock()
+    driver.session_id = session_id
+    driver.capabilities = {"goog:chromeOptions": {"debuggerAddress": "127.0.0.1:9222"}}
+    driver.execute_cdp_cmd.side_effect = lambda cmd, params: {
+        "Target.createBrowserContext": {"browserContextId": f"ctx-{session_id}"},
+        "Target.createTarget": {"targetId": f"target-{session_id}"},
+    }.get(cmd, {})
+    return driver
+
+
+@patch("slotbooker.utils.browser_pool.Service")
+@patch("slotbooker.utils.browser_pool.webdriver.Chrome")
+def test_browser_is_launched_once_and_contexts_are_isolated(mock_chrome, _):
+    host, first, second = make_driver("host"), make_driver("a"), make_driver("b")
+    mock_chrome.side_effect = [host, first, second]
+    pool = BrowserPool()
+
+    assert pool.lease() is first
+    assert pool.lease() is second
+
+    assert mock_chrome.call_count == 3
+    attach_options = mock_chrome.call_args_list[1].kwargs["options"]
+    assert attach_options.debugger_address == "127.0.0.1:9222"
+    first.execute_cdp_cmd.assert_any_call(
+        "Target.createTarget", {"url": "about:blank", "browserContextId": "ctx-a"}
+    )
+    first.switch_to.window.assert_called_once_with("target-a")
+    second.switch_to.window.assert_called_once_with("target-b")
+
+
+@patch("slotbooker.utils.browser_pool.Service")
+@patch("slotbooker.utils.browser_pool.webdriver.Chrome")
+def test_release_disposes_context_and_keeps_browser(mock_chrome, _):
+    host, leased = make_driver("host"), make_driver("a")
+    mock_chrome.side_effect = [host, leased]
+    pool = BrowserPool()
+    pool.lease()
+
+    pool.release(leased)
+
+    leased.execute_cdp_cmd.assert_has_calls(
+        [
+            call("Target.closeTarget", {"targetId": "target-a"}),
+            call("Target.disposeBrowserContext", {"browserContextId": "ctx-a"}),
+        ]
+    )
+    leased.quit.assert_called_once()
+    host.quit.assert_not_called()
+    assert pool.leases == {}
+
+    pool.close()
+    host.quit.assert_called_once()
+
+
+def test_selenium_manager_leases_from_pool():
+    pool = MagicMock()
+
+    manager = SeleniumManager(chromedriver=None, browser_pool=pool)
+    driver = manager.driver
+    manager.close_driver()
+
+    pool.lease.assert_called_once()
+    pool.release.assert_called_once_with(driver)
+    assert manager.driver is None
+
+
+@patch("slotbooker.utils.browser_pool.Service")
+@patch("slotbooker.utils.browser_pool.webdriver.Chrome")
+def test_failed_lease_disposes_its_context_and_session(mock_chrome, _):
+    host, leased = make_driver("host"), make_driver("a")
+    mock_chrome.side_effect = [host, leased]
+
+    def execute_cdp_cmd(cmd, params):
+        if cmd == "Target.createTarget":
+            raise WebDriverException("target crashed")
+        return {"browserContextId": "ctx-a"}
+
+    leased.execute_cdp_cmd.side_effect = execute_cdp_cmd
+    pool = BrowserPool()
+
+    with pytest.raises(WebDriverException):
+        pool.lease()
+
+    leased.execute_cdp_cmd.assert_called_with(
+        "Target.disposeBrowserContext", {"browserContextId": "ctx-a"}
+    )
+    leased.quit.assert_called_once()
+    assert pool.leases == {}
+
+
+@patch("slotbooker.utils.browser_pool.Service")
+@patch("slotbooker.utils.browser_pool.webdriver.Chrome")
+def test_start_reports_missing_chrome_as_value_error(mock_chrome, _):
+    mock_chrome.side_effect = SessionNotCreatedException("Chrome version mismatch")
+
+    with pytest.raises(ValueError):
+        BrowserPool().start()
@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from slotbooker.utils.browser_profile import (
+    BLOCKED_URL_PATTERNS,
+    apply_profile_options,
+    apply_profile_session,
+    get_profile,
+)
+
+
+def test_profile_defaults_to_environment(monkeypatch):
+    monkeypatch.delenv("BROWSER_PROFILE", raising=False)
+    assert get_profile() == "default"
+    monkeypatch.setenv("BROWSER_PROFILE", "Lean")
+    assert get_profile() == "lean"
+    assert get_profile("default") == "default"
+    with pytest.raises(ValueError):
+        get_profile("fast")
+
+
+def test_lean_options_disable_background_work_and_load_eagerly():
+    lean, default = webdriver.ChromeOptions(), webdriver.ChromeOptions()
+
+    apply_profile_options(lean, "lean")
+    apply_profile_options(default, "default")
+
+    assert "--disable-extensions" in lean.arguments
+    assert "--disable-background-networking" in lean.arguments
+    assert lean.page_load_strategy == "eager"
+    assert default.arguments == []
+    assert default.page_load_strategy == "normal"
+
+
+def test_lean_session_blocks_resources():
+    driver = MagicMock()
+
+    apply_profile_session(driver, "lean")
+
+    driver.execute_cdp_cmd.assert_called_with(
+        "Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}
+    )
+    assert "*.woff2" in BLOCKED_URL_PATTERNS
+
+    driver.execute_cdp_cmd.side_effect = WebDriverException("no cdp")
+    apply_profile_session(driver, "lean")  # only logs a warning
+
+    default_driver = MagicMock()
+    apply_profile_session(default_driver, "default")
+    default_driver.execute_cdp_cmd.assert_not_called()
@@ -0,0 +1,61 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from slotbooker.utils.clock_sync import ClockOffset, ClockSync
+
+SERVER_CLOCK_SKEW = 42.3
+
+
+class SkewedClockHandler(BaseHTTPRequestHandler):
+    """Stand-in server whose clock runs SERVER_CLOCK_SKEW seconds ahead."""
+
+    protocol_version = "HTTP/1.1"
+
+    def date_time_string(self, timestamp=None):
+        return formatdate(time.time() + SERVER_CLOCK_SKEW, usegmt=True)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def skewed_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SkewedClockHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/login"
+    server.shutdown()
+    server.server_close()
+
+
+def test_estimate_recovers_server_skew(skewed_server):
+    clock_offset = ClockSync(skewed_server, samples=5).estimate()
+
+    assert clock_offset.uncertainty < 0.1
+    assert abs(clock_offset.offset - SERVER_CLOCK_SKEW) <= clock_offset.uncertainty
+    assert clock_offset.safe_offset <= SERVER_CLOCK_SKEW
+
+
+def test_single_sample_is_bounded_by_date_resolution(skewed_server):
+    clock_offset = ClockSync(skewed_server, samples=1).estimate()
+
+    assert 0.5 <= clock_offset.uncertainty < 0.6
+    assert abs(clock_offset.offset - SERVER_CLOCK_SKEW) <= clock_offset.uncertainty
+
+
+def test_unreachable_server_raises_oserror():
+    with pytest.raises(OSError):
+        ClockSync("http://127.0.0.1:9/", samples=1, timeout=1).estimate()
+
+
+def test_safe_offset_is_lower_bound():
+    assert ClockOffset(1.0, 0.25, 3).safe_offset == 0.75
@@ -0,0 +1,160 @@
+import time
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from slotbooker.daemon import BookingDaemon, Timer
+from tests.standin.api_server import StandInApiServer, StandInApiState
+
+
+def write_account(data_dir, time_folder, name, class_dict):
+    account_dir = data_dir / time_folder / name
+    account_dir.mkdir(parents=True)
+    (account_dir / "classes.yaml").write_text(
+        yaml.safe_dump({"book_class": True, "class_dict": class_dict})
+    )
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_account(
+        tmp_path,
+        "1900",
+        "charly",
+        {"Thursday": [{"time": "19:00", "class": "Open Gym"}]},
+    )
+    write_account(
+        tmp_path, "1900", "ulrike", {"Monday": [{"time": "19:00", "class": "Open Gym"}]}
+    )
+    write_account(
+        tmp_path, "1730", "seblum", {"Friday": [{"time": "17:30", "class": "Open Gym"}]}
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def daemon(data_dir, monkeypatch):
+    monkeypatch.setenv("SCHEDULE_CACHE", "none")
+    monkeypatch.setenv("BOOKING_TIMEZONE", "Europe/Berlin")
+    return BookingDaemon(data_dir=str(data_dir), days_before_bookable=1)
+
+
+def test_plan_keeps_the_next_fire_time_of_every_time_folder(daemon):
+    # Wednesday 18:00: 19:00 books Thursday for charly, 17:30 fires Thursday for Friday.
+    now = datetime(2026, 10, 14, 18, 0, tzinfo=daemon.timezone)
+
+    timers = daemon.plan(now)
+
+    assert [
+        (timer.fire_at.isoformat(), timer.time_folder, timer.weekday)
+        for timer in sorted(timers)
+    ] == [
+        ("2026-10-14T19:00:00+02:00", "1900", "Thursday"),
+        ("2026-10-15T17:30:00+02:00", "1730", "Friday"),
+    ]
+    assert [account.name for account in daemon.due_accounts(timers[0])] == ["charly"]
+
+
+def test_plan_skips_passed_fire_times(daemon):
+    now = datetime(2026, 10, 14, 19, 0, 1, tzinfo=daemon.timezone)
+
+    timer = min(timer for timer in daemon.plan(now) if timer.time_folder == "1900")
+
+    # Next Sunday books Monday for ulrike.
+    assert timer.fire_at.isoformat() == "2026-10-18T19:00:00+02:00"
+    assert timer.weekday == "Monday"
+
+
+def test_run_once_fires_within_the_prewarm_lead(daemon):
+    daemon.prewarm_lead = 7 * 24 * 60 * 60
+    with patch.object(daemon, "fire", return_value={"charly": {}}) as fire:
+        assert daemon.run_once() == {"charly": {}}
+    fire.assert_called_once_with(daemon.timers[0])
+
+
+def test_run_once_fires_every_timer_only_once(daemon):
+    daemon.prewarm_lead = 7 * 24 * 60 * 60
+    with patch("slotbooker.daemon.SlotOrchestrator") as orchestrator:
+        # Every account failed before T0, so the run returns right away.
+        orchestrator.return_value.run.return_value = {"charly": {"state": "ERROR"}}
+        daemon.run_once()
+        first = daemon.last_fire_at
+        daemon.run_once()
+
+    assert orchestrator.call_count == 2
+    assert daemon.last_fire_at > first
+
+
+def test_stop_interrupts_waiting(daemon):
+    daemon.prewarm_lead = 0
+    daemon.stop()
+    start = time.monotonic()
+    with patch.object(daemon, "fire") as fire:
+        assert daemon.run_once() is None
+    fire.assert_not_called()
+    assert time.monotonic() - start < 1
+
+
+@pytest.fixture
+def api(monkeypatch):
+    state = StandInApiState(
+        users={"charly": "pw-c"},
+        class_dates=[{"id": 1, "name": "Open Gym", "startTime": "19:00:00"}],
+    )
+    with StandInApiServer(state) as server:
+        for key, value in {
+            "BOOKER_BACKEND": "http",
+            "OCTIV_API_URL": server.url,
+            "CLOCK_SYNC": "false",
+            "SCHEDULE_CACHE": "none",
+            "CHARLY_OCTIV_USERNAME": "charly",
+            "CHARLY_OCTIV_PASSWORD": "pw-c",
+        }.items():
+            monkeypatch.setenv(key, value)
+        yield server
+
+
+def test_fire_books_due_accounts_in_process(tmp_path, api):
+    today = datetime.now().strftime("%A")
+    write_account(
+        tmp_path, "1900", "charly", {today: [{"time": "19:00", "class": "Open Gym"}]}
+    )
+    daemon = BookingDaemon(data_dir=str(tmp_path), days_before_bookable=0)
+    daemon.plan()
+    fire_at = datetime.now(daemon.timezone) + timedelta(seconds=1)
+
+    results = daemon.fire(Timer(fire_at, "1900", today))
+
+    assert datetime.now(daemon.timezone) >= fire_at
+    assert results["charly"]["state"] == "SUCCESS"
+    assert api.state.bookings == [("charly", 1)]
+
+
+class BeforeMidnight(date):
+    """The pre-warm started on the day before the fire date."""
+
+    @classmethod
+    def today(cls) -> date:
+        return date.today() - timedelta(days=1)
+
+
+def test_fire_books_the_planned_day_when_prewarm_crosses_midnight(tmp_path, api):
+    fire_day = datetime.now().strftime("%A")
+    write_account(
+        tmp_path,
+        "1900",
+        "charly",
+        {fire_day: [{"time": "19:00", "class": "Open Gym"}]},
+    )
+    daemon = BookingDaemon(data_dir=str(tmp_path), days_before_bookable=0)
+    daemon.plan()
+    fire_at = datetime.now(daemon.timezone) + timedelta(seconds=1)
+
+    with patch("slotbooker.utils.helpers.date", BeforeMidnight):
+        results = daemon.fire(Timer(fire_at, "1900", fire_day))
+
+    assert results["charly"]["state"] == "SUCCESS"
+    assert results["charly"]["booking_information"]["current_date"].startswith(fire_day)
+    assert api.state.bookings == [("charly", 1)]
@@ -0,0 +1,160 @@
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from slotbooker.slotbooker import Booker
+from slotbooker.utils.dom_snapshot import (
+    KEPT_TEXT_XPATHS,
+    DomSnapshotRecorder,
+    ReplaySeleniumManager,
+    list_snapshots,
+    load_snapshot,
+    parse_dom,
+    save_snapshot,
+)
+from slotbooker.utils.fire_plan import FirePlan
+from slotbooker.utils.scripts import SNAPSHOT_DOM
+from slotbooker.utils.xpaths import XPath
+from tests.benchmarks.fixture_site import busy_day, render_schedule_page
+
+CLASS_DICT = [
+    {"time": "07:30", "class": "Open Gym"},
+    {"time": "08:00", "class": "Remote Coaching"},
+]
+
+
+def replay(
+    dom: str, class_dict: list, repeat: int = 3, scrape_mode: str = "script"
+) -> dict:
+    """Run scraping and the fire plan against a snapshot and time both."""
+    manager = ReplaySeleniumManager(dom)
+    with patch("slotbooker.slotbooker.SeleniumManager", return_value=manager):
+        booker = Booker(base_url="replay://")
+    booker.class_dict = class_dict
+    class_names = list({entry["class"] for entry in class_dict})
+
+    scrape_times, plan_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with patch.dict("os.environ", {"SCRAPE_MODE": scrape_mode}):
+            slots = booker._scrape_booking_slots(class_names)
+        scrape_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        fire_plan = FirePlan.compile(manager, class_dict, slots)
+        fire_plan.resolve()
+        fire_plan.validate()
+        plan_times.append(time.perf_counter() - start)
+
+    return {
+        "slots": slots,
+        "fire_plan": fire_plan,
+        "scrape_seconds": min(scrape_times),
+        "plan_seconds": min(plan_times),
+    }
+
+
+def test_recorder_writes_compressed_snapshot(tmp_path):
+    selenium_manager = MagicMock()
+    selenium_manager.execute_script.return_value = "<html><body></body></html>"
+    selenium_manager.driver.current_url = "https://app.example.com/schedule?token=x"
+
+    path = DomSnapshotRecorder(str(tmp_path)).record(selenium_manager, "monday")
+
+    selenium_manager.execute_script.assert_called_once_with(
+        SNAPSHOT_DOM, KEPT_TEXT_XPATHS
+    )
+    assert list_snapshots(str(tmp_path)) == [path]
+    snapshot = load_snapshot(path)
+    assert snapshot["label"] == "monday"
+    assert snapshot["url"] == "https://app.example.com/schedule"
+    assert snapshot["dom"] == "<html><body></body></html>"
+
+
+def test_kept_texts_cover_what_the_replay_reads():
+    root = parse_dom(render_schedule_page(busy_day(4)))
+    days, times, labels = (
+        ["".join(node.itertext()) for node in root.findall(xpath.replace("/html", "."))]
+        for xpath in KEPT_TEXT_XPATHS
+    )
+
+    assert "Monday" in days and "Sunday" in days
+    assert times == ["06:00", "06:30", "07:00", "07:30"]
+    assert labels == ["CrossFit", "Weightlifting", "Mobility", "Open Gym"]
+
+
+def test_recorder_is_configured_from_environment(tmp_path):
+    with patch.dict("os.environ", {}, clear=True):
+        assert DomSnapshotRecorder.from_env() is None
+    with patch.dict("os.environ", {"DOM_SNAPSHOT_DIR": str(tmp_path)}):
+        assert DomSnapshotRecorder.from_env().snapshot_dir == str(tmp_path)
+
+
+def test_parse_dom_handles_html_and_xhtml():
+    html = parse_dom(
+        "<!DOCTYPE html><html><head><meta charset='utf-8'></head><body><p>a<br>b</p></body></html>"
+    )
+    xhtml = parse_dom(
+        '<html xmlns="http://www.w3.org/1999/xhtml"><body><p>a<br />b</p></body></html>'
+    )
+
+    for root in (html, xhtml):
+        assert root.tag == "html"
+        assert "".join(root.find("./body/p").itertext()) == "ab"
+
+
+@pytest.mark.parametrize("scrape_mode", ["script", "legacy"])
+@pytest.mark.parametrize("slot_count", [8, 24, 48])
+def test_replay_scrapes_snapshot_offline(tmp_path, slot_count, scrape_mode):
+    path = save_snapshot(
+        str(tmp_path), "fixture", render_schedule_page(busy_day(slot_count))
+    )
+
+    with patch("slotbooker.slotbooker.logging.warning") as warning:
+        result = replay(load_snapshot(path)["dom"], CLASS_DICT, scrape_mode=scrape_mode)
+
+    warning.assert_not_called()  # the script did not fall back to XPaths
+    print(
+        f"\n{slot_count} slots ({scrape_mode}): scrape {result['scrape_seconds'] * 1000:.2f}ms, "
+        f"fire plan {result['plan_seconds'] * 1000:.2f}ms"
+    )
+    assert result["slots"]["Open Gym"]["07:30"]["xpath"] == XPath.enter_slot(slot=7)
+    assert [target.element is not None for target in result["fire_plan"]] == [
+        True,
+        True,
+    ]
+
+
+CORPUS = list_snapshots(os.environ.get("DOM_SNAPSHOT_DIR", ""))
+
+
+@pytest.mark.skipif(not CORPUS, reason="DOM_SNAPSHOT_DIR holds no recorded snapshots")
+@pytest.mark.parametrize("path", CORPUS, ids=os.path.basename)
+def test_recorded_snapshots_still_scrape(path):
+    dom = load_snapshot(path)["dom"]
+    manager = ReplaySeleniumManager(dom)
+    boxes = manager.find_elements(xpath=XPath.booking_section_head())
+    entries = [
+        {
+            "class": manager.find_element(xpath=XPath.bounding_box_label(index)).text,
+            "time": manager.find_element(xpath=XPath.bounding_box_time(index)).text,
+        }
+        for index in range(1, len(boxes) + 1)
+        if manager.find_elements(xpath=XPath.bounding_box_label(index))
+    ]
+    # Absolute XPaths that no longer match the markup find no labelled slots.
+    assert entries, f"No booking slots found in {path}"
+
+    with patch("slotbooker.slotbooker.logging.warning") as warning:
+        script = replay(dom, entries[:1], repeat=1, scrape_mode="script")
+    warning.assert_not_called()
+    legacy = replay(dom, entries[:1], repeat=1, scrape_mode="legacy")
+
+    # The production scraper and the XPath fallback both find the slot.
+    wanted = entries[0]
+    assert wanted["time"] in script["slots"][wanted["class"]]
+    assert wanted["time"] in legacy["slots"][wanted["class"]]
+    assert script["fire_plan"].targets[0].element is not None
+    assert legacy["fire_plan"].targets[0].element is not None
@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from slotbooker.utils.fire_plan import FirePlan
+
+CLASS_DICT = [
+    {"time": "19:00", "class": "Open Gym"},
+    {"time": "19:00", "class": "Remote Coaching", "wl": True},
+    {"time": "20:30", "class": "Open Gym"},
+]
+BOOKING_SLOTS = {
+    "Open Gym": {"19:00": {"xpath": "xpath_open_gym"}},
+    "Remote Coaching": {"19:00": {"xpath": "xpath_remote"}},
+}
+
+
+def make_plan():
+    selenium_manager = MagicMock()
+    selenium_manager.find_elements.side_effect = lambda xpath: [f"element:{xpath}"]
+    return FirePlan.compile(selenium_manager, CLASS_DICT, BOOKING_SLOTS)
+
+
+def test_compile_keeps_priority_order_and_marks_missing_slots():
+    plan = make_plan()
+
+    assert [(t.class_name, t.time) for t in plan] == [
+        ("Open Gym", "19:00"),
+        ("Remote Coaching", "19:00"),
+        ("Open Gym", "20:30"),
+    ]
+    assert [t.xpath for t in plan] == ["xpath_open_gym", "xpath_remote", None]
+    assert [t.waiting_list for t in plan] == [None, True, None]
+
+
+def test_resolve_looks_up_all_present_buttons():
+    plan = make_plan()
+
+    plan.resolve()
+
+    assert [t.element for t in plan] == [
+        "element:xpath_open_gym",
+        "element:xpath_remote",
+        None,
+    ]
+    assert plan.selenium_manager.find_elements.call_count == 2
+
+
+def test_validate_checks_staleness_in_one_call_and_re_resolves_stale():
+    plan = make_plan()
+    plan.resolve()
+    plan.selenium_manager.find_elements.reset_mock()
+    plan.selenium_manager.execute_script.return_value = [True, False]
+
+    plan.validate()
+
+    plan.selenium_manager.execute_script.assert_called_once()
+    plan.selenium_manager.find_elements.assert_called_once_with(xpath="xpath_remote")
+
+
+def test_validate_re_resolves_everything_when_check_hits_stale_reference():
+    plan = make_plan()
+    plan.resolve()
+    plan.selenium_manager.find_elements.reset_mock()
+    plan.selenium_manager.execute_script.side_effect = StaleElementReferenceException()
+
+    plan.validate()
+
+    assert plan.selenium_manager.find_elements.call_count == 2
@@ -0,0 +1,105 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from slotbooker.utils.fire_scheduler import FireScheduler
+
+
+def test_parse_execution_time_formats():
+    assert FireScheduler.parse_execution_time("19:00").isoformat() == "19:00:00"
+    assert (
+        FireScheduler.parse_execution_time("19:00:00.250000").isoformat()
+        == "19:00:00.250000"
+    )
+    with pytest.raises(ValueError):
+        FireScheduler.parse_execution_time("7pm")
+
+
+def test_target_datetime_is_timezone_aware():
+    scheduler = FireScheduler("19:00:00", timezone="Europe/Berlin")
+    # 16:30 UTC on a summer day is 18:30 in Berlin, so T0 is half an hour away.
+    now = datetime(2025, 6, 10, 16, 30, tzinfo=ZoneInfo("UTC"))
+
+    target = scheduler.target_datetime(now)
+
+    assert target.tzinfo == ZoneInfo("Europe/Berlin")
+    assert scheduler.seconds_until_fire(now) == pytest.approx(1800)
+
+
+def test_clock_offset_shifts_fire_time():
+    now = datetime(2025, 6, 10, 18, 59, 50, tzinfo=ZoneInfo("Europe/Berlin"))
+    scheduler = FireScheduler("19:00:00", "Europe/Berlin", clock_offset=0.4)
+
+    assert scheduler.seconds_until_fire(now) == pytest.approx(9.6)
+
+
+def test_wait_fires_immediately_when_time_has_passed():
+    scheduler = FireScheduler("00:00:00.000000")
+
+    start = time.monotonic()
+    jitter = scheduler.wait()
+
+    assert time.monotonic() - start < 0.05
+    assert jitter >= 0
+
+
+class FakeClock:
+    """Monotonic clock that advances by sleeping and by a fixed cost per read."""
+
+    def __init__(self, read_cost: float = 0.0001):
+        self.now = 1000.0
+        self.read_cost = read_cost
+
+    def monotonic(self) -> float:
+        self.now += self.read_cost
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_wait_fires_at_deadline_with_low_jitter():
+    target = datetime.now().astimezone() + timedelta(milliseconds=150)
+    # Pinning the date keeps T0 on the same day when the test runs at midnight.
+    scheduler = FireScheduler(
+        target.time().isoformat(), spin_window=0.01, fire_date=target.date()
+    )
+    clock = FakeClock()
+
+    with patch("slotbooker.utils.fire_scheduler.time", clock):
+        deadline = scheduler.arm()
+        jitter = scheduler.wait()
+
+    assert deadline - 1000.0 == pytest.approx(0.15, abs=0.05)
+    assert clock.now >= deadline
+    assert 0 <= jitter <= clock.read_cost
+    assert scheduler.jitter == jitter
+
+
+def test_wait_reports_lateness_when_armed_after_t0():
+    target = datetime.now().astimezone() - timedelta(seconds=2)
+    scheduler = FireScheduler(target.time().isoformat(), fire_date=target.date())
+
+    start = time.monotonic()
+    jitter = scheduler.wait()
+
+    assert time.monotonic() - start < 0.05
+    assert jitter == pytest.approx(2, abs=0.1)
+
+
+def test_wait_until_lead_stops_before_t0():
+    target = datetime.now().astimezone() + timedelta(seconds=3)
+    scheduler = FireScheduler(target.time().isoformat(), fire_date=target.date())
+    clock = FakeClock()
+
+    with patch("slotbooker.utils.fire_scheduler.time", clock):
+        deadline = scheduler.arm()
+        scheduler.wait_until_lead(0.25)
+        woke_at = clock.now
+        scheduler.wait()
+
+    assert deadline - 0.25 <= woke_at < deadline
+    assert clock.now >= deadline
@@ -67,6 +67,14 @@ class TestBookingHelper(unittest.TestCase):
             diff_week, (future_date.isocalendar().week - today.isocalendar().week)
         )
 
+    def test_get_day_of_booking_date(self):
+        today = date.today()
+        future_date, diff_week = get_day(0, booking_date=today + timedelta(days=7))
+        self.assertEqual(future_date, today + timedelta(days=7))
+        self.assertEqual(
+            diff_week, (future_date.isocalendar().week - today.isocalendar().week)
+        )
+
     def test_get_day_button(self):
         self.assertEqual(
             XPath.weekday_button("Monday"),
@@ -0,0 +1,136 @@
+import http.client
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from slotbooker.http_booker import HttpBooker
+from slotbooker.slotbooker import BookingState
+from slotbooker.utils.octiv_api import OctivApiClient, OctivApiError
+from tests.standin.api_server import StandInApiServer, StandInApiState
+
+CLASS_DATES = [
+    {"id": 11, "name": "Open Gym", "startTime": "19:00:00"},
+    {"id": 12, "name": "Remote Coaching", "startTime": "19:00:00"},
+    {"id": 13, "name": "Open Gym", "startTime": "20:30:00"},
+]
+CLASS_DICT = {
+    day: [
+        {"time": "19:00", "class": "Open Gym"},
+        {"time": "19:00", "class": "Remote Coaching", "wl": True},
+    ]
+    for day in [
+        "Monday",
+        "Tuesday",
+        "Wednesday",
+        "Thursday",
+        "Friday",
+        "Saturday",
+        "Sunday",
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def booking_env():
+    with patch.dict(
+        "os.environ",
+        {"CLOCK_SYNC": "false", "DAYS_BEFORE_BOOKABLE": "0"},
+    ):
+        yield
+
+
+@pytest.fixture
+def api():
+    state = StandInApiState(users={"charly": "secret"}, class_dates=list(CLASS_DATES))
+    with StandInApiServer(state) as server:
+        yield server
+
+
+def make_booker(api) -> HttpBooker:
+    return HttpBooker(base_url="http://example.com/login", api_url=api.url)
+
+
+def test_http_booker_books_first_class_over_one_connection(api):
+    booker = make_booker(api)
+
+    assert booker.login("charly", "secret") is True
+    day, date_str = booker.switch_day()
+    booker.book_class(class_dict=CLASS_DICT)
+    booker.close_driver()
+
+    assert day == date.today().strftime("%A")
+    assert date_str == date.today().strftime("%d/%m/%Y")
+    assert booker.booking_successful == BookingState.SUCCESS
+    assert api.state.bookings == [("charly", 11)]
+    assert api.state.connections == 1
+    assert booker.selenium_manager is None
+
+
+def test_http_booker_rejects_wrong_credentials(api):
+    assert make_booker(api).login("charly", "wrong") is False
+
+
+def test_http_booker_falls_back_and_joins_waiting_list(api):
+    api.state.full_classes = {11, 12}
+    booker = make_booker(api)
+    booker.login("charly", "secret")
+    booker.switch_day()
+
+    booker.book_class(class_dict=CLASS_DICT)
+
+    assert booker.booking_successful == BookingState.FAIL
+    assert api.state.bookings == []
+    assert api.state.waiting_list == [("charly", 12)]
+    assert [b["class"] for b in booker.booking_information["bookings"]] == [
+        "Open Gym",
+        "Remote Coaching",
+    ]
+
+
+def test_http_booker_identifies_booking_errors(api):
+    api.state.booking_error = "You cannot book this far in advance."
+    booker = make_booker(api)
+    booker.login("charly", "secret")
+    booker.switch_day()
+
+    assert booker.book_class(class_dict=CLASS_DICT) is True
+    assert booker.booking_successful == BookingState.FAIL
+
+
+def test_http_booker_raises_when_api_unreachable():
+    booker = HttpBooker(base_url="http://example.com", api_url="http://127.0.0.1:9")
+
+    with pytest.raises(OctivApiError):
+        booker.login("charly", "secret")
+
+
+def test_http_booker_holds_connection_until_fire(api):
+    booker = make_booker(api)
+    booker.login("charly", "secret")
+    booker.switch_day()
+    api.state.class_dates.append({"id": 14, "name": "Yoga", "startTime": "21:00:00"})
+    scheduler = MagicMock()
+    scheduler.seconds_until_fire.side_effect = [0.1, 0.05, 0.01]
+
+    booker.hold_until_fire(scheduler, keep_alive_interval=0.01, refresh_lead=0.02)
+    booker.close_driver()
+
+    assert [c["id"] for c in booker.class_dates] == [11, 12, 13, 14]
+    assert api.state.connections == 1
+
+
+def test_api_client_never_repeats_a_sent_booking():
+    client = OctivApiClient("http://example.com")
+    connection = MagicMock()
+    connection.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+
+    with patch.object(client, "_connect", return_value=connection) as connect:
+        with pytest.raises(OctivApiError):
+            client.request("POST", "/api/class-bookings", {"classDateId": 11})
+        assert connection.request.call_count == 1
+
+        with pytest.raises(OctivApiError):
+            client.request("GET", "/api/class-dates")
+    assert connection.request.call_count == 3
+    assert connect.call_count == 3
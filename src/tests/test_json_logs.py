@@ -0,0 +1,129 @@
+import gzip
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from slotbooker.utils import json_logs
+from slotbooker.utils.json_logs import (
+    ACTIVE_LOG,
+    RotatingJsonLogHandler,
+    install_record_factory,
+    query_logs,
+    read_index,
+)
+from slotbooker.utils.logging import current_account
+from slotbooker.utils.tracing import Tracer
+
+DAY = 24 * 60 * 60
+
+
+def record(created: float, account: str, msg: str = "Booking", **extra):
+    return logging.makeLogRecord(
+        {
+            "msg": msg,
+            "levelname": "INFO",
+            "levelno": logging.INFO,
+            "created": created,
+            "account": account,
+            "phase": "book_slot",
+            **extra,
+        }
+    )
+
+
+@pytest.fixture
+def logger(tmp_path):
+    handler = RotatingJsonLogHandler(str(tmp_path), max_bytes=10_000_000)
+    logger = logging.getLogger("tests.json_logs")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    yield logger
+    logger.removeHandler(handler)
+    handler.close()
+
+
+def test_records_carry_account_phase_and_extra_fields(logger, tmp_path):
+    install_record_factory()
+    token = current_account.set("charly")
+    try:
+        with Tracer().span("book_slot"):
+            logger.info("Fired 1.250ms late", extra={"fire_latency_ms": 1.25})
+    finally:
+        current_account.reset(token)
+
+    line = (tmp_path / ACTIVE_LOG).read_text().splitlines()[0]
+    entry = json.loads(line)
+    assert '": ' not in line  # compact separators
+    assert entry["account"] == "charly"
+    assert entry["phase"] == "book_slot"
+    assert entry["fire_latency_ms"] == 1.25
+    assert entry["level"] == "INFO"
+    assert isinstance(entry["mono_ns"], int)
+
+
+def test_size_rotation_writes_indexed_gzip_archives(tmp_path):
+    handler = RotatingJsonLogHandler(str(tmp_path), max_bytes=500)
+    now = time.time()
+    for index in range(40):
+        handler.handle(record(now + index, "charly" if index < 20 else "ulrike"))
+    handler.close()
+
+    entries = read_index(str(tmp_path))
+    assert len(entries) > 1
+    with gzip.open(tmp_path / entries[0]["file"], "rt") as archive:
+        assert json.loads(archive.readline())["account"] == "charly"
+    assert sum(entry["records"] for entry in entries) < 40
+    assert len(list(query_logs(str(tmp_path)))) == 40
+    assert len(list(query_logs(str(tmp_path), account="ulrike"))) == 20
+
+
+def test_age_rotation_and_retention(tmp_path):
+    handler = RotatingJsonLogHandler(str(tmp_path), max_age=DAY, retention_days=30)
+    now = time.time()
+    for days_ago in (100, 40, 10, 0):
+        handler.handle(record(now - days_ago * DAY, "charly"))
+    handler.close()
+
+    # The archive of 100 days ago was pruned, the one of 40 days ago only once
+    # the record of 10 days ago was rotated.
+    assert [
+        round((now - entry["start"]) / DAY) for entry in read_index(str(tmp_path))
+    ] == [10]
+    assert len(list(tmp_path.glob("*.jsonl.gz"))) == 1
+
+
+def test_queries_only_decompress_candidate_archives(tmp_path):
+    handler = RotatingJsonLogHandler(str(tmp_path), max_age=DAY, retention_days=0)
+    september = datetime(2026, 9, 15).timestamp()
+    for days in range(0, 40, 2):
+        for account in ("charly", "ulrike"):
+            handler.handle(
+                record(
+                    september + days * DAY,
+                    account,
+                    msg="Fired",
+                    fire_latency_ms=float(days),
+                )
+            )
+            handler.handle(record(september + days * DAY + 1, account))
+    handler.close()
+
+    with patch.object(json_logs.gzip, "open", wraps=gzip.open) as gzip_open:
+        latencies = [
+            entry["fire_latency_ms"]
+            for entry in query_logs(
+                str(tmp_path),
+                account="charly",
+                since=datetime(2026, 10, 1),
+                until=datetime(2026, 10, 1) + timedelta(days=7),
+                field="fire_latency_ms",
+            )
+        ]
+
+    assert latencies == [16.0, 18.0, 20.0, 22.0]
+    assert gzip_open.call_count == 4
@@ -0,0 +1,108 @@
+import logging
+import threading
+
+import pytest
+
+from slotbooker.utils.logging import (
+    LogHandler,
+    QueueLogging,
+    RingBuffer,
+    current_account,
+    parse_log_lines,
+    render_html_report,
+    write_html_report,
+)
+
+LOG = """2026-10-15 18:59:59,120 INFO Logging in as <charly>
+Traceback (most recent call last):
+2026-10-15 19:00:00,004 SUCCESS Booked successfully Open Gym & Sauna
+2026-10-15 19:00:00,210 ERROR ! Class <script>alert(1)</script> not found
+"""
+
+
+def test_parse_log_lines_skips_continuation_lines():
+    records = list(parse_log_lines(LOG.splitlines(keepends=True)))
+
+    assert [level for _, level, _ in records] == ["INFO", "SUCCESS", "ERROR"]
+    assert records[0] == ("2026-10-15 18:59:59,120", "INFO", "Logging in as <charly>")
+
+
+def test_report_rows_are_escaped():
+    report = "".join(render_html_report(LOG.splitlines(keepends=True)))
+
+    assert "Logging in as &lt;charly&gt;" in report
+    assert "Open Gym &amp; Sauna" in report
+    assert "<script>" not in report
+    assert '<td class="success">' in report
+    assert report.count("<tr>") == 4  # header and three records
+
+
+def test_write_html_report_streams_to_file(tmp_path):
+    log_file = tmp_path / "log_2026-10-15_18-59-00.txt"
+    log_file.write_text(LOG)
+
+    html_file = write_html_report(str(log_file), str(tmp_path / "report.html"))
+
+    with open(html_file) as file:
+        content = file.read()
+    assert content == "".join(render_html_report(LOG.splitlines(keepends=True)))
+    assert content.rstrip().endswith("</html>")
+
+
+@pytest.fixture
+def queue_logging():
+    queue_logging = QueueLogging()
+    queue_logging.install()
+    yield queue_logging
+    queue_logging.stop()
+
+
+def test_ring_buffer_drops_the_oldest_records():
+    buffer = RingBuffer(capacity=3)
+    for record in range(5):
+        buffer.put_nowait(record)
+
+    assert list(buffer.queue) == [2, 3, 4]
+    assert buffer.dropped == 2
+    assert buffer.unfinished_tasks == 3
+
+
+def test_account_sinks_receive_their_records(queue_logging, tmp_path):
+    for account in ("charly", "ulrike"):
+        queue_logging.add_sink(str(tmp_path / f"{account}.txt"), account=account)
+
+    def run_account(name: str) -> None:
+        current_account.set(name)
+        logging.info(f"Booking for {name}")
+
+    threads = [
+        threading.Thread(target=run_account, args=(name,))
+        for name in ("charly", "ulrike")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logging.info("Running 2 account(s)")
+    queue_logging.drain()
+
+    charly = (tmp_path / "charly.txt").read_text()
+    assert "Booking for charly" in charly and "Booking for ulrike" not in charly
+    # Records outside of any account reach every sink.
+    assert "Running 2 account(s)" in charly
+    assert "Booking for ulrike" in (tmp_path / "ulrike.txt").read_text()
+
+
+def test_log_handler_flushes_before_the_log_is_read(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOG_MODE", "queue")
+    handler = LogHandler()
+    try:
+        logging.info("Class booked")
+        handler.flush()
+        with open(handler.get_log_file_path()) as file:
+            assert "INFO Class booked" in file.read()
+        handler.close()
+        assert handler.get_log_file_path() not in handler.queue_logging.sinks
+    finally:
+        handler.queue_logging.stop()
@@ -0,0 +1,129 @@
+import smtplib
+
+import pytest
+
+from slotbooker.notifications.mailing import (
+    MailHandler,
+    close_smtp_sessions,
+    get_smtp_session,
+    load_template,
+)
+from tests.standin.smtp_server import StandInSmtpServer, StandInSmtpState
+
+BOOKING_INFORMATION = {
+    "current_date": "2026-10-15",
+    "bookings": [{"time": "19:00", "class": "Open Gym"}],
+}
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    state = StandInSmtpState(users={"bot@example.com": "secret"})
+    with StandInSmtpServer(state) as server:
+        monkeypatch.setenv("EMAIL_SMTP_SERVER", "127.0.0.1")
+        monkeypatch.setenv("EMAIL_SMTP_PORT", str(server.port))
+        monkeypatch.setenv("EMAIL_SMTP_SECURITY", "none")
+        monkeypatch.setenv("EMAIL_RECEIVER_NAME", "Charly")
+        yield server
+        close_smtp_sessions()
+
+
+@pytest.fixture
+def mail_handler():
+    return MailHandler(
+        email_sender="bot@example.com",
+        email_password="secret",
+        email_receiver="charly@example.com",
+        format="html",
+    )
+
+
+def test_messages_of_a_run_share_one_connection(smtp, mail_handler, tmp_path):
+    log_file = tmp_path / "log.txt"
+    log_file.write_text("INFO Class booked")
+
+    mail_handler.send_successful_booking_email(BOOKING_INFORMATION, str(log_file))
+    mail_handler.send_unsuccessful_booking_email(BOOKING_INFORMATION)
+    mail_handler.send_no_classes_email(booking_date="2026-10-15")
+
+    assert (smtp.state.connections, smtp.state.logins) == (1, 1)
+    subjects = [message["Subject"] for _, _, message in smtp.state.messages]
+    assert subjects == [
+        "Booking Confirmation",
+        "Booking Not Successful",
+        "No Classes Found",
+    ]
+    sender, recipients, confirmation = smtp.state.messages[0]
+    assert (sender, recipients) == ("bot@example.com", ["charly@example.com"])
+    assert "Open Gym" in confirmation.get_body(("html",)).get_content()
+    attachment = next(confirmation.iter_attachments())
+    assert attachment.get_filename() == "log.txt"
+
+
+def test_lost_connections_are_reestablished(smtp, mail_handler):
+    mail_handler.send_no_classes_email(booking_date="2026-10-15")
+    smtp.drop_connections()
+
+    mail_handler.send_no_classes_email(booking_date="2026-10-16")
+
+    assert len(smtp.state.messages) == 2
+    assert smtp.state.connections == 2
+
+
+def test_batches_are_sent_over_one_connection(smtp, mail_handler):
+    messages = [
+        mail_handler._build_email(
+            "bot@example.com", [f"user{index}@example.com"], f"Report {index}", "<p/>"
+        )
+        for index in range(20)
+    ]
+
+    get_smtp_session("bot@example.com", "secret").send_many(messages)
+
+    assert len(smtp.state.messages) == 20
+    assert smtp.state.connections == 1
+    assert get_smtp_session("bot@example.com", "secret").connections == 1
+
+
+def test_digest_escapes_names_and_attaches_every_log(smtp, mail_handler, tmp_path):
+    log_files = [tmp_path / "charly.log", tmp_path / "ulrike.log"]
+    for log_file in log_files:
+        log_file.write_text("INFO Class booked")
+    bookings = [{"time": "19:00", "class": "<b>Open Gym</b>"}]
+    results = {
+        "<script>charly</script>": {
+            "state": "SUCCESS",
+            "booking_information": {"current_date": "15/10/2026", "bookings": bookings},
+        },
+        "ulrike": {"state": "FAIL", "booking_information": {}},
+    }
+
+    mail_handler.send_detailed_booking_email(
+        results, attachment_paths=[str(log_file) for log_file in log_files]
+    )
+
+    _, _, digest = smtp.state.messages[0]
+    body = digest.get_body(("html",)).get_content()
+    assert "&lt;script&gt;charly&lt;/script&gt;" in body
+    assert "&lt;b&gt;Open Gym&lt;/b&gt; at 19:00" in body
+    assert "<script>" not in body and "<b>Open Gym" not in body
+    assert [a.get_filename() for a in digest.iter_attachments()] == [
+        "charly.log",
+        "ulrike.log",
+    ]
+
+
+def test_templates_are_read_once(smtp, mail_handler):
+    load_template.cache_clear()
+
+    for _ in range(3):
+        mail_handler.send_successful_booking_email(BOOKING_INFORMATION)
+
+    assert load_template.cache_info().misses == 1
+    assert load_template.cache_info().hits == 2
+
+
+def test_wrong_credentials_are_reported(smtp):
+    handler = MailHandler("bot@example.com", "wrong", "charly@example.com", "html")
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        handler.send_no_classes_email(booking_date="2026-10-15")
@@ -0,0 +1,193 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+
+from slotbooker.notifications.mailing import close_smtp_sessions
+from slotbooker.orchestrator import Account, SlotOrchestrator, load_accounts
+from slotbooker.utils.octiv_api import OctivApiError
+from slotbooker.utils.schedule import ScheduleError
+from tests.standin.api_server import StandInApiServer, StandInApiState
+from tests.standin.smtp_server import StandInSmtpServer, StandInSmtpState
+
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+# Credentials of the stand-in API; mallory fails to log in
+ACCOUNT_ENV = {
+    "BOOKER_BACKEND": "http",
+    "CLOCK_SYNC": "false",
+    "DAYS_BEFORE_BOOKABLE": "0",
+    "CHARLY_OCTIV_USERNAME": "charly",
+    "CHARLY_OCTIV_PASSWORD": "pw-c",
+    "ULRIKE_OCTIV_USERNAME": "ulrike",
+    "ULRIKE_OCTIV_PASSWORD": "pw-u",
+    "MALLORY_OCTIV_USERNAME": "mallory",
+    "MALLORY_OCTIV_PASSWORD": "wrong",
+}
+
+
+def write_account(data_dir, time_folder, name, class_name):
+    account_dir = data_dir / time_folder / name
+    account_dir.mkdir(parents=True)
+    classes = {
+        "book_class": True,
+        "class_dict": {
+            day: [{"time": "19:00", "class": class_name}] for day in WEEKDAYS
+        },
+    }
+    (account_dir / "classes.yaml").write_text(yaml.safe_dump(classes))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_account(tmp_path, "1900", "charly", "Open Gym")
+    write_account(tmp_path, "1900", "ulrike", "Remote Coaching")
+    write_account(tmp_path, "1900", "mallory", "Open Gym")
+    (tmp_path / "1900" / "README.md").write_text("not an account")
+    return tmp_path
+
+
+@pytest.fixture
+def api():
+    state = StandInApiState(
+        users={"charly": "pw-c", "ulrike": "pw-u", "mallory": "pw-m"},
+        class_dates=[
+            {"id": 1, "name": "Open Gym", "startTime": "19:00:00"},
+            {"id": 2, "name": "Remote Coaching", "startTime": "19:00:00"},
+        ],
+    )
+    with StandInApiServer(state) as server:
+        yield server
+
+
+def test_load_accounts_reads_every_account_of_time_folder(data_dir):
+    accounts = load_accounts("1900", data_dir=str(data_dir))
+
+    assert [account.name for account in accounts] == ["charly", "mallory", "ulrike"]
+    assert accounts[2].classes["class_dict"]["Monday"][0]["class"] == "Remote Coaching"
+
+
+def test_load_accounts_rejects_malformed_schedules_up_front(data_dir):
+    (data_dir / "1900" / "mallory" / "classes.yaml").write_text("class_dict: {}\n")
+    (data_dir / "1730").mkdir()
+
+    with pytest.raises(ScheduleError):
+        load_accounts("1900", data_dir=str(data_dir))
+    with pytest.raises(ScheduleError):
+        load_accounts("2000", data_dir=str(data_dir))
+    assert load_accounts("1730", data_dir=str(data_dir)) == []
+
+
+def test_account_env_prefers_prefixed_variables():
+    with patch.dict(
+        "os.environ", {"CHARLY_OCTIV_USERNAME": "charly", "OCTIV_USERNAME": "default"}
+    ):
+        assert Account("charly", {}).env("OCTIV_USERNAME") == "charly"
+        assert Account("ulrike", {}).env("OCTIV_USERNAME") == "default"
+
+
+def test_orchestrator_books_all_accounts_in_one_process(data_dir, api):
+    env = {**ACCOUNT_ENV, "OCTIV_API_URL": api.url}
+    with patch.dict("os.environ", env):
+        accounts = load_accounts("1900", data_dir=str(data_dir))
+        results = SlotOrchestrator(accounts, max_workers=3, send_mail=[]).run()
+
+    assert {name: result["state"] for name, result in results.items()} == {
+        "charly": "SUCCESS",
+        "mallory": "FAIL",
+        "ulrike": "SUCCESS",
+    }
+    assert sorted(api.state.bookings) == [("charly", 1), ("ulrike", 2)]
+
+
+def test_orchestrator_runs_every_account_concurrently_by_default(caplog):
+    accounts = [Account(name, {}) for name in ("charly", "mallory", "ulrike")]
+
+    assert SlotOrchestrator(accounts).max_workers == 3
+    with patch.dict("os.environ", {"ORCHESTRATOR_MAX_WORKERS": "2"}):
+        assert SlotOrchestrator(accounts).max_workers == 2
+    assert "Only 2 of 3 accounts run concurrently" in caplog.text
+
+
+def test_orchestrator_isolates_failing_accounts(data_dir):
+    accounts = load_accounts("1900", data_dir=str(data_dir))
+    with (
+        patch.dict("os.environ", {"CLOCK_SYNC": "false"}),
+        patch("slotbooker.orchestrator.create_booker", side_effect=SystemExit(1)),
+    ):
+        results = SlotOrchestrator(accounts, send_mail=[]).run()
+
+    assert {result["state"] for result in results.values()} == {"ERROR"}
+
+
+def test_orchestrator_closes_the_browser_of_failing_accounts(data_dir):
+    accounts = load_accounts("1900", data_dir=str(data_dir))
+    bookers = [MagicMock(name=account.name) for account in accounts]
+    for booker in bookers:
+        booker.login.side_effect = SystemExit(1)
+    with (
+        patch.dict("os.environ", {"CLOCK_SYNC": "false"}),
+        patch("slotbooker.orchestrator.create_booker", side_effect=bookers),
+    ):
+        SlotOrchestrator(accounts, send_mail=[]).run()
+
+    for booker in bookers:
+        booker.close_driver.assert_called_once()
+        booker.loggingHandler.close.assert_called_once()
+
+
+def test_orchestrator_falls_back_to_selenium_when_the_api_fails(data_dir):
+    accounts = load_accounts("1900", data_dir=str(data_dir))[:1]
+    http_booker, selenium_booker = MagicMock(), MagicMock()
+    http_booker.switch_day.side_effect = OctivApiError("GET /api/class-dates", 500)
+    with (
+        patch.dict("os.environ", {"CLOCK_SYNC": "false"}),
+        patch("slotbooker.orchestrator.create_booker", return_value=http_booker),
+        patch("slotbooker.orchestrator.Booker", return_value=selenium_booker),
+    ):
+        SlotOrchestrator(accounts, send_mail=[]).run()
+
+    http_booker.close_driver.assert_called_once()
+    http_booker.book_class.assert_not_called()
+    selenium_booker.switch_day.assert_called_once()
+    selenium_booker.book_class.assert_called_once()
+    selenium_booker.send_result.assert_called_once()
+
+
+def test_digest_sends_one_email_per_receiver(data_dir, api):
+    smtp_state = StandInSmtpState(users={"bot@example.com": "secret"})
+    with StandInSmtpServer(smtp_state) as smtp:
+        env = {
+            **ACCOUNT_ENV,
+            "OCTIV_API_URL": api.url,
+            "EMAIL_SMTP_SERVER": "127.0.0.1",
+            "EMAIL_SMTP_PORT": str(smtp.port),
+            "EMAIL_SMTP_SECURITY": "none",
+            "MAIL_OUTBOX_DIR": "none",
+            "EMAIL_SENDER": "bot@example.com",
+            "EMAIL_PASSWORD": "secret",
+            "EMAIL_RECEIVER": "family@example.com",
+            "ULRIKE_EMAIL_RECEIVER": "ulrike@example.com",
+        }
+        with patch.dict("os.environ", env):
+            accounts = load_accounts("1900", data_dir=str(data_dir))
+            SlotOrchestrator(
+                accounts, send_mail=["on_success", "on_failure"], digest=True
+            ).run()
+        close_smtp_sessions()
+
+    digests = {recipients[0]: message for _, recipients, message in smtp_state.messages}
+    assert sorted(digests) == ["family@example.com", "ulrike@example.com"]
+    assert smtp_state.connections == 1
+    family = digests["family@example.com"]
+    assert family["Subject"] == "Booking Report: 1 of 2 booked"
+    body = family.get_body(("html",)).get_content()
+    assert "charly" in body and "mallory" in body and "ulrike" not in body
+    assert digests["ulrike@example.com"]["Subject"] == "Booking Report: 1 of 1 booked"
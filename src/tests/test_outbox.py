@@ -0,0 +1,91 @@
+import os
+import time
+
+import pytest
+
+from slotbooker.notifications.mailing import MailHandler, close_smtp_sessions
+from slotbooker.notifications.outbox import MailOutbox
+from tests.standin.smtp_server import StandInSmtpServer, StandInSmtpState
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    state = StandInSmtpState(users={"bot@example.com": "secret"})
+    with StandInSmtpServer(state) as server:
+        monkeypatch.setenv("EMAIL_SMTP_SERVER", "127.0.0.1")
+        monkeypatch.setenv("EMAIL_SMTP_PORT", str(server.port))
+        monkeypatch.setenv("EMAIL_SMTP_SECURITY", "none")
+        yield server
+        close_smtp_sessions()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = MailOutbox(str(tmp_path / "outbox"), retry_wait=0.05)
+    yield outbox
+    outbox.close(timeout=5)
+
+
+def build_message(subject: str):
+    handler = MailHandler("bot@example.com", "secret", "charly@example.com", "html")
+    return handler._build_email(
+        "bot@example.com", ["charly@example.com"], subject, "<p/>"
+    )
+
+
+def test_sending_returns_before_delivery(smtp, outbox):
+    smtp.state.failures = 1
+    handler = MailHandler(
+        "bot@example.com", "secret", "charly@example.com", "html", outbox=outbox
+    )
+
+    start = time.monotonic()
+    handler.send_no_classes_email(booking_date="2026-10-15")
+    assert time.monotonic() - start < 0.05
+    assert smtp.state.messages == []
+
+    assert outbox.flush(timeout=5)
+    assert [message["Subject"] for _, _, message in smtp.state.messages] == [
+        "No Classes Found"
+    ]
+    assert outbox.pending() == []
+
+
+def test_transient_failures_are_retried(smtp, outbox):
+    smtp.state.failures = 3
+
+    outbox.enqueue(build_message("Booking Confirmation"), "secret")
+
+    assert outbox.flush(timeout=5)
+    assert len(smtp.state.messages) == 1
+    assert outbox.pending() == []
+
+
+def test_undelivered_messages_survive_a_restart(smtp, tmp_path, monkeypatch):
+    smtp.state.failures = 2
+    first = MailOutbox(str(tmp_path / "outbox"), attempts=2, retry_wait=0.01)
+    path = first.enqueue(build_message("Booking Not Successful"), "secret")
+    first.close(timeout=5)
+
+    assert first.pending() == [path]
+    with open(path, "rb") as file:
+        assert b"secret" not in file.read()
+    assert smtp.state.messages == []
+
+    # A new process only knows the password from the environment.
+    monkeypatch.setenv("CHARLY_EMAIL_SENDER", "bot@example.com")
+    monkeypatch.setenv("CHARLY_EMAIL_PASSWORD", "secret")
+    second = MailOutbox(str(tmp_path / "outbox"))
+    second.start()
+    assert second.flush(timeout=5)
+    second.close()
+
+    assert [message["Subject"] for _, _, message in smtp.state.messages] == [
+        "Booking Not Successful"
+    ]
+    assert not os.path.exists(path)
+
+
+def test_from_env_can_disable_the_outbox(monkeypatch):
+    monkeypatch.setenv("MAIL_OUTBOX_DIR", "none")
+    assert MailOutbox.from_env() is None
@@ -0,0 +1,117 @@
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from slotbooker.utils import schedule as schedule_module
+from slotbooker.utils.schedule import (
+    DEFAULT_ACCOUNT,
+    ScheduleCompiler,
+    ScheduleError,
+    validate_schedule,
+)
+
+
+def write_schedule(path, class_dict: dict, **extra) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        yaml.safe_dump({"book_class": True, **extra, "class_dict": class_dict})
+    )
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_schedule(
+        tmp_path / "classes.yaml",
+        {"Monday": [{"time": "19:00", "class": "Remote Coaching"}]},
+    )
+    write_schedule(
+        tmp_path / "1900" / "charly" / "classes.yaml",
+        {
+            "Thursday": [
+                {"time": "19:00", "class": "Open Gym", "wl": True},
+                {"time": "20:30", "class": "Open Gym"},
+            ],
+            "Saturday": [{"time": "None", "class": "None"}],
+        },
+    )
+    write_schedule(
+        tmp_path / "1900" / "ulrike" / "classes.yaml",
+        {"Thursday": [{"time": "19:00", "class": "Remote Coaching"}]},
+    )
+    write_schedule(
+        tmp_path / "1730" / "seblum" / "classes.yaml",
+        {"Thursday": [{"time": "17:30", "class": "Open Gym"}]},
+        book_class=False,
+    )
+    (tmp_path / "1900" / "README.md").write_text("not an account")
+    return tmp_path
+
+
+def test_index_answers_who_fires_when(data_dir):
+    schedule = ScheduleCompiler(str(data_dir)).compile(default_fire_time="19:00")
+
+    thursday = schedule.lookup("19:00", "Thursday")
+    assert list(thursday) == ["charly", "ulrike"]
+    assert [entry["time"] for entry in thursday["charly"]] == ["19:00", "20:30"]
+    assert list(schedule.lookup("19:00", "Monday")) == [DEFAULT_ACCOUNT]
+    # Days without a class and disabled accounts never fire.
+    assert schedule.lookup("19:00", "Saturday") == {}
+    assert schedule.lookup("17:30", "Thursday") == {}
+    assert schedule.fire_times() == [
+        ("19:00", "Monday"),
+        ("19:00", "Thursday"),
+    ]
+
+
+def test_compile_can_be_limited_to_time_folders(data_dir):
+    schedule = ScheduleCompiler(str(data_dir)).compile(
+        time_folders=["1730"], include_default=False
+    )
+    assert list(schedule.accounts) == [("1730", "seblum")]
+
+
+def test_malformed_files_are_reported_together(data_dir):
+    (data_dir / "1900" / "charly" / "classes.yaml").write_text(
+        "class_dict:\n  Thursday:\n    - time: 19:00\n      class: Open Gym\n"
+        "      wL: true\n  Caturday:\n    - time: '19:00'\n      class: Nap\n"
+    )
+    (data_dir / "1900" / "ulrike" / "classes.yaml").write_text("class_dict: [")
+
+    with pytest.raises(ScheduleError) as error:
+        ScheduleCompiler(str(data_dir)).compile()
+
+    problems = "\n".join(error.value.problems)
+    assert 'Thursday[0]: time must be a quoted "HH:MM"' in problems
+    assert "Thursday[0]: unknown keys ['wL']" in problems
+    assert "class_dict.Caturday: unknown weekday" in problems
+    assert f"{data_dir / '1900' / 'ulrike' / 'classes.yaml'}:" in problems
+
+
+def test_validate_schedule_accepts_the_shipped_data():
+    data_dir = os.path.join(os.path.dirname(schedule_module.__file__), "../../data")
+    for path in ScheduleCompiler(data_dir).sources().values():
+        with open(path) as file:
+            assert validate_schedule(yaml.safe_load(file), path) == []
+
+
+def test_cache_skips_parsing_unchanged_files(data_dir, tmp_path):
+    compiler = ScheduleCompiler(str(data_dir), cache_path=str(tmp_path / "cache.json"))
+    first = compiler.compile()
+
+    with patch.object(schedule_module, "parse_yaml") as parse_yaml:
+        second = compiler.compile()
+        # Touched but unchanged files are recognized by their hash.
+        os.utime(data_dir / "classes.yaml", ns=(0, 0))
+        compiler.compile()
+    parse_yaml.assert_not_called()
+    assert second.index == first.index
+
+    write_schedule(
+        data_dir / "1900" / "ulrike" / "classes.yaml",
+        {"Friday": [{"time": "19:00", "class": "Open Gym"}]},
+    )
+    schedule = compiler.compile()
+    assert list(schedule.lookup("19:00", "Thursday")) == ["charly"]
+    assert list(schedule.lookup("19:00", "Friday")) == ["ulrike"]
@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from slotbooker.utils.selector_engine import SelectorEngine
+from slotbooker.utils.selenium_manager import SeleniumManager
+from slotbooker.utils.xpaths import XPath, XPathEnum
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setenv("SELECTOR_CACHE", str(tmp_path / "selectors.json"))
+    with patch("slotbooker.utils.webdriver_manager.webdriver.Chrome"):
+        manager = SeleniumManager(chromedriver=None)
+    return manager
+
+
+def test_selectors_are_their_legacy_xpath():
+    selector = XPath.weekday_button("Monday")
+
+    assert selector == XPathEnum.GET_DAY_BUTTON.value.format(day_index=2)
+    assert selector.name == "weekday_button:Monday"
+    assert [name for name, _, _ in selector.strategies] == ["legacy", "anchored"]
+    assert selector.strategies[0] == ("legacy", By.XPATH, str(selector))
+    assert [name for name, _, _ in XPath.login_password_input().strategies] == [
+        "legacy",
+        "css",
+        "anchored",
+    ]
+
+
+def test_wait_races_strategies_and_records_the_winner(manager):
+    element = MagicMock()
+    manager.driver.execute_async_script.return_value = [
+        2,
+        element,
+        [0.01, 0.02, 0.03],
+    ]
+    selector = XPath.login_password_input()
+
+    assert manager.wait_for_element(xpath=selector, timeout=5) is element
+
+    locators = manager.driver.execute_async_script.call_args.args[1]
+    assert locators == [[by, value] for _, by, value in selector.strategies]
+    assert manager.selector_engine.winners == {"login_password_input": "anchored"}
+    assert manager.selector_engine.timings["login_password_input"] == {
+        "legacy": {"lookups": 1, "total_ms": 0.01},
+        "css": {"lookups": 1, "total_ms": 0.02},
+        "anchored": {"lookups": 1, "total_ms": 0.03},
+    }
+
+    # The winner is tried right after the legacy XPath from now on.
+    manager.wait_for_element(xpath=selector, timeout=5)
+    locators = manager.driver.execute_async_script.call_args.args[1]
+    assert locators[:2] == [
+        [By.XPATH, str(selector)],
+        [By.XPATH, "//form//input[@type='password']"],
+    ]
+
+
+def test_polling_falls_through_failing_strategies(manager):
+    element = MagicMock()
+    manager.driver.execute_async_script.side_effect = JavascriptException("unloaded")
+
+    def find_element(by, value):
+        if value == str(XPath.switch_week_button()):
+            return element
+        raise NoSuchElementException()
+
+    manager.driver.find_element.side_effect = find_element
+
+    start = time.monotonic()
+    result = manager.wait_for_element(xpath=XPath.switch_week_button(), timeout=5)
+
+    assert result is element
+    assert time.monotonic() - start < 0.05
+    assert manager.selector_engine.winners["switch_week_button"] == "legacy"
+
+
+def test_winners_persist_across_runs(manager, tmp_path):
+    manager.driver.execute_async_script.return_value = [1, MagicMock(), [0.1, 0.2]]
+    manager.wait_for_element(xpath=XPath.weekday_button("Friday"))
+    manager.close_driver()
+
+    engine = SelectorEngine(str(tmp_path / "selectors.json"))
+
+    assert engine.winners == {"weekday_button:Friday": "anchored"}
+    assert engine.timings["weekday_button:Friday"]["anchored"]["lookups"] == 1
+
+
+def test_fallback_winners_never_precede_the_legacy_xpath(tmp_path):
+    engine = SelectorEngine(str(tmp_path / "selectors.json"))
+    selector = XPath.login_username_button()
+
+    engine.record(selector, engine.order(selector), 2, [0.1, 0.2, 0.3])
+
+    assert engine.winners == {"login_username_button": "anchored"}
+    assert [name for name, _, _ in engine.order(selector)] == [
+        "legacy",
+        "anchored",
+        "css",
+    ]
+
+
+def test_unreadable_cache_starts_empty(tmp_path):
+    path = tmp_path / "selectors.json"
+    path.write_text("{not json")
+
+    engine = SelectorEngine(str(path))
+
+    assert engine.winners == {}
+    assert engine.order(XPath.login_password_input())[0][0] == "legacy"
+
+
+def test_concurrent_saves_merge_instead_of_overwriting(tmp_path):
+    path = str(tmp_path / "selectors.json")
+    # Two bookers look up Monday, one each of the other days.
+    days = ["Monday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    engines = [SelectorEngine(path) for _ in days]
+    for day, engine in zip(days, engines):
+        selector = XPath.weekday_button(day)
+        engine.record(selector, selector.strategies, 0, [0.5])
+
+    threads = [threading.Thread(target=engine.save) for engine in engines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    merged = SelectorEngine(path)
+    assert len(merged.winners) == 5
+    assert merged.timings["weekday_button:Monday"]["legacy"]["lookups"] == 2
+    assert os.listdir(tmp_path) == ["selectors.json"]
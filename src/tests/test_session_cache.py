@@ -0,0 +1,49 @@
+import os
+from unittest.mock import patch
+
+from slotbooker.utils.session_cache import SessionCache
+
+STATE = {
+    "cookies": [{"name": "sid", "value": "abc", "domain": "app.octivfitness.com"}],
+    "local_storage": {"token": "secret-token"},
+    "session_storage": {},
+}
+
+
+def test_session_roundtrip_is_encrypted(tmp_path):
+    cache = SessionCache(cache_dir=str(tmp_path))
+
+    cache.save("charly", "secret", STATE)
+
+    assert cache.load("charly", "secret") == STATE
+    (path,) = tmp_path.iterdir()
+    content = path.read_bytes()
+    assert b"secret-token" not in content
+    assert b"charly" not in content and "charly" not in path.name
+    assert os.stat(path).st_mode & 0o077 == 0
+
+
+def test_session_with_wrong_password_is_discarded(tmp_path):
+    cache = SessionCache(cache_dir=str(tmp_path))
+    cache.save("charly", "secret", STATE)
+
+    assert cache.load("charly", "changed") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_expired_session_is_discarded(tmp_path):
+    cache = SessionCache(cache_dir=str(tmp_path), ttl=60)
+    cache.save("charly", "secret", STATE)
+
+    with patch("cryptography.fernet.time.time", return_value=10**10):
+        assert cache.load("charly", "secret") is None
+
+
+def test_missing_session_and_disabled_cache(tmp_path):
+    assert SessionCache(cache_dir=str(tmp_path)).load("charly", "secret") is None
+    with patch.dict("os.environ", {}, clear=True):
+        assert SessionCache.from_env() is None
+    with patch.dict(
+        "os.environ", {"SESSION_CACHE_DIR": str(tmp_path), "SESSION_CACHE_TTL": "60"}
+    ):
+        assert SessionCache.from_env().ttl == 60
@@ -1,6 +1,10 @@
 from unittest.mock import patch, MagicMock
 from datetime import datetime
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from slotbooker.slotbooker import Booker  # Update import as per your actual structure
+from slotbooker.slotbooker import KEEP_ALIVE_TIMEOUT_MS
+from slotbooker.utils.scripts import KEEP_ALIVE
+from slotbooker.utils.xpaths import XPath
 import pytest
 
 
@@ -122,3 +126,235 @@ def test_switch_day_raises_exception_and_calls_stop_booking(mock_xpath, mock_get
 
         assert "Click failed" in str(excinfo.value)
         mock_stop_booking.assert_called_once()
+
+
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_scrape_booking_slots_uses_single_script_call(mock_selenium_manager):
+    mock_selenium = MagicMock()
+    mock_selenium.execute_script.return_value = [
+        {"index": 5, "class": "Open Gym", "time": "19:00", "enter": True},
+        {"index": 7, "class": "Remote Coaching", "time": "19:00", "enter": True},
+    ]
+    mock_selenium_manager.return_value = mock_selenium
+
+    booker = Booker(base_url="http://example.com")
+    booker.class_dict = [
+        {"time": "19:00", "class": "Open Gym"},
+        {"time": "19:00", "class": "Remote Coaching"},
+    ]
+    slots = booker._scrape_booking_slots(["Open Gym", "Remote Coaching"])
+
+    mock_selenium.execute_script.assert_called_once()
+    mock_selenium.find_elements.assert_not_called()
+    assert slots["Open Gym"]["19:00"]["xpath"].endswith(
+        "div/div[5]/div/div[1]/div[3]/button"
+    )
+    assert slots["Remote Coaching"]["19:00"]["xpath"].endswith(
+        "div/div[7]/div/div[1]/div[3]/button"
+    )
+
+
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_scrape_booking_slots_falls_back_to_xpaths(mock_selenium_manager):
+    mock_selenium = MagicMock()
+    mock_selenium.execute_script.side_effect = WebDriverException("script failed")
+    mock_selenium.find_elements.return_value = [MagicMock(), MagicMock()]
+    mock_selenium.get_element_text.side_effect = [
+        NoSuchElementException("header row"),
+        "Open Gym",
+        "19:00",
+    ]
+    mock_selenium_manager.return_value = mock_selenium
+
+    booker = Booker(base_url="http://example.com")
+    booker.class_dict = [{"time": "19:00", "class": "Open Gym"}]
+    slots = booker._scrape_booking_slots(["Open Gym"])
+
+    assert list(slots["Open Gym"]) == ["19:00"]
+    assert slots["Open Gym"]["19:00"]["xpath"].endswith(
+        "div/div[2]/div/div[1]/div[3]/button"
+    )
+
+
+@patch.dict("slotbooker.slotbooker.os.environ", {"CLOCK_SYNC": "false"})
+@patch("slotbooker.slotbooker.AlertErrorHandler.check_booking_alert")
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_book_class_falls_back_to_next_target_of_fire_plan(
+    mock_selenium_manager, mock_check_alert
+):
+    mock_selenium = MagicMock()
+    mock_selenium.find_elements.side_effect = lambda xpath: [f"element:{xpath}"]
+    clicked = []
+
+    def execute_script(script, *args, element=None):
+        if element is not None:
+            clicked.append(element)
+        elif "XPathResult" in script:
+            return [
+                {"index": 4, "class": "Open Gym", "time": "19:00"},
+                {"index": 6, "class": "Remote Coaching", "time": "19:00"},
+            ]
+        else:
+            return [True] * len(args[0])
+
+    mock_selenium.execute_script.side_effect = execute_script
+    mock_selenium_manager.return_value = mock_selenium
+    mock_check_alert.side_effect = [True, None]  # first class full, second booked
+
+    booker = Booker(base_url="http://example.com")
+    booker.day = "Thursday"
+    booker.dom_recorder = MagicMock()
+    booker.book_class(
+        class_dict={
+            "Thursday": [
+                {"time": "19:00", "class": "Open Gym"},
+                {"time": "19:00", "class": "Remote Coaching"},
+            ]
+        }
+    )
+
+    assert booker.booking_successful.name == "SUCCESS"
+    assert booker.booking_class_slot == "Remote Coaching"
+    assert clicked == [
+        f"element:{XPath.enter_slot(slot=4)}",
+        f"element:{XPath.enter_slot(slot=6)}",
+    ]
+    mock_selenium.find_element.assert_not_called()
+    # The snapshot is taken after the booking, off the path to T0
+    booker.dom_recorder.record.assert_not_called()
+    booker.record_dom_snapshot()
+    booker.dom_recorder.record.assert_called_once_with(mock_selenium, label="thursday")
+
+
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_hold_until_fire_keeps_alive_and_refreshes_before_t0(mock_selenium_manager):
+    booker = Booker(base_url="https://example.com")
+    booker.day = "Monday"
+    manager = booker.selenium_manager
+    manager.find_elements.return_value = [MagicMock()]
+    scheduler = MagicMock()
+    scheduler.seconds_until_fire.side_effect = [0.25, 0.15, 0.05]
+
+    returned = booker.hold_until_fire(
+        scheduler, keep_alive_interval=0.1, refresh_lead=0.1
+    )
+
+    assert returned is scheduler
+    manager.find_elements.assert_called_once_with(xpath=XPath.booking_section_head())
+    # Without KEEP_ALIVE_URL the check stays in the page
+    manager.execute_async_script.assert_not_called()
+    manager.click_button.assert_called_once_with(XPath.weekday_button("Monday"))
+
+
+@patch.dict("slotbooker.slotbooker.os.environ", {"KEEP_ALIVE_URL": "/api/me"})
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_hold_until_fire_refreshes_when_server_rejects_session(mock_selenium_manager):
+    booker = Booker(base_url="https://example.com")
+    booker.day = "Monday"
+    manager = booker.selenium_manager
+    manager.driver.current_url = "https://app.example.com/schedule"
+    manager.find_elements.return_value = [MagicMock()]
+    manager.execute_async_script.return_value = 401
+    scheduler = MagicMock()
+    scheduler.seconds_until_fire.side_effect = [0.15, 0.15, 0.05]
+
+    booker.hold_until_fire(scheduler, keep_alive_interval=0.01, refresh_lead=0.1)
+
+    manager.execute_async_script.assert_called_once_with(
+        KEEP_ALIVE, "https://app.example.com/api/me", KEEP_ALIVE_TIMEOUT_MS
+    )
+    assert manager.click_button.call_count == 2
+
+
+@patch.dict(
+    "slotbooker.slotbooker.os.environ", {"KEEP_ALIVE_URL": "https://evil.example/"}
+)
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_keep_alive_never_leaves_the_app_origin(mock_selenium_manager):
+    booker = Booker(base_url="https://example.com")
+    manager = booker.selenium_manager
+    manager.driver.current_url = "https://app.example.com/schedule"
+    manager.find_elements.return_value = [MagicMock()]
+
+    assert booker._keep_alive()
+    manager.execute_async_script.assert_not_called()
+
+
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_hold_until_fire_refreshes_when_session_check_fails(mock_selenium_manager):
+    booker = Booker(base_url="https://example.com")
+    booker.day = "Monday"
+    manager = booker.selenium_manager
+    manager.find_elements.side_effect = WebDriverException("session lost")
+    scheduler = MagicMock()
+    scheduler.seconds_until_fire.side_effect = [0.15, 0.15, 0.05]
+
+    booker.hold_until_fire(scheduler, keep_alive_interval=0.01, refresh_lead=0.1)
+
+    # Once after the failed check, once right before T0.
+    assert manager.click_button.call_count == 2
+
+
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_hold_until_fire_skips_when_t0_is_close(mock_selenium_manager):
+    booker = Booker(base_url="https://example.com")
+    scheduler = MagicMock()
+    scheduler.seconds_until_fire.return_value = 1.0
+
+    booker.hold_until_fire(scheduler, keep_alive_interval=1, refresh_lead=5)
+
+    booker.selenium_manager.click_button.assert_not_called()
+
+
+@patch("slotbooker.slotbooker.AlertErrorHandler")
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_login_restores_cached_session(
+    mock_selenium_manager, mock_alert_handler, tmp_path
+):
+    with patch.dict("os.environ", {"SESSION_CACHE_DIR": str(tmp_path)}):
+        booker = Booker(base_url="https://example.com")
+    booker.session_cache.save(
+        "charly",
+        "secret",
+        {"cookies": [{"name": "sid"}], "local_storage": {}, "session_storage": {}},
+    )
+    manager = booker.selenium_manager
+    manager.find_elements.return_value = [MagicMock()]
+
+    assert booker.login("charly", "secret") is True
+
+    manager.add_cookie.assert_called_once_with({"name": "sid"})
+    manager.input_text.assert_not_called()
+    mock_alert_handler.check_login_alert.assert_not_called()
+
+
+@patch("slotbooker.slotbooker.AlertErrorHandler")
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_login_falls_back_and_caches_new_session(
+    mock_selenium_manager, mock_alert_handler, tmp_path
+):
+    with patch.dict("os.environ", {"SESSION_CACHE_DIR": str(tmp_path)}):
+        booker = Booker(base_url="https://example.com")
+    booker.session_cache.save(
+        "charly",
+        "secret",
+        {"cookies": [], "local_storage": {}, "session_storage": {}},
+    )
+    manager = booker.selenium_manager
+    # The expired session lands on the login form instead of the schedule.
+    manager.find_elements.return_value = []
+    manager.get_cookies.return_value = [{"name": "fresh"}]
+    manager.execute_script.return_value = {
+        "local_storage": {"token": "new"},
+        "session_storage": {},
+    }
+    mock_alert_handler.check_login_alert.return_value = None
+
+    assert booker.login("charly", "secret") is True
+
+    assert manager.input_text.call_count == 2
+    assert booker.session_cache.load("charly", "secret") == {
+        "cookies": [{"name": "fresh"}],
+        "local_storage": {"token": "new"},
+        "session_storage": {},
+    }
@@ -0,0 +1,89 @@
+import json
+import time
+from datetime import date
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+import pytest
+
+from slotbooker.utils.alerts import AlertTypes, ErrorTypes
+from tests.standin.site_server import StandInSiteServer, StandInSiteState
+
+SLOTS = [("07:30", "Open Gym"), ("08:00", "Remote Coaching")]
+
+
+@pytest.fixture
+def site():
+    state = StandInSiteState(users={"charly": "secret"}, slots=SLOTS)
+    with StandInSiteServer(state) as server:
+        yield server
+
+
+def call(site, method, path, payload=None, token="token-charly"):
+    request = Request(
+        site.url + path,
+        method=method,
+        data=json.dumps(payload).encode() if payload is not None else None,
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token}",
+        },
+    )
+    try:
+        with urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_app_page_is_served_for_any_path(site):
+    with urlopen(site.url + "/login") as response:
+        page = response.read().decode()
+    assert json.dumps(AlertTypes.ClassFullGerman.value) in page
+    assert site.state.requests == 0
+
+
+def test_login_and_week(site):
+    assert call(
+        site, "POST", "/api/login", {"username": "charly", "password": "x"}
+    ) == (
+        401,
+        {"message": AlertTypes.LoginCredentials.value},
+    )
+    status, week = call(site, "GET", "/api/week?offset=1")
+
+    assert status == 200
+    assert len(week["dates"]) == 7
+    assert week["today"] is None
+    assert week["days"][week["dates"][0]][0] == {
+        "time": "07:30",
+        "class": "Open Gym",
+        "booked": False,
+    }
+    assert call(site, "GET", "/api/week", token="nope")[0] == 401
+
+
+def test_booking_outcomes(site):
+    today = date.today().isoformat()
+    assert call(site, "POST", "/api/bookings", {"date": today, "index": 0})[0] == 201
+    assert site.state.bookings == [("charly", today, "07:30", "Open Gym")]
+    assert call(site, "GET", "/api/week")[1]["days"][today][0]["booked"] is True
+
+    site.state.full_classes.add("Remote Coaching")
+    assert call(site, "POST", "/api/bookings", {"date": today, "index": 1})[0] == 409
+
+    site.state.booking_error = ErrorTypes.MaxBookings.value
+    assert call(site, "POST", "/api/bookings", {"date": today, "index": 1}) == (
+        422,
+        {"message": ErrorTypes.MaxBookings.value},
+    )
+
+    assert call(site, "DELETE", "/api/bookings", {"date": today, "index": 0})[0] == 200
+    assert site.state.bookings == []
+
+
+def test_api_latency(site):
+    site.state.latency = 0.1
+    start = time.monotonic()
+    call(site, "GET", "/api/week")
+    assert time.monotonic() - start >= 0.1
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+import yaml
+
+from slotbooker.utils.helpers import parse_yaml
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules the CLI entry point must not load before a command runs
+HEAVY_MODULES = ["selenium", "yaml", "smtplib", "ssl", "email", "cryptography"]
+# Share of the booking stack's import time the CLI may take; eagerly loading
+# the booking stack made the CLI import as slow as the stack itself
+IMPORT_BUDGET_RATIO = 0.25
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def loaded_modules(statement: str, modules: list) -> list:
+    result = run_python(
+        "-c",
+        f"import json, sys; {statement}; "
+        f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))",
+    )
+    return json.loads(result.stdout)
+
+
+def test_cli_import_loads_no_heavy_modules():
+    assert loaded_modules("import slotbooker.main", HEAVY_MODULES) == []
+
+
+def test_booker_import_defers_mail_and_crypto():
+    modules = ["smtplib", "cryptography", "yaml"]
+    assert loaded_modules("import slotbooker.slotbooker", modules) == []
+
+
+def import_time_us(module: str) -> int:
+    # -X importtime lines: "import time: self [us] | cumulative | package"
+    stderr = run_python("-X", "importtime", "-c", f"import {module}").stderr
+    cumulative = {}
+    for line in stderr.splitlines()[1:]:
+        _, total, name = line.split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative[module]
+
+
+def test_cli_import_time_within_budget():
+    # Relative to the booking stack, so the budget holds on slow runners too
+    baseline = import_time_us("slotbooker.slotbooker")
+    assert import_time_us("slotbooker.main") < baseline * IMPORT_BUDGET_RATIO
+
+
+def test_parse_yaml_uses_the_fastest_safe_loader(monkeypatch):
+    content = b"class_dict:\n  Monday:\n    - {'18:00': 'Open Gym'}\n"
+    loaders = []
+    load = yaml.load
+
+    def recording_load(stream, **kwargs):
+        loaders.append(kwargs["Loader"])
+        return load(stream, **kwargs)
+
+    monkeypatch.setattr(yaml, "load", recording_load)
+
+    assert parse_yaml(content) == {"class_dict": {"Monday": [{"18:00": "Open Gym"}]}}
+    assert loaders == [getattr(yaml, "CSafeLoader", yaml.SafeLoader)]
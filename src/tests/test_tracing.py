@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+from slotbooker.slotbooker import Booker
+from slotbooker.utils.tracing import Tracer
+
+
+def test_spans_nest_per_thread():
+    tracer = Tracer()
+
+    def other_thread():
+        with tracer.span("other"):
+            pass
+
+    with tracer.span("book_class"):
+        with tracer.span("scrape"):
+            time.sleep(0.01)
+        worker = threading.Thread(target=other_thread)
+        worker.start()
+        worker.join()
+    with tracer.span("send_result", state="SUCCESS"):
+        pass
+
+    spans = {span["name"]: span for span in tracer.to_dict()["spans"]}
+    assert spans["book_class"]["parent"] is None
+    assert spans["scrape"]["parent"] == spans["book_class"]["id"]
+    # Spans of another thread do not nest into this thread's spans.
+    assert spans["other"]["parent"] is None
+    assert spans["scrape"]["duration_us"] >= 10_000
+    assert spans["book_class"]["duration_us"] >= spans["scrape"]["duration_us"]
+    assert spans["send_result"]["attributes"] == {"state": "SUCCESS"}
+    assert "attributes" not in spans["scrape"]
+
+
+def test_span_ends_on_exception():
+    tracer = Tracer()
+    try:
+        with tracer.span("login"):
+            raise SystemExit(1)
+    except SystemExit:
+        pass
+
+    with tracer.span("next"):
+        pass
+
+    login, following = tracer.spans
+    assert login.end_ns is not None
+    assert following.parent_id is None
+
+
+def test_chrome_trace_events(tmp_path):
+    tracer = Tracer()
+    with tracer.span("click", class_name="Open Gym"):
+        pass
+
+    path = tracer.write(str(tmp_path / "trace.json"), format="chrome")
+
+    with open(path) as file:
+        (event,) = json.load(file)["traceEvents"]
+    assert event["ph"] == "X"
+    assert event["name"] == "click"
+    assert event["args"] == {"class_name": "Open Gym"}
+
+
+@patch("slotbooker.slotbooker.SeleniumManager")
+def test_booker_writes_trace_next_to_log(mock_selenium_manager, tmp_path):
+    booker = Booker(base_url="https://example.com")
+    booker.day = "Monday"
+    with patch.object(
+        booker.loggingHandler,
+        "get_log_file_path",
+        return_value=str(tmp_path / "log_2024-01-01_19-00-00.txt"),
+    ):
+        booker.switch_day()
+        with patch.dict("os.environ", {"TRACE_FORMAT": "json"}):
+            path = booker.write_trace()
+        with patch.dict("os.environ", {"TRACE_FORMAT": "none"}):
+            assert booker.write_trace() is None
+
+    assert path.startswith(str(tmp_path / "log_2024-01-01_19-00-00_"))
+    with open(path) as file:
+        trace = json.load(file)
+    assert [span["name"] for span in trace["spans"]] == ["driver_start", "switch_day"]
+    assert trace["attributes"] == {"state": "FAIL"}
@@ -0,0 +1,77 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+from selenium.webdriver.support import expected_conditions as ec
+
+from slotbooker.utils.scripts import WAIT_FOR_ELEMENT
+from slotbooker.utils.selenium_manager import SeleniumManager
+
+
+@pytest.fixture
+def manager():
+    with patch("slotbooker.utils.webdriver_manager.webdriver.Chrome"):
+        manager = SeleniumManager(chromedriver=None)
+    return manager
+
+
+def test_wait_for_element_resolves_on_mutation(manager):
+    element = MagicMock()
+    manager.driver.execute_async_script.return_value = [0, element, [0.05]]
+
+    result = manager.wait_for_element(
+        xpath="//button", timeout=5, condition=ec.element_to_be_clickable
+    )
+
+    assert result is element
+    manager.driver.set_script_timeout.assert_called_once_with(6)
+    manager.driver.execute_async_script.assert_called_once_with(
+        WAIT_FOR_ELEMENT, [["xpath", "//button"]], 5000, "clickable"
+    )
+    manager.driver.find_element.assert_not_called()
+
+    manager.wait_for_element(xpath="//p", timeout=2)
+    # The script timeout already covers shorter waits.
+    manager.driver.set_script_timeout.assert_called_once()
+
+
+def test_wait_for_element_falls_back_to_polling(manager):
+    element = MagicMock()
+    manager.driver.execute_async_script.side_effect = JavascriptException(
+        "document unloaded while waiting for result"
+    )
+    manager.driver.find_element.side_effect = [
+        NoSuchElementException(),
+        NoSuchElementException(),
+        element,
+    ]
+
+    start = time.monotonic()
+    result = manager.wait_for_element(xpath="//p", timeout=5)
+
+    assert result is element
+    assert manager.driver.find_element.call_count == 3
+    # Two back-off sleeps of 10ms and 20ms instead of a 0.5s poll interval.
+    assert time.monotonic() - start < 0.25
+
+
+def test_wait_for_element_times_out_with_none(manager):
+    manager.driver.execute_async_script.return_value = None
+    assert manager.wait_for_element(xpath="//p", timeout=1) is None
+
+    manager.wait_mode = "poll"
+    manager.driver.find_element.side_effect = NoSuchElementException()
+    start = time.monotonic()
+    assert manager.wait_for_element(xpath="//p", timeout=0.1) is None
+    assert 0.1 <= time.monotonic() - start < 0.2
+
+
+def test_wait_for_alert_polls_quickly(manager):
+    alert = MagicMock()
+    with patch.object(
+        ec, "alert_is_present", return_value=MagicMock(side_effect=[False, alert])
+    ):
+        start = time.monotonic()
+        assert manager.wait_for_element_alert(timeout=3) is alert
+    assert time.monotonic() - start < 0.1